@@ -0,0 +1,526 @@
+"""Benchmark history and regression checks for the conversion pipeline.
+
+Every ``record`` run executes :func:`evaluate.evaluate` (``--repeat`` times)
+and stores one row in a local SQLite file with:
+
+* a hash of the effective ``convert.py`` configuration and the extraction
+  rule-set version;
+* installed versions of Docling and the packages it depends on;
+* host details (machine, CPU count, Python);
+* throughput, accuracy and peak memory; and
+* per-document samples of total latency and of every pipeline stage
+  (Docling's ``profile_pipeline_timings`` keys plus ``extract``), and one
+  pages/s sample per repeat.
+
+``compare`` tests a candidate run (default: the latest) against a baseline
+run with a one-sided Mann-Whitney U test per metric. A metric regresses when
+its median moved the wrong way (slower, or lower throughput) by more than
+``--threshold`` and the test is significant at ``--alpha``; any regression
+makes the command exit with status 1 so it can gate CI or an upgrade.
+
+Usage::
+
+    python benchmarks.py record --label docling-2.55 --table-mode fast
+    python benchmarks.py list
+    python benchmarks.py compare --baseline docling-2.55
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import platform
+import sqlite3
+import sys
+import time
+from dataclasses import dataclass
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from evaluate import (
+    DEFAULT_GROUND_TRUTH,
+    DEFAULT_INPUT_DIR,
+    EvaluationReport,
+    evaluate,
+    labelled_inputs,
+    load_ground_truth,
+)
+from extract import ruleset_version
+
+BASE_DIR = Path(__file__).resolve().parent
+DEFAULT_DB_PATH = BASE_DIR / "output" / "benchmarks.sqlite"
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_ALPHA = 0.05
+THROUGHPUT_METRIC = "throughput"
+HIGHER_IS_BETTER = frozenset({THROUGHPUT_METRIC})
+TRACKED_PACKAGES = (
+    "docling",
+    "docling-core",
+    "docling-parse",
+    "docling-ibm-models",
+    "torch",
+    "onnxruntime",
+    "easyocr",
+    "rapidocr",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created REAL NOT NULL,
+    label TEXT,
+    config_hash TEXT NOT NULL,
+    config TEXT NOT NULL,
+    versions TEXT NOT NULL,
+    host TEXT NOT NULL,
+    documents INTEGER NOT NULL,
+    pages INTEGER NOT NULL,
+    wall_time REAL NOT NULL,
+    pages_per_second REAL NOT NULL,
+    accuracy REAL NOT NULL,
+    peak_rss_mb REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS samples (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    metric TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS samples_run_metric ON samples(run_id, metric);
+"""
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class Regression:
+    """One metric's comparison between baseline and candidate."""
+
+    metric: str
+    baseline_median: float
+    candidate_median: float
+    p_value: float
+    regressed: bool
+
+    @property
+    def change(self) -> float:
+        """Relative change of the median."""
+
+        if not self.baseline_median:
+            return 0.0
+        return self.candidate_median / self.baseline_median - 1.0
+
+
+def package_versions() -> Dict[str, Optional[str]]:
+    """Installed versions of the packages that drive conversion speed."""
+
+    versions: Dict[str, Optional[str]] = {"python": platform.python_version()}
+    for name in TRACKED_PACKAGES:
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+def host_info() -> Dict[str, Any]:
+    """Machine details that make timings comparable (or not)."""
+
+    return {
+        "node": platform.node(),
+        "system": platform.system(),
+        "release": platform.release(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def effective_config(convert_argv: Sequence[str], stored: bool, workers: int) -> Dict[str, Any]:
+    """Configuration that identifies comparable runs.
+
+    When Docling is importable the forwarded flags are resolved through
+    ``convert.parse_arguments`` so defaults are part of the hash.
+    """
+
+    config: Dict[str, Any] = {
+        "stored": stored,
+        "workers": workers,
+        "ruleset": ruleset_version(),
+        "argv": list(convert_argv),
+    }
+    if not stored:
+        import convert
+
+        config["options"] = vars(convert.parse_arguments(list(convert_argv)))
+    return config
+
+
+def config_hash(config: Dict[str, Any]) -> str:
+    """Short stable hash of a configuration dict."""
+
+    payload = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class BenchmarkHistory:
+    """SQLite store of benchmark runs and their per-document samples."""
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self.connection = connection
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+
+    @classmethod
+    def open(cls, path: Path) -> "BenchmarkHistory":
+        """Open (creating when needed) the history database."""
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return cls(sqlite3.connect(str(path)))
+
+    def close(self) -> None:
+        """Close the database connection."""
+
+        self.connection.close()
+
+    def record(
+        self,
+        reports: Sequence[EvaluationReport],
+        config: Dict[str, Any],
+        label: Optional[str] = None,
+    ) -> int:
+        """Store one run made of one or more evaluation repeats.
+
+        Returns:
+            The new run id.
+        """
+
+        documents = sum(report.documents for report in reports)
+        pages = sum(report.pages for report in reports)
+        wall_time = sum(report.wall_time for report in reports)
+        accuracy = float(np.mean([report.overall_accuracy(normalised=True) for report in reports]))
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (created, label, config_hash, config, versions, host, "
+                "documents, pages, wall_time, pages_per_second, accuracy, peak_rss_mb) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    time.time(),
+                    label,
+                    config_hash(config),
+                    json.dumps(config, sort_keys=True, default=str),
+                    json.dumps(package_versions()),
+                    json.dumps(host_info()),
+                    documents,
+                    pages,
+                    wall_time,
+                    pages / wall_time if wall_time else 0.0,
+                    accuracy,
+                    max(report.peak_rss_mb for report in reports),
+                ),
+            )
+            run_id = int(cursor.lastrowid)
+            samples: List[Tuple[int, str, float]] = []
+            for report in reports:
+                samples.append((run_id, THROUGHPUT_METRIC, report.pages_per_second))
+                samples.extend((run_id, "latency", value) for value in report.latencies)
+                for stage, values in report.stage_times.items():
+                    samples.extend((run_id, f"stage:{stage}", value) for value in values)
+            self.connection.executemany(
+                "INSERT INTO samples (run_id, metric, value) VALUES (?, ?, ?)", samples
+            )
+        return run_id
+
+    def resolve(self, reference: Optional[str]) -> sqlite3.Row:
+        """Find a run by id or label (latest with that label); ``None`` is the latest run."""
+
+        if reference is None:
+            row = self.connection.execute("SELECT * FROM runs ORDER BY id DESC LIMIT 1").fetchone()
+        elif reference.isdigit():
+            row = self.connection.execute(
+                "SELECT * FROM runs WHERE id = ?", (int(reference),)
+            ).fetchone()
+        else:
+            row = self.connection.execute(
+                "SELECT * FROM runs WHERE label = ? ORDER BY id DESC LIMIT 1", (reference,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(f"No benchmark run matches {reference or 'latest'!r}")
+        return row
+
+    def runs(self, limit: int = 20) -> List[sqlite3.Row]:
+        """Most recent runs, newest first."""
+
+        return self.connection.execute(
+            "SELECT * FROM runs ORDER BY id DESC LIMIT ?", (limit,)
+        ).fetchall()
+
+    def samples(self, run_id: int) -> Dict[str, List[float]]:
+        """Per-metric samples of one run."""
+
+        grouped: Dict[str, List[float]] = {}
+        for row in self.connection.execute(
+            "SELECT metric, value FROM samples WHERE run_id = ?", (run_id,)
+        ):
+            grouped.setdefault(row["metric"], []).append(row["value"])
+        return grouped
+
+
+def compare_samples(
+    baseline: Dict[str, List[float]],
+    candidate: Dict[str, List[float]],
+    threshold: float = DEFAULT_THRESHOLD,
+    alpha: float = DEFAULT_ALPHA,
+) -> List[Regression]:
+    """Test every metric present in both runs for a slowdown.
+
+    Timing metrics regress when they grow; ``HIGHER_IS_BETTER`` metrics
+    (throughput) when they drop.
+    """
+
+    from scipy.stats import mannwhitneyu
+
+    results: List[Regression] = []
+    for metric in sorted(set(baseline) & set(candidate)):
+        before, after = baseline[metric], candidate[metric]
+        if len(before) < 2 or len(after) < 2:
+            continue
+        worse = "less" if metric in HIGHER_IS_BETTER else "greater"
+        p_value = float(mannwhitneyu(after, before, alternative=worse).pvalue)
+        base_median = float(np.median(before))
+        cand_median = float(np.median(after))
+        change = cand_median / base_median - 1.0 if base_median > 0 else 0.0
+        if metric in HIGHER_IS_BETTER:
+            change = -change
+        slower = change > threshold
+        results.append(
+            Regression(metric, base_median, cand_median, p_value, slower and p_value < alpha)
+        )
+    return results
+
+
+def command_record(args: argparse.Namespace, convert_argv: Sequence[str]) -> int:
+    """Run the corpus and store the run."""
+
+    truth = load_ground_truth(args.ground_truth)
+    paths = labelled_inputs(truth, args.input_dir, args.stored)
+    if not paths:
+        LOGGER.warning("No labelled inputs found in %s.", args.input_dir)
+        return 1
+    config = effective_config(convert_argv, args.stored, args.workers)
+    reports = [
+        evaluate(paths, truth, args.workers, convert_argv, args.stored)
+        for _ in range(args.repeat)
+    ]
+    history = BenchmarkHistory.open(args.db)
+    try:
+        run_id = history.record(reports, config, args.label)
+        row = history.resolve(str(run_id))
+    finally:
+        history.close()
+    LOGGER.info(
+        "Recorded run %d (config %s): %.2f pages/s, accuracy %.1f%%, peak RSS %.0f MiB",
+        run_id,
+        row["config_hash"],
+        row["pages_per_second"],
+        row["accuracy"] * 100,
+        row["peak_rss_mb"],
+    )
+    return 1 if any(report.failures for report in reports) else 0
+
+
+def command_list(args: argparse.Namespace) -> int:
+    """Log recent runs."""
+
+    history = BenchmarkHistory.open(args.db)
+    try:
+        for row in history.runs(args.limit):
+            versions = json.loads(row["versions"])
+            LOGGER.info(
+                "%4d %s %-16s config=%s docling=%s pages/s=%.2f acc=%.1f%% rss=%.0fMiB",
+                row["id"],
+                time.strftime("%Y-%m-%d %H:%M", time.localtime(row["created"])),
+                row["label"] or "-",
+                row["config_hash"],
+                versions.get("docling"),
+                row["pages_per_second"],
+                row["accuracy"] * 100,
+                row["peak_rss_mb"],
+            )
+    finally:
+        history.close()
+    return 0
+
+
+def command_compare(args: argparse.Namespace) -> int:
+    """Compare a candidate run with a baseline run."""
+
+    history = BenchmarkHistory.open(args.db)
+    try:
+        try:
+            baseline = history.resolve(args.baseline)
+            candidate = history.resolve(args.candidate)
+        except KeyError as exc:
+            LOGGER.error("%s in %s.", exc.args[0], args.db)
+            return 2
+        regressions = compare_samples(
+            history.samples(baseline["id"]),
+            history.samples(candidate["id"]),
+            args.threshold,
+            args.alpha,
+        )
+    finally:
+        history.close()
+
+    if baseline["config_hash"] != candidate["config_hash"]:
+        LOGGER.warning(
+            "Runs use different configurations (%s vs %s).",
+            baseline["config_hash"],
+            candidate["config_hash"],
+        )
+    base_versions = json.loads(baseline["versions"])
+    for name, version in json.loads(candidate["versions"]).items():
+        if base_versions.get(name) != version:
+            LOGGER.info("Version change: %s %s -> %s", name, base_versions.get(name), version)
+
+    failed = False
+    tested = {item.metric for item in regressions}
+    for item in regressions:
+        LOGGER.info(
+            "%s %-28s median %.4f -> %.4f (%+.1f%%, p=%.3f)",
+            "REGRESSION" if item.regressed else "ok        ",
+            item.metric,
+            item.baseline_median,
+            item.candidate_median,
+            item.change * 100,
+            item.p_value,
+        )
+        failed = failed or item.regressed
+
+    if THROUGHPUT_METRIC not in tested:
+        throughput_change = (
+            candidate["pages_per_second"] / baseline["pages_per_second"] - 1.0
+            if baseline["pages_per_second"]
+            else 0.0
+        )
+        LOGGER.info(
+            "untested   throughput %.2f -> %.2f pages/s (%+.1f%%); record with --repeat 2 "
+            "or more to test it",
+            baseline["pages_per_second"],
+            candidate["pages_per_second"],
+            throughput_change * 100,
+        )
+    LOGGER.info(
+        "Run %d vs baseline %d: %s",
+        candidate["id"],
+        baseline["id"],
+        "regressed" if failed else "no significant regression",
+    )
+    return 1 if failed else 0
+
+
+def parse_arguments(
+    argv: Optional[Sequence[str]] = None,
+) -> Tuple[argparse.Namespace, List[str]]:
+    """Parse sub-command flags; unknown ``record`` flags go to ``convert.py``."""
+
+    # --db is accepted before or after the sub-command.
+    database = argparse.ArgumentParser(add_help=False)
+    database.add_argument(
+        "--db",
+        type=Path,
+        default=argparse.SUPPRESS,
+        help="History database (default: Main/output/benchmarks.sqlite).",
+    )
+    parser = argparse.ArgumentParser(
+        description="Record benchmark runs in a SQLite history and check for regressions.",
+        parents=[database],
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser(
+        "record", help="Run the evaluation corpus and store the results.", parents=[database]
+    )
+    record.add_argument("--label", default=None, help="Name for this run, e.g. a version.")
+    record.add_argument(
+        "--ground-truth",
+        type=Path,
+        default=DEFAULT_GROUND_TRUTH,
+        help="Labelled records (default: Main/output/ground_truth_template.json).",
+    )
+    record.add_argument(
+        "--input-dir",
+        type=Path,
+        default=DEFAULT_INPUT_DIR,
+        help="Directory with the labelled PDFs, or stored outputs with --stored.",
+    )
+    record.add_argument(
+        "--stored",
+        action="store_true",
+        help="Benchmark extraction over stored outputs instead of conversion.",
+    )
+    record.add_argument("--workers", type=int, default=2, help="Worker processes (default: 2).")
+    record.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Evaluation passes per run; more passes give the tests more samples.",
+    )
+
+    listing = commands.add_parser("list", help="Show recent runs.", parents=[database])
+    listing.add_argument("--limit", type=int, default=20)
+
+    compare = commands.add_parser(
+        "compare",
+        help="Compare a run with a baseline; exit 1 on regressions.",
+        parents=[database],
+    )
+    compare.add_argument("--baseline", required=True, help="Baseline run id or label.")
+    compare.add_argument(
+        "--candidate", default=None, help="Candidate run id or label (default: latest run)."
+    )
+    compare.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Relative slowdown that counts as a regression (default: 0.10).",
+    )
+    compare.add_argument(
+        "--alpha",
+        type=float,
+        default=DEFAULT_ALPHA,
+        help="Significance level of the Mann-Whitney U test (default: 0.05).",
+    )
+    return parser.parse_known_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Application entry point."""
+
+    args, extra = parse_arguments(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(message)s")
+    if not hasattr(args, "db"):
+        args.db = DEFAULT_DB_PATH
+    if args.command == "record":
+        if args.stored and extra:
+            LOGGER.error(
+                "Unrecognised arguments (convert.py flags have no effect with --stored): %s",
+                " ".join(extra),
+            )
+            return 2
+        return command_record(args, extra)
+    if extra:
+        LOGGER.error("Unrecognised arguments: %s", " ".join(extra))
+        return 2
+    if args.command == "list":
+        return command_list(args)
+    return command_compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
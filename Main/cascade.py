@@ -0,0 +1,449 @@
+"""Confidence cascade: rules first, heavier tiers only for uncertain fields.
+
+Every invoice used to pay for the slowest path (accurate TableFormer, EasyOCR
+and an LLM prompt) even when the answer was obvious. The cascade runs:
+
+1. ``rules`` -- the rule-based extractor from :mod:`extract` over the DocTags
+   the normal ``convert.py`` run already produced;
+2. ``reconvert`` -- for fields below the confidence threshold, the source PDF
+   is converted again with ``HEAVY_PROFILE_ARGS`` (full-page OCR, accurate
+   table mode, a larger layout model) and the rules run on the new DocTags;
+3. ``llm`` -- fields still below the threshold are asked of an LLM client
+   (see :mod:`llm_client`; ``StandInLlmClient`` works offline) using compacted
+   DocTags from :mod:`compact`.
+
+A field escalates when its confidence is below its own threshold. Thresholds
+are calibrated per field against labelled documents (``--calibrate``): the
+lowest rule confidence at which every labelled rule answer was still correct.
+A supplier name found on the row band of the CoC/VAT numbers also stands when
+both of those numbers pass their validators outright.
+
+Only escalated fields are replaced by later tiers, and LLM answers must pass
+the same validators as rule output. Per-tier hit rates and latencies are kept
+in ``ExtractionCascade.stats``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from compact import compact_doctags
+from evaluate import FIELD_NORMALISERS, load_ground_truth
+from extract import (
+    FIELD_SPEC_MAP,
+    GROUND_TRUTH_FIELDS,
+    NAME_ROW_BAND_CONFIDENCE,
+    ExtractionResult,
+    collect_doctags_paths,
+    extract_fields,
+    source_filename,
+)
+from llm_client import DEFAULT_ENDPOINT, LlmClient, StandInLlmClient
+
+BASE_DIR = Path(__file__).resolve().parent
+DEFAULT_THRESHOLDS_PATH = BASE_DIR / "output" / "cascade_thresholds.json"
+
+DEFAULT_THRESHOLD = 0.75
+"""Threshold for fields without a calibrated value."""
+CALIBRATION_PRECISION = 1.0
+LLM_CONFIDENCE = 0.8
+
+HEAVY_PROFILE_ARGS: Sequence[str] = (
+    "--do-ocr",
+    "true",
+    "--ocr-engine",
+    "easyocr",
+    "--ocr-force-full-page",
+    "true",
+    "--table-mode",
+    "accurate",
+    "--layout-model",
+    "docling_layout_egret_large",
+)
+"""``convert.py`` flags for the re-conversion tier."""
+
+TIER_NAMES = ("rules", "reconvert", "llm")
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class TierStats:
+    """Counters for one cascade tier."""
+
+    documents: int = 0
+    finished: int = 0
+    fields_resolved: int = 0
+    seconds: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of documents entering the tier that finished there."""
+
+        return self.finished / self.documents if self.documents else 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        """Average seconds spent in the tier per document."""
+
+        return self.seconds / self.documents if self.documents else 0.0
+
+
+@dataclass
+class CascadeResult:
+    """Extraction result plus the tier that produced each field."""
+
+    result: ExtractionResult
+    field_tiers: Dict[str, str] = field(default_factory=dict)
+    finished_tier: str = "unresolved"
+
+
+class HeavyReconverter:
+    """Convert PDFs again with a heavier ``convert.py`` profile.
+
+    The Docling converter is built on first use and reused afterwards so the
+    heavier models load only once per process.
+    """
+
+    def __init__(self, profile_args: Sequence[str] = HEAVY_PROFILE_ARGS) -> None:
+        self.profile_args = list(profile_args)
+        self._converter = None
+
+    def __call__(self, pdf_path: Path) -> str:
+        if self._converter is None:
+            import convert
+
+            args = convert.parse_arguments(self.profile_args)
+            self._converter = convert.build_converter(
+                convert.build_pipeline_options(args),
+                convert.build_pdf_backend_options(args),
+                args.pdf_backend,
+            )
+        result = self._converter.convert(source=pdf_path)
+        return result.document.export_to_doctags()
+
+
+def calibrate_thresholds(
+    results: Sequence[ExtractionResult],
+    truth: Mapping[str, Mapping[str, Optional[str]]],
+    min_precision: float = CALIBRATION_PRECISION,
+    fallback: float = DEFAULT_THRESHOLD,
+) -> Dict[str, float]:
+    """Per-field escalation thresholds from labelled rule-tier results.
+
+    For each field the lowest observed confidence is chosen at which the rule
+    answers at or above it are correct (after :data:`evaluate.FIELD_NORMALISERS`)
+    with at least ``min_precision``. Fields without a qualifying confidence keep
+    ``fallback``.
+
+    Args:
+        results: Rule-tier results, keyed to labels by ``filename``.
+        truth: Ground-truth records keyed by filename.
+        min_precision: Required share of correct answers above the threshold.
+        fallback: Threshold for fields that cannot be calibrated.
+
+    Returns:
+        ``{field: threshold}`` for every ground-truth field.
+    """
+
+    thresholds: Dict[str, float] = {}
+    for name in GROUND_TRUTH_FIELDS:
+        normalise = FIELD_NORMALISERS[name]
+        samples: List[Tuple[float, bool]] = []
+        for result in results:
+            labels = truth.get(result.filename)
+            value = result.fields.get(name)
+            if labels is None or labels.get(name) is None or value is None:
+                continue
+            correct = normalise(value) == normalise(labels[name])
+            samples.append((result.confidence.get(name, 0.0), correct))
+        thresholds[name] = fallback
+        for candidate in sorted({confidence for confidence, _ in samples}):
+            above = [correct for confidence, correct in samples if confidence >= candidate]
+            if above and sum(above) / len(above) >= min_precision:
+                thresholds[name] = candidate
+                break
+    return thresholds
+
+
+def load_thresholds(path: Path) -> Dict[str, float]:
+    """Calibrated thresholds from ``path``; empty when the file is missing."""
+
+    if not path.exists():
+        return {}
+    return {name: float(value) for name, value in json.loads(path.read_text("utf-8")).items()}
+
+
+def _accepts(name: str, value: Optional[str]) -> bool:
+    if not value:
+        return False
+    spec = FIELD_SPEC_MAP.get(name)
+    return spec is None or spec.validator(value) > 0
+
+
+class ExtractionCascade:
+    """Run the rules → re-conversion → LLM cascade over documents."""
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        reconverter: Optional[Callable[[Path], str]] = None,
+        llm: Optional[LlmClient] = None,
+        thresholds: Optional[Mapping[str, float]] = None,
+    ) -> None:
+        self.threshold = threshold
+        self.thresholds = dict(thresholds or {})
+        self.reconverter = reconverter
+        self.llm = llm
+        self.stats: Dict[str, TierStats] = {name: TierStats() for name in TIER_NAMES}
+
+    def threshold_for(self, name: str) -> float:
+        """Escalation threshold of field ``name``."""
+
+        return self.thresholds.get(name, self.threshold)
+
+    def _resolved(self, result: ExtractionResult, name: str) -> bool:
+        if result.fields.get(name) is None:
+            return False
+        confidence = result.confidence.get(name, 0.0)
+        if confidence >= self.threshold_for(name):
+            return True
+        if name == "supplier_name" and confidence >= NAME_ROW_BAND_CONFIDENCE:
+            # Row-band name next to CoC and VAT numbers that both validate.
+            return all(
+                FIELD_SPEC_MAP[anchor].validator(result.fields.get(anchor) or "") >= 1.0
+                for anchor in ("supplier_coc_number", "supplier_tax_number")
+            )
+        return False
+
+    def _pending(self, result: ExtractionResult) -> List[str]:
+        return [name for name in GROUND_TRUTH_FIELDS if not self._resolved(result, name)]
+
+    def run(
+        self, filename: str, doctags: str, source_pdf: Optional[Path] = None
+    ) -> CascadeResult:
+        """Extract one document, escalating only low-confidence fields.
+
+        Args:
+            filename: Source filename recorded in the result.
+            doctags: DocTags from the regular conversion run.
+            source_pdf: Original PDF; required for the re-conversion tier.
+
+        Returns:
+            ``CascadeResult`` with the merged fields.
+        """
+
+        stats = self.stats["rules"]
+        started = time.perf_counter()
+        result = extract_fields(doctags, filename)
+        pending = self._pending(result)
+        stats.documents += 1
+        stats.fields_resolved += len(GROUND_TRUTH_FIELDS) - len(pending)
+        stats.seconds += time.perf_counter() - started
+        outcome = CascadeResult(result, {name: "rules" for name in GROUND_TRUTH_FIELDS})
+        if not pending:
+            stats.finished += 1
+            outcome.finished_tier = "rules"
+            return outcome
+
+        best_doctags = doctags
+        if self.reconverter is not None and source_pdf is not None:
+            stats = self.stats["reconvert"]
+            started = time.perf_counter()
+            stats.documents += 1
+            try:
+                best_doctags = self.reconverter(source_pdf)
+            except Exception as exc:  # noqa: BLE001 -- escalate past a failed tier
+                LOGGER.warning("Re-conversion failed for %s: %s", source_pdf, exc)
+            else:
+                retry = extract_fields(best_doctags, filename)
+                for name in pending:
+                    if retry.confidence.get(name, 0.0) > result.confidence.get(name, 0.0):
+                        result.fields[name] = retry.fields[name]
+                        result.confidence[name] = retry.confidence[name]
+                        if name in retry.matches:
+                            result.matches[name] = retry.matches[name]
+                        outcome.field_tiers[name] = "reconvert"
+                still_pending = self._pending(result)
+                stats.fields_resolved += len(pending) - len(still_pending)
+                pending = still_pending
+            stats.seconds += time.perf_counter() - started
+            if not pending:
+                stats.finished += 1
+                outcome.finished_tier = result.method = "reconvert"
+                return outcome
+
+        if self.llm is not None:
+            stats = self.stats["llm"]
+            started = time.perf_counter()
+            stats.documents += 1
+            try:
+                answer = self.llm.extract(compact_doctags(best_doctags, crop=True))
+            except Exception as exc:  # noqa: BLE001 -- keep the best result so far
+                LOGGER.warning("LLM extraction failed for %s: %s", filename, exc)
+                answer = {}
+            for name in pending:
+                value = answer.get(name)
+                if _accepts(name, value):
+                    result.fields[name] = value
+                    result.confidence[name] = LLM_CONFIDENCE
+                    outcome.field_tiers[name] = "llm"
+            still_pending = self._pending(result)
+            stats.fields_resolved += len(pending) - len(still_pending)
+            pending = still_pending
+            stats.seconds += time.perf_counter() - started
+            if not pending:
+                stats.finished += 1
+                outcome.finished_tier = result.method = "llm"
+        return outcome
+
+    def report_lines(self) -> List[str]:
+        """Format per-tier hit rates and latencies."""
+
+        lines = []
+        for name in TIER_NAMES:
+            tier = self.stats[name]
+            lines.append(
+                f"{name}: documents={tier.documents} finished={tier.finished} "
+                f"hit_rate={tier.hit_rate:.1%} fields_resolved={tier.fields_resolved} "
+                f"mean_latency={tier.mean_latency * 1000:.1f} ms"
+            )
+        return lines
+
+
+def find_source_pdf(input_dir: Optional[Path], filename: str) -> Optional[Path]:
+    """Locate the PDF for ``filename`` in ``input_dir`` (case-insensitive suffix)."""
+
+    if input_dir is None:
+        return None
+    stem = Path(filename).stem
+    for candidate in input_dir.rglob(f"{stem}.*"):
+        if candidate.suffix.lower() == ".pdf":
+            return candidate
+    return None
+
+
+def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse CLI arguments for the extraction cascade."""
+
+    parser = argparse.ArgumentParser(
+        description="Extract invoice fields with a rules → re-conversion → LLM cascade."
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        type=Path,
+        help="DocTags files or directories containing *.doctags.txt files.",
+    )
+    parser.add_argument(
+        "--input-dir",
+        type=Path,
+        default=None,
+        help="Directory with the source PDFs; enables the re-conversion tier.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=(
+            "Fields below this confidence escalate to the next tier, unless a "
+            f"calibrated per-field threshold exists (default: {DEFAULT_THRESHOLD})."
+        ),
+    )
+    parser.add_argument(
+        "--thresholds",
+        type=Path,
+        default=DEFAULT_THRESHOLDS_PATH,
+        help="Calibrated per-field thresholds (default: Main/output/cascade_thresholds.json).",
+    )
+    parser.add_argument(
+        "--calibrate",
+        type=Path,
+        default=None,
+        metavar="GROUND_TRUTH",
+        help=(
+            "Calibrate per-field thresholds from the rule tier on the inputs against "
+            "this ground-truth file, write them to --thresholds and exit."
+        ),
+    )
+    parser.add_argument(
+        "--llm-endpoint",
+        default=None,
+        help=f"OpenAI-compatible chat completions URL (e.g. {DEFAULT_ENDPOINT}).",
+    )
+    parser.add_argument(
+        "--llm-stand-in",
+        action="store_true",
+        help="Use the offline rule-based stand-in instead of a real LLM endpoint.",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Write records as JSON to this path instead of stdout.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Application entry point."""
+
+    args = parse_arguments(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(message)s")
+    paths = collect_doctags_paths(args.inputs)
+
+    if args.calibrate is not None:
+        results = [
+            extract_fields(path.read_text(encoding="utf-8"), source_filename(path))
+            for path in paths
+        ]
+        thresholds = calibrate_thresholds(
+            results, load_ground_truth(args.calibrate), fallback=args.threshold
+        )
+        args.thresholds.parent.mkdir(parents=True, exist_ok=True)
+        args.thresholds.write_text(json.dumps(thresholds, indent=2), encoding="utf-8")
+        LOGGER.info("Calibrated thresholds %s written to %s", thresholds, args.thresholds)
+        return 0
+
+    llm: Optional[LlmClient] = None
+    if args.llm_stand_in:
+        llm = StandInLlmClient()
+    elif args.llm_endpoint:
+        llm = LlmClient(endpoint=args.llm_endpoint)
+    cascade = ExtractionCascade(
+        threshold=args.threshold,
+        reconverter=HeavyReconverter() if args.input_dir else None,
+        llm=llm,
+        thresholds=load_thresholds(args.thresholds),
+    )
+
+    records = []
+    for path in paths:
+        filename = source_filename(path)
+        outcome = cascade.run(
+            filename,
+            path.read_text(encoding="utf-8"),
+            source_pdf=find_source_pdf(args.input_dir, filename),
+        )
+        records.append(outcome.result.to_record())
+        LOGGER.info("%s finished at tier %s", filename, outcome.finished_tier)
+
+    payload = json.dumps(records, indent=2)
+    if args.output:
+        args.output.write_text(payload, encoding="utf-8")
+    else:
+        print(payload)
+    for line in cascade.report_lines():
+        LOGGER.info("Tier %s", line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,407 @@
+"""Token-minimised DocTags for the LLM extraction fallback.
+
+The prompt in ``Main/Prompt-scrapbook.txt`` only needs text elements and their
+``<loc_*>`` boxes to pair keys with values. Full DocTags also carry
+``<picture>`` blocks, page furniture and OTSL tables with a token for every
+empty cell, and prompt latency and cost scale with all of it. The compaction
+stage here:
+
+* drops pictures/charts and, unless asked to keep them, page headers/footers;
+* drops text-free rows and trailing empty cells from OTSL tables; empty and
+  span cells in front of a value stay as ``<ecel>`` so values keep their
+  column;
+* merges text fragments on the same row that sit within ``MERGE_GAP`` loc units
+  (``"1186MJ"`` + ``"Amstelveen"``), keeping a union box;
+* crops each page to the regions around detected key labels plus any element
+  that names a company (on by default; without it the reduction is only
+  about 1.1-1.4x on the sample invoices, against roughly 4x with it);
+* keeps one ``<page_break>`` per source page break, so page numbers survive
+  even for pages left without content; and
+* keeps the four ``<loc_*>`` tags on every remaining element.
+
+``compact_with_report`` returns the compacted string together with a
+before/after token estimate for the document.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import re
+import sys
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from extract import (
+    ELEMENT_PATTERN,
+    FIELD_SPECS,
+    LOC_GRID,
+    PAGE_BREAK,
+    ROW_TOLERANCE,
+    BoundingBox,
+    collect_doctags_paths,
+    company_name_in,
+    decode_otsl,
+    parse_loc_box,
+)
+
+DROPPED_TAGS = frozenset({"picture", "chart"})
+FURNITURE_TAGS = frozenset({"page_header", "page_footer"})
+MERGEABLE_TAGS = frozenset({"text", "paragraph"})
+
+MERGE_GAP = 20
+CROP_MARGIN_LEFT = 20
+CROP_ABOVE = 8
+CROP_BELOW = 60
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+_INNER_TAG_PATTERN = re.compile(r"<[^>]+>")
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Block:
+    """Top-level DocTags element kept for the compacted output."""
+
+    tag: str
+    bbox: BoundingBox
+    text: str
+    page_no: int
+
+
+@dataclass(frozen=True)
+class CompactionReport:
+    """Token counts before and after compaction for one document."""
+
+    filename: str
+    original_tokens: int
+    compact_tokens: int
+
+    @property
+    def ratio(self) -> float:
+        """Reduction factor (original / compact)."""
+
+        return self.original_tokens / self.compact_tokens if self.compact_tokens else 0.0
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate the prompt token count of a DocTags string.
+
+    Counts every word and punctuation mark as one token, so ``<loc_24>`` costs
+    three. This is only a stand-in for a model tokenizer, but it tracks
+    relative reductions well.
+    """
+
+    return len(_TOKEN_PATTERN.findall(text))
+
+
+def compact_table(body: str) -> str:
+    """Re-emit an OTSL body without text-free rows and trailing empty cells.
+
+    Empty and span cells before the last value of a row become ``<ecel>``
+    placeholders, so every value stays in its source column.
+
+    Returns:
+        OTSL rows such as ``<ecel><rhed>Lease fee<fcel>262,26<nl>``; rows
+        without text are dropped entirely.
+    """
+
+    rows = []
+    for row in decode_otsl(body):
+        filled = [position for position, cell in enumerate(row) if cell.text]
+        if not filled:
+            continue
+        cells = "".join(
+            f"<{cell.token}>{cell.text}" if cell.text else "<ecel>"
+            for cell in row[: filled[-1] + 1]
+        )
+        rows.append(f"{cells}<nl>")
+    return "".join(rows)
+
+
+def parse_blocks(doctags: str, keep_furniture: bool = False) -> List[Block]:
+    """Parse DocTags into compacted blocks, dropping pictures and furniture.
+
+    Args:
+        doctags: Full DocTags string.
+        keep_furniture: Retain ``page_header``/``page_footer`` elements.
+
+    Returns:
+        Blocks in reading order.
+    """
+
+    blocks: List[Block] = []
+    for page_no, page_text in enumerate(doctags.split(PAGE_BREAK), start=1):
+        for match in ELEMENT_PATTERN.finditer(page_text):
+            tag = match.group("tag")
+            if tag in DROPPED_TAGS or (tag in FURNITURE_TAGS and not keep_furniture):
+                continue
+            bbox = parse_loc_box(
+                match.group("x1"), match.group("y1"), match.group("x2"), match.group("y2")
+            )
+            body = match.group("body")
+            if tag == "otsl":
+                text = compact_table(body)
+            else:
+                text = " ".join(_INNER_TAG_PATTERN.sub("", body).split())
+            if text:
+                blocks.append(Block(tag, bbox, text, page_no))
+    return blocks
+
+
+def merge_fragments(blocks: Sequence[Block], gap: int = MERGE_GAP) -> List[Block]:
+    """Merge same-row text fragments that sit within ``gap`` loc units.
+
+    Args:
+        blocks: Blocks in reading order.
+        gap: Maximum horizontal distance between neighbouring fragments.
+
+    Returns:
+        Blocks in the original reading order, with merged fragments folded
+        into the left-most fragment's position.
+    """
+
+    merged: List[Optional[Block]] = list(blocks)
+    order = sorted(
+        (i for i, block in enumerate(blocks) if block.tag in MERGEABLE_TAGS),
+        key=lambda i: (blocks[i].page_no, blocks[i].bbox.y1, blocks[i].bbox.x1),
+    )
+    anchor: Optional[int] = None
+    for position in order:
+        block = blocks[position]
+        current = merged[anchor] if anchor is not None else None
+        if (
+            current is not None
+            and anchor is not None
+            and current.page_no == block.page_no
+            and abs(current.bbox.y1 - block.bbox.y1) <= ROW_TOLERANCE
+            and 0 <= block.bbox.x1 - current.bbox.x2 <= gap
+        ):
+            merged[anchor] = replace(
+                current,
+                text=f"{current.text} {block.text}",
+                bbox=BoundingBox(
+                    current.bbox.x1,
+                    min(current.bbox.y1, block.bbox.y1),
+                    block.bbox.x2,
+                    max(current.bbox.y2, block.bbox.y2),
+                ),
+            )
+            merged[position] = None
+        else:
+            anchor = position
+    return [block for block in merged if block is not None]
+
+
+def _is_label(text: str, match: re.Match[str]) -> bool:
+    """Reject key words used in prose (``"... the invoice number on your ..."``)."""
+
+    tail = text[match.end() :].lstrip(" ,")
+    return not tail or not tail[0].islower()
+
+
+def _key_regions(blocks: Sequence[Block]) -> List[Tuple[int, BoundingBox]]:
+    regions: List[Tuple[int, BoundingBox]] = []
+    for block in blocks:
+        if any(
+            _is_label(block.text, match)
+            for spec in FIELD_SPECS
+            for match in spec.key_pattern.finditer(block.text)
+        ):
+            box = block.bbox
+            regions.append(
+                (
+                    block.page_no,
+                    BoundingBox(
+                        max(0, box.x1 - CROP_MARGIN_LEFT),
+                        max(0, box.y1 - CROP_ABOVE),
+                        LOC_GRID,
+                        min(LOC_GRID, box.y2 + CROP_BELOW),
+                    ),
+                )
+            )
+    return regions
+
+
+def _intersects(box: BoundingBox, region: BoundingBox) -> bool:
+    return box.x1 <= region.x2 and box.x2 >= region.x1 and box.y1 <= region.y2 and box.y2 >= region.y1
+
+
+def _has_key_value(text: str) -> bool:
+    return any(
+        spec.key_pattern.search(text) and spec.value_pattern.search(text) for spec in FIELD_SPECS
+    )
+
+
+def _crop_table(block: Block) -> Optional[Block]:
+    """Keep only table rows holding a key label with a value, or a company name."""
+
+    rows = []
+    for row in block.text.split("<nl>"):
+        plain = " ".join(_INNER_TAG_PATTERN.sub(" ", row).split())
+        if plain and (_has_key_value(plain) or company_name_in(plain)):
+            rows.append(f"{row}<nl>")
+    return replace(block, text="".join(rows)) if rows else None
+
+
+def crop_to_keys(blocks: Sequence[Block]) -> List[Block]:
+    """Keep blocks near detected key labels and blocks naming a company.
+
+    Each text key label opens a region from just left of the label to the
+    right page edge and ``CROP_BELOW`` loc units down, matching where the
+    prompt looks for values. Tables are cropped row by row instead, since a
+    ``BTW%`` column header says nothing about where the supplier VAT id is.
+    Documents without any key label are returned unchanged.
+    """
+
+    text_blocks = [block for block in blocks if block.tag != "otsl"]
+    regions = _key_regions(text_blocks)
+    if not regions and not any(_has_key_value(block.text) for block in blocks):
+        return list(blocks)
+
+    kept: List[Block] = []
+    for block in blocks:
+        if block.tag == "otsl":
+            cropped = _crop_table(block)
+            if cropped is not None:
+                kept.append(cropped)
+        elif company_name_in(block.text) or any(
+            page == block.page_no and _intersects(block.bbox, region) for page, region in regions
+        ):
+            kept.append(block)
+    return kept
+
+
+def render_blocks(blocks: Sequence[Block], page_count: Optional[int] = None) -> str:
+    """Serialise blocks back to DocTags with their loc tags.
+
+    Args:
+        blocks: Blocks in reading order.
+        page_count: Pages in the source document. Every source page break is
+            emitted, including those around pages without kept blocks, so
+            ``<page_break>`` counting still gives source page numbers.
+    """
+
+    lines: List[str] = ["<doctag>"]
+    page_no = 1
+    for block in blocks:
+        lines.extend([PAGE_BREAK] * (block.page_no - page_no))
+        page_no = max(page_no, block.page_no)
+        box = block.bbox
+        lines.append(
+            f"<{block.tag}><loc_{box.x1}><loc_{box.y1}><loc_{box.x2}><loc_{box.y2}>"
+            f"{block.text}</{block.tag}>"
+        )
+    if page_count is not None:
+        lines.extend([PAGE_BREAK] * (page_count - page_no))
+    lines.append("</doctag>")
+    return "\n".join(lines)
+
+
+def compact_doctags(doctags: str, crop: bool = True, keep_furniture: bool = False) -> str:
+    """Return a token-minimised version of ``doctags``.
+
+    Args:
+        doctags: Full DocTags string.
+        crop: Restrict pages to regions around detected key labels; most of
+            the reduction comes from this step.
+        keep_furniture: Retain page headers and footers.
+    """
+
+    blocks = merge_fragments(parse_blocks(doctags, keep_furniture=keep_furniture))
+    if crop:
+        blocks = crop_to_keys(blocks)
+    return render_blocks(blocks, page_count=doctags.count(PAGE_BREAK) + 1)
+
+
+def compact_with_report(
+    doctags: str,
+    filename: str = "",
+    crop: bool = True,
+    keep_furniture: bool = False,
+    tokenizer: Callable[[str], int] = estimate_tokens,
+) -> Tuple[str, CompactionReport]:
+    """Compact ``doctags`` and report the token reduction.
+
+    Args:
+        doctags: Full DocTags string.
+        filename: Name recorded in the report.
+        crop: Restrict pages to regions around detected key labels.
+        keep_furniture: Retain page headers and footers.
+        tokenizer: Token counter; defaults to :func:`estimate_tokens`.
+
+    Returns:
+        Tuple of the compacted DocTags and its ``CompactionReport``.
+    """
+
+    compacted = compact_doctags(doctags, crop=crop, keep_furniture=keep_furniture)
+    report = CompactionReport(filename, tokenizer(doctags), tokenizer(compacted))
+    return compacted, report
+
+
+def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse CLI arguments for DocTags compaction."""
+
+    parser = argparse.ArgumentParser(
+        description="Compact DocTags files for the LLM extraction prompt."
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        type=Path,
+        help="DocTags files or directories containing *.doctags.txt files.",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=None,
+        help="Write <stem>.compact.txt files here (default: report only).",
+    )
+    parser.add_argument(
+        "--no-crop",
+        action="store_true",
+        help=(
+            "Keep whole pages instead of only the regions around key labels and "
+            "company names (about 1.1-1.4x reduction instead of roughly 4x)."
+        ),
+    )
+    parser.add_argument(
+        "--keep-furniture",
+        action="store_true",
+        help="Retain page headers and footers.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Application entry point."""
+
+    args = parse_arguments(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(message)s")
+    if args.output_dir:
+        args.output_dir.mkdir(parents=True, exist_ok=True)
+
+    for path in collect_doctags_paths(args.inputs):
+        compacted, report = compact_with_report(
+            path.read_text(encoding="utf-8"),
+            filename=path.name,
+            crop=not args.no_crop,
+            keep_furniture=args.keep_furniture,
+        )
+        LOGGER.info(
+            "%s | tokens %d -> %d | reduction %.1fx",
+            report.filename,
+            report.original_tokens,
+            report.compact_tokens,
+            report.ratio,
+        )
+        if args.output_dir:
+            stem = path.name.removesuffix(".doctags.txt")
+            (args.output_dir / f"{stem}.compact.txt").write_text(compacted, encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,37 @@
+"""Shared fixtures for the tests in ``Main/``.
+
+Run from ``Main/`` with ``python -m pytest -q``. The fixtures read the stored
+EF1/OG1 outputs in ``output/doctags`` and the labels in
+``output/ground_truth_template.json``; nothing here needs Docling itself.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Optional
+
+import pytest
+
+BASE_DIR = Path(__file__).resolve().parent
+DOCTAGS_DIR = BASE_DIR / "output" / "doctags"
+SAMPLES = ("EF1", "OG1")
+
+
+@pytest.fixture(scope="session")
+def doctags() -> Dict[str, str]:
+    """DocTags of the stored samples keyed by stem (``EF1``, ``OG1``)."""
+
+    return {
+        stem: (DOCTAGS_DIR / f"{stem}.doctags.txt").read_text(encoding="utf-8")
+        for stem in SAMPLES
+    }
+
+
+@pytest.fixture(scope="session")
+def ground_truth() -> Dict[str, Dict[str, Optional[str]]]:
+    """Labelled records of the stored samples keyed by stem."""
+
+    from evaluate import DEFAULT_GROUND_TRUTH, load_ground_truth
+
+    records = load_ground_truth(DEFAULT_GROUND_TRUTH)
+    return {stem: records[f"{stem}.pdf"] for stem in SAMPLES}
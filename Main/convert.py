@@ -30,13 +30,13 @@ import logging
 import platform
 import sys
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from docling.backend.docling_parse_v4_backend import DoclingParseV4DocumentBackend
 from docling.backend.pypdfium2_backend import PyPdfiumDocumentBackend
 from docling.datamodel.accelerator_options import AcceleratorDevice, AcceleratorOptions
 from docling.datamodel.backend_options import PdfBackendOptions
-from docling.datamodel.base_models import InputFormat, OutputFormat
+from docling.datamodel.base_models import ConversionStatus, InputFormat, OutputFormat
 from docling.datamodel.layout_model_specs import (
     DOCLING_LAYOUT_EGRET_LARGE,
     DOCLING_LAYOUT_EGRET_MEDIUM,
@@ -66,6 +66,22 @@ from docling.datamodel.pipeline_options import EasyOcrOptions
 from docling.datamodel.settings import DEFAULT_PAGE_RANGE
 from docling.document_converter import DocumentConverter, PdfFormatOption
 
+from dedupe import DEDUPE_MODES, group_duplicates, link_outputs
+from extract import GROUND_TRUTH_FIELDS, ExtractionResult, extract_document
+from logsetup import DEFAULT_BACKUPS as LOG_BACKUPS
+from logsetup import DEFAULT_LEVELS as LOG_LEVELS
+from logsetup import DEFAULT_MAX_MB as LOG_MAX_MB
+from logsetup import close_logger, parse_levels, snapshot_logger, start_logging, stop_logging
+from manifest import OutputManifest, WriteStats, write_if_changed
+from memory import MEMORY_MODES, MemoryTracker, write_summary
+from metrics import DEFAULT_INTERVAL as METRICS_INTERVAL
+from metrics import ConversionMetrics, MetricsExporter
+from profiling import DEFAULT_SLOW_SECONDS, PROFILE_MODES, DocumentProfiler
+from progress import PROGRESS_MODES, BatchProgress, TqdmHandler, progress_enabled
+from progressive import merge_results, missing_fields
+from runreport import DEFAULT_BACKUPS, DEFAULT_MAX_MB, REPORT_NAME, DocumentEntry, RunReport
+from sink import DEFAULT_FLUSH_EVERY, DocTagsPageWriter, JsonlSink
+
 BASE_DIR = Path(__file__).resolve().parent
 
 
@@ -140,35 +156,42 @@ def parse_page_range(expression: str) -> Tuple[int, int]:
     return start, end
 
 
-def configure_logging(log_path: Path) -> logging.Logger:
-    """Configure logging to emit both file and console output.
+def configure_logging(
+    log_path: Path,
+    level_specs: Sequence[str] = LOG_LEVELS,
+    max_mb: float = LOG_MAX_MB,
+    backups: int = LOG_BACKUPS,
+    progress: bool = False,
+) -> logging.Logger:
+    """Configure non-blocking logging to a rotating file and the console.
+
+    Records go through a queue to a listener thread (see :mod:`logsetup`), so
+    log calls on the conversion thread never wait on file or console I/O.
 
     Args:
         log_path: Destination for the log file.
+        level_specs: ``name=LEVEL`` overrides, e.g. ``docling=WARNING``.
+        max_mb: Rotate the log file beyond this size in MiB.
+        backups: Rotated log files kept.
+        progress: A progress bar owns the console; only warnings and errors
+            are printed there (above the bar), the log file keeps everything.
 
     Returns:
         Configured root logger.
     """
 
-    log_path.parent.mkdir(parents=True, exist_ok=True)
-    logger = logging.getLogger()
-    logger.setLevel(logging.INFO)
-    logger.handlers.clear()
-
-    formatter = logging.Formatter(
-        "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+    console_handler = None
+    if progress:
+        console_handler = TqdmHandler()
+        console_handler.setLevel(logging.WARNING)
+    return start_logging(
+        log_path,
+        parse_levels(level_specs),
+        max_bytes=int(max_mb * (1 << 20)),
+        backups=backups,
+        console_handler=console_handler,
     )
 
-    file_handler = logging.FileHandler(log_path, mode="w", encoding="utf-8")
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
-
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-
-    return logger
-
 
 def list_supported_options() -> None:
     """Print all enum-driven configuration options to stdout."""
@@ -468,67 +491,94 @@ def summarise_accelerator(device_value: str) -> str:
     return f"Custom accelerator string requested: {device_value}"
 
 
-def export_conversion_results(
-    conversion_result,
+def render_document_json(doc: Any) -> str:
+    """Serialize a Docling document to JSON, embedding table OTSL strings.
+
+    Args:
+        doc: Docling document produced by the conversion pipeline.
+
+    Returns:
+        JSON payload with ``tables[*].data.otsl_seq`` populated when available.
+    """
+
+    payload: Dict[str, Any] = doc.export_to_dict()
+    tables: List[Dict[str, Any]] = payload.get("tables", [])
+    if not tables:
+        return json.dumps(payload, indent=2)
+
+    for idx, table_dict in enumerate(tables):
+        if idx >= len(doc.tables):
+            break
+        otsl_text = doc.tables[idx].export_to_otsl(doc=doc)
+        if not otsl_text:
+            continue
+        data_block = table_dict.get("data")
+        if isinstance(data_block, dict):
+            data_block["otsl_seq"] = otsl_text
+        else:
+            table_dict["data"] = {"otsl_seq": otsl_text}
+
+    return json.dumps(payload, indent=2)
+
+
+OUTPUT_SUFFIXES: Dict[OutputFormat, str] = {
+    OutputFormat.DOCTAGS: ".doctags.txt",
+    OutputFormat.TEXT: ".txt",
+    OutputFormat.MARKDOWN: ".md",
+    OutputFormat.JSON: ".json",
+    OutputFormat.HTML: ".html",
+}
+
+
+def document_exporters(document: Any) -> Dict[OutputFormat, Tuple[Callable[[], str], str]]:
+    """Map each supported output format to its producer and file suffix.
+
+    Args:
+        document: Docling document to export.
+
+    Returns:
+        ``{OutputFormat: (producer, suffix)}``; producers render lazily.
+    """
+
+    producers: Dict[OutputFormat, Callable[[], str]] = {
+        OutputFormat.DOCTAGS: lambda: document.export_to_doctags(),
+        OutputFormat.TEXT: lambda: document.export_to_text(),
+        OutputFormat.MARKDOWN: lambda: document.export_to_markdown(),
+        OutputFormat.JSON: lambda: render_document_json(document),
+        OutputFormat.HTML: lambda: document.export_to_html(),
+    }
+    return {fmt: (producer, OUTPUT_SUFFIXES[fmt]) for fmt, producer in producers.items()}
+
+
+def export_document(
+    document: Any,
     formats: Sequence[OutputFormat],
     output_dir: Path,
     stem: str,
     logger: logging.Logger,
-) -> None:
-    """Persist conversion outputs for the requested formats.
+    manifest: Optional[OutputManifest] = None,
+    stats: Optional[WriteStats] = None,
+) -> WriteStats:
+    """Persist a Docling document in the requested formats.
+
+    Files whose content is unchanged are not rewritten (see
+    :func:`manifest.write_if_changed`).
 
     Args:
-        conversion_result: Docling ``ConversionResult`` instance.
+        document: Docling document, freshly converted or loaded from JSON.
         formats: Iterable of output formats to produce.
         output_dir: Destination directory.
         stem: Base filename (without suffix).
         logger: Application logger.
-    """
+        manifest: Optional sidecar manifest for ``output_dir``.
+        stats: Counters to update; a new ``WriteStats`` is used when omitted.
 
-    def render_document_json(doc: Any) -> str:
-        """Serialize a Docling document to JSON, embedding table OTSL strings.
-
-        Args:
-            doc: Docling document produced by the conversion pipeline.
-
-        Returns:
-            JSON payload with ``tables[*].data.otsl_seq`` populated when available.
-        """
-
-        payload: Dict[str, Any] = doc.export_to_dict()
-        tables: List[Dict[str, Any]] = payload.get("tables", [])
-        if not tables:
-            return json.dumps(payload, indent=2)
-
-        for idx, table_dict in enumerate(tables):
-            if idx >= len(doc.tables):
-                break
-            otsl_text = doc.tables[idx].export_to_otsl(doc=doc)
-            if not otsl_text:
-                continue
-            data_block = table_dict.get("data")
-            if isinstance(data_block, dict):
-                data_block["otsl_seq"] = otsl_text
-            else:
-                table_dict["data"] = {"otsl_seq": otsl_text}
-
-        return json.dumps(payload, indent=2)
-
-    document = conversion_result.document
-    exporters = {
-        OutputFormat.DOCTAGS: (
-            lambda: document.export_to_doctags(),
-            ".doctags.txt",
-        ),
-        OutputFormat.TEXT: (lambda: document.export_to_text(), ".txt"),
-        OutputFormat.MARKDOWN: (lambda: document.export_to_markdown(), ".md"),
-        OutputFormat.JSON: (
-            lambda: render_document_json(document),
-            ".json",
-        ),
-        OutputFormat.HTML: (lambda: document.export_to_html(), ".html"),
-    }
+    Returns:
+        The updated write counters.
+    """
 
+    stats = stats if stats is not None else WriteStats()
+    exporters = document_exporters(document)
     output_dir.mkdir(parents=True, exist_ok=True)
 
     for fmt in formats:
@@ -538,8 +588,69 @@ def export_conversion_results(
         producer, suffix = exporters[fmt]
         payload = producer()
         destination = output_dir / f"{stem}{suffix}"
-        destination.write_text(payload, encoding="utf-8")
-        logger.info("Wrote %s output to %s", fmt.value, destination)
+        if write_if_changed(destination, payload, manifest, stats):
+            logger.info("Wrote %s output to %s", fmt.value, destination)
+        else:
+            logger.info("Unchanged %s output, skipped %s", fmt.value, destination)
+    return stats
+
+
+def export_conversion_results(
+    conversion_result,
+    formats: Sequence[OutputFormat],
+    output_dir: Path,
+    stem: str,
+    logger: logging.Logger,
+    manifest: Optional[OutputManifest] = None,
+    stats: Optional[WriteStats] = None,
+) -> WriteStats:
+    """Persist conversion outputs for the requested formats.
+
+    Args:
+        conversion_result: Docling ``ConversionResult`` instance.
+        formats: Iterable of output formats to produce.
+        output_dir: Destination directory.
+        stem: Base filename (without suffix).
+        logger: Application logger.
+        manifest: Optional sidecar manifest for ``output_dir``.
+        stats: Counters to update.
+
+    Returns:
+        The updated write counters.
+    """
+
+    return export_document(
+        conversion_result.document, formats, output_dir, stem, logger, manifest, stats
+    )
+
+
+def build_converter(
+    pipeline_options: PdfPipelineOptions,
+    backend_options: PdfBackendOptions,
+    backend_key: str,
+) -> DocumentConverter:
+    """Create a PDF-only ``DocumentConverter`` for the given configuration.
+
+    Args:
+        pipeline_options: Fully configured pipeline options.
+        backend_options: PDF backend configuration.
+        backend_key: Key identifying the backend class in ``PDF_BACKEND_MAP``.
+
+    Returns:
+        Converter ready for ``convert`` calls; reuse it across documents so the
+        models load only once.
+    """
+
+    return DocumentConverter(
+        allowed_formats=[InputFormat.PDF],
+        format_options={
+            InputFormat.PDF: PdfFormatOption(
+                pipeline_options=pipeline_options,
+                backend=PDF_BACKEND_MAP[backend_key],
+                backend_options=backend_options,
+            )
+        },
+    )
 
 
 def convert_documents(
@@ -564,17 +675,7 @@ def convert_documents(
         Number of failed conversions.
     """
 
-    backend_cls = PDF_BACKEND_MAP[backend_key]
-    converter = DocumentConverter(
-        allowed_formats=[InputFormat.PDF],
-        format_options={
-            InputFormat.PDF: PdfFormatOption(
-                pipeline_options=pipeline_options,
-                backend=backend_cls,
-                backend_options=backend_options,
-            )
-        },
-    )
+    converter = build_converter(pipeline_options, backend_options, backend_key)
 
     pdf_files = sorted(
         path
@@ -585,40 +686,407 @@ def convert_documents(
         logger.warning("No PDF files found in %s.", args.input_dir)
         return 0
 
+    groups = group_duplicates(pdf_files, args.dedupe)
+    exact = sum(len(group.duplicates) for group in groups)
+    near = sum(len(group.near_duplicates) for group in groups)
+    for group in groups:
+        for duplicate in group.members:
+            logger.info("Duplicate input %s -> reusing %s", duplicate, group.canonical)
+    logger.info(
+        "Inputs: %d file(s), %d unique, %d exact duplicate(s), %d near-duplicate(s)",
+        len(pdf_files),
+        len(groups),
+        exact,
+        near,
+    )
+
     page_range = (
         parse_page_range(args.page_range) if args.page_range else DEFAULT_PAGE_RANGE
     )
     max_num_pages = args.max_pages if args.max_pages is not None else sys.maxsize
     max_file_size = args.max_file_size if args.max_file_size is not None else sys.maxsize
 
+    sink = (
+        JsonlSink(args.stream_jsonl, flush_every=args.flush_every)
+        if args.stream_jsonl
+        else None
+    )
+    manifest = OutputManifest(args.output_dir)
+    write_stats = WriteStats()
+    profiler = DocumentProfiler(
+        args.profile,
+        args.profile_dir or args.output_dir / "profiles",
+        interval=args.profile_interval / 1000.0,
+        slow_seconds=args.profile_slow_seconds,
+    )
+    memory = MemoryTracker(args.memory_profile, args.reports_dir)
+    report = RunReport(
+        args.run_report or args.output_dir / REPORT_NAME,
+        vars(args),
+        max_bytes=int(args.run_report_max_mb * (1 << 20)),
+        backups=args.run_report_backups,
+    )
+    progress = BatchProgress(len(pdf_files), enabled=progress_enabled(args.progress))
+    metrics = ConversionMetrics()
+    metrics.batch_started(len(pdf_files))
+    exporter = MetricsExporter(
+        metrics, args.metrics_port, args.metrics_textfile, args.metrics_interval
+    )
+    if exporter.address is not None:
+        logger.info("Serving metrics on http://%s:%d/metrics", *exporter.address)
     failures = 0
-    for pdf_path in pdf_files:
-        logger.info("Starting conversion: %s", pdf_path)
-        try:
+    try:
+        for group in groups:
+            with profiler.document(group.canonical.stem), memory.document(
+                group.canonical, args
+            ), report.document(group.canonical, group.members) as entry:
+                succeeded = convert_one(
+                    converter,
+                    group.canonical,
+                    args,
+                    page_range,
+                    max_num_pages,
+                    max_file_size,
+                    output_formats,
+                    sink,
+                    logger,
+                    manifest=manifest,
+                    write_stats=write_stats,
+                    duplicates=group.members,
+                    memory=memory,
+                    entry=entry,
+                )
+            if not succeeded:
+                failures += 1 + len(group.members)
+            progress.update(
+                1 + len(group.members), entry.pages, entry.timings, failed=not succeeded
+            )
+            metrics.document_finished(
+                1 + len(group.members),
+                entry.pages,
+                entry.status,
+                entry.error_class,
+                entry.timings,
+                busy_seconds=entry.timings.get("total", 0.0),
+            )
+    finally:
+        exporter.close()
+        progress.close()
+        report.close()
+        logger.info("Run report %s appended to %s", report.run_id, report.path)
+        if sink is not None:
+            sink.close()
+            logger.info("Streamed %d record(s) to %s", sink.count, sink.path)
+        else:
+            manifest.save()
+            logger.info(
+                "Output files: written=%d skipped_unchanged=%d bytes_written=%d",
+                write_stats.written,
+                write_stats.skipped,
+                write_stats.bytes_written,
+            )
+        if memory.enabled:
+            write_summary(memory, args.reports_dir)
+    return failures
+
+
+def convert_progressive(
+    converter: DocumentConverter,
+    pdf_path: Path,
+    args: argparse.Namespace,
+    page_range: Tuple[int, int],
+    max_num_pages: int,
+    max_file_size: int,
+    logger: logging.Logger,
+) -> Tuple[Any, ExtractionResult]:
+    """Convert the leading pages first and widen the range only when needed.
+
+    The first ``--progressive-pages`` pages of ``page_range`` are converted and
+    extracted; only when a ``--required-fields`` value is still missing (and
+    the document has more pages) are the remaining pages converted and merged
+    into the first result with :func:`merge_results`. No page is converted
+    twice, and invoice headers come back at single-page latency. The PDF is
+    opened and parsed once per pass.
+
+    Returns:
+        ``(conversion_result, extraction)`` covering every converted page.
+    """
+
+    first, last = page_range
+    split = min(last, first + args.progressive_pages - 1)
+
+    def convert_window(window: Tuple[int, int]) -> Any:
+        return converter.convert(
+            source=pdf_path,
+            raises_on_error=args.raises_on_error,
+            max_num_pages=max_num_pages,
+            max_file_size=max_file_size,
+            page_range=window,
+        )
+
+    result = convert_window((first, split))
+    extraction = extract_document(result.document, f"{pdf_path.stem}.pdf")
+    missing = missing_fields(extraction, args.required_fields)
+    last = min(last, result.input.page_count)
+    if missing and split < last:
+        logger.info(
+            "Progressive: %s missing %s after pages %d-%d; converting pages %d-%d.",
+            pdf_path.name,
+            ", ".join(missing),
+            first,
+            split,
+            split + 1,
+            last,
+        )
+        result = merge_results(result, convert_window((split + 1, last)))
+        extraction = extract_document(result.document, f"{pdf_path.stem}.pdf")
+    return result, extraction
+
+
+def iter_page_doctags(
+    converter: DocumentConverter,
+    pdf_path: Path,
+    args: argparse.Namespace,
+    page_range: Tuple[int, int],
+    max_num_pages: int,
+    max_file_size: int,
+    logger: Optional[logging.Logger] = None,
+    memory: Optional[MemoryTracker] = None,
+    entry: Optional[DocumentEntry] = None,
+) -> Iterator[Tuple[int, str]]:
+    """Yield ``(page_no, doctags)`` for each page as soon as it is converted.
+
+    Docling assembles a document only once all requested pages have left the
+    pipeline, so the page range is converted in windows of
+    ``--page-window`` pages on the warm converter. Only one window's
+    ``ConversionResult`` is alive at a time, which bounds memory by pages in
+    flight rather than by document length. A window that does not convert
+    with ``ConversionStatus.SUCCESS`` raises ``RuntimeError``, so a partial
+    conversion is never streamed as a complete document.
+
+    Every window is a separate ``converter.convert`` call, so Docling opens
+    and parses the PDF again for each one. That fixed cost grows with the
+    file size and is paid ``pages / --page-window`` times; raise the window
+    for large files when memory allows.
+
+    Args:
+        logger: Optional logger for per-window timings.
+        memory: Optional tracker; each window is its own ``convert <first>-<last>`` stage.
+        entry: Optional run-report entry; window times add up to its ``convert`` timing.
+    """
+
+    memory = memory or MemoryTracker()
+    entry = entry or DocumentEntry(str(pdf_path))
+    first, last = page_range
+    start = first
+    while start <= last:
+        end = min(last, start + args.page_window - 1)
+        before = entry.timings.get("convert", 0.0)
+        with memory.stage(f"convert {start}-{end}"), entry.timed("convert"):
             result = converter.convert(
                 source=pdf_path,
                 raises_on_error=args.raises_on_error,
                 max_num_pages=max_num_pages,
                 max_file_size=max_file_size,
-                page_range=page_range,
+                page_range=(start, end),
             )
-        except Exception as exc:  # noqa: BLE001 -- surface full exception detail
-            failures += 1
-            logger.exception("Conversion failed for %s: %s", pdf_path, exc)
-            continue
+        if logger is not None:
+            logger.info(
+                "Converted pages %d-%d of %s in %.2fs",
+                start,
+                min(end, result.input.page_count),
+                pdf_path.name,
+                entry.timings["convert"] - before,
+            )
+        if result.status != ConversionStatus.SUCCESS:
+            errors = "; ".join(error.error_message for error in result.errors or [])
+            raise RuntimeError(
+                f"Pages {start}-{end} of {pdf_path.name} ended with status "
+                f"{result.status.value}" + (f": {errors}" if errors else "")
+            )
+        document = result.document
+        for page_no in sorted(document.pages):
+            yield page_no, document.export_to_doctags(pages={page_no})
+        last = min(last, result.input.page_count)
+        start = end + 1
 
-        output_base = args.output_dir
-        stem = pdf_path.stem
-        export_conversion_results(result, output_formats, output_base, stem, logger)
 
-        page_count = len(result.pages) if result.pages else 0
-        logger.info(
-            "Completed %s | status=%s | pages=%d",
+def convert_paged(
+    converter: DocumentConverter,
+    pdf_path: Path,
+    args: argparse.Namespace,
+    page_range: Tuple[int, int],
+    max_num_pages: int,
+    max_file_size: int,
+    logger: logging.Logger,
+    duplicates: Sequence[Path] = (),
+    on_page: Optional[Callable[[int, str], None]] = None,
+    memory: Optional[MemoryTracker] = None,
+    entry: Optional[DocumentEntry] = None,
+) -> bool:
+    """Stream one PDF's DocTags to ``<stem>.doctags.txt`` page by page.
+
+    Pages are appended to ``<stem>.doctags.txt.partial``, which replaces the
+    output only when every window converted successfully; on failure the
+    partial file is removed and the previous output is kept (see
+    :class:`sink.DocTagsPageWriter`).
+
+    Args:
+        on_page: Optional consumer called with ``(page_no, doctags)`` for every
+            page right after it is appended to the file.
+        memory: Optional tracker; every window is measured as its own stage.
+        entry: Optional run-report entry to fill in. ``convert`` sums the
+            window conversions; writing pages counts as ``export``.
+
+    Returns:
+        ``True`` when every page was converted.
+    """
+
+    logger.info("Starting paged conversion: %s", pdf_path)
+    stem = pdf_path.stem
+    suffix = OUTPUT_SUFFIXES[OutputFormat.DOCTAGS]
+    destination = args.output_dir / f"{stem}{suffix}"
+    memory = memory or MemoryTracker()
+    entry = entry or DocumentEntry(str(pdf_path))
+    entry.outputs.append(str(destination))
+    try:
+        with DocTagsPageWriter(destination) as writer:
+            for page_no, doctags in iter_page_doctags(
+                converter,
+                pdf_path,
+                args,
+                page_range,
+                max_num_pages,
+                max_file_size,
+                logger=logger,
+                memory=memory,
+                entry=entry,
+            ):
+                with entry.timed("export"):
+                    writer.write_page(doctags)
+                    if on_page is not None:
+                        on_page(page_no, doctags)
+                logger.info(
+                    "Appended page %d of %s to %s", page_no, pdf_path.name, writer.partial_path
+                )
+    except Exception as exc:  # noqa: BLE001 -- surface full exception detail
+        logger.exception("Paged conversion failed for %s: %s", pdf_path, exc)
+        entry.fail(exc)
+        return False
+
+    entry.pages = writer.pages
+    if memory.current is not None:
+        memory.current.pages = writer.pages
+    for duplicate in duplicates:
+        for linked in link_outputs(args.output_dir, stem, duplicate.stem, [suffix]):
+            logger.info("Linked duplicate output %s", linked)
+    logger.info("Completed %s | streamed pages=%d", pdf_path, writer.pages)
+    return True
+
+
+def convert_one(
+    converter: DocumentConverter,
+    pdf_path: Path,
+    args: argparse.Namespace,
+    page_range: Tuple[int, int],
+    max_num_pages: int,
+    max_file_size: int,
+    output_formats: Sequence[OutputFormat],
+    sink: Optional[JsonlSink],
+    logger: logging.Logger,
+    manifest: Optional[OutputManifest] = None,
+    write_stats: Optional[WriteStats] = None,
+    duplicates: Sequence[Path] = (),
+    memory: Optional[MemoryTracker] = None,
+    entry: Optional[DocumentEntry] = None,
+) -> bool:
+    """Convert one PDF and either export files or stream its record.
+
+    In streaming mode the ``DoclingDocument`` goes straight into
+    :func:`extract.extract_document` and only the ground-truth record (plus
+    DocTags when ``--stream-doctags`` is set) is appended to ``sink``; no
+    per-document files are written.
+
+    ``duplicates`` share this conversion: they get a copy of the streamed
+    record under their own filename, or links to the exported files.
+
+    With a ``memory`` tracker the ``convert``, ``extract`` and ``export``
+    stages are measured separately (progressive extraction counts as
+    ``convert``). ``entry`` receives the status, page count, stage timings,
+    output paths and error class for the run report.
+
+    Returns:
+        ``True`` when the conversion succeeded.
+    """
+
+    if args.stream_pages:
+        return convert_paged(
+            converter,
             pdf_path,
-            result.status.value if hasattr(result.status, "value") else result.status,
-            page_count,
+            args,
+            page_range,
+            max_num_pages,
+            max_file_size,
+            logger,
+            duplicates,
+            memory=memory,
+            entry=entry,
         )
-    return failures
+
+    logger.info("Starting conversion: %s", pdf_path)
+    memory = memory or MemoryTracker()
+    entry = entry or DocumentEntry(str(pdf_path))
+    extraction: Optional[ExtractionResult] = None
+    try:
+        with memory.stage("convert"), entry.timed("convert"):
+            if args.progressive:
+                result, extraction = convert_progressive(
+                    converter, pdf_path, args, page_range, max_num_pages, max_file_size, logger
+                )
+            else:
+                result = converter.convert(
+                    source=pdf_path,
+                    raises_on_error=args.raises_on_error,
+                    max_num_pages=max_num_pages,
+                    max_file_size=max_file_size,
+                    page_range=page_range,
+                )
+    except Exception as exc:  # noqa: BLE001 -- surface full exception detail
+        logger.exception("Conversion failed for %s: %s", pdf_path, exc)
+        entry.fail(exc)
+        return False
+
+    memory.describe(result.document)
+    stem = pdf_path.stem
+    if sink is not None:
+        if extraction is None:
+            with memory.stage("extract"), entry.timed("extract"):
+                extraction = extract_document(result.document, f"{stem}.pdf")
+        record: Dict[str, Any] = extraction.to_record()
+        with memory.stage("export"), entry.timed("export"):
+            if args.stream_doctags:
+                record["doctags"] = result.document.export_to_doctags()
+            sink.write(record)
+            for duplicate in duplicates:
+                sink.write({**record, "filename": f"{duplicate.stem}.pdf"})
+        entry.outputs.append(str(sink.path))
+    else:
+        with memory.stage("export"), entry.timed("export"):
+            export_conversion_results(
+                result, output_formats, args.output_dir, stem, logger, manifest, write_stats
+            )
+        suffixes = [OUTPUT_SUFFIXES[fmt] for fmt in output_formats if fmt in OUTPUT_SUFFIXES]
+        entry.outputs.extend(str(args.output_dir / f"{stem}{suffix}") for suffix in suffixes)
+        for duplicate in duplicates:
+            for destination in link_outputs(args.output_dir, stem, duplicate.stem, suffixes):
+                logger.info("Linked duplicate output %s", destination)
+
+    page_count = len(result.pages) if result.pages else 0
+    status = result.status.value if hasattr(result.status, "value") else str(result.status)
+    entry.status = status
+    entry.pages = page_count
+    logger.info("Completed %s | status=%s | pages=%d", pdf_path, status, page_count)
+    return True
 
 
 def log_configuration(
@@ -633,6 +1101,34 @@ def log_configuration(
     logger.info("Input directory: %s", args.input_dir)
     logger.info("Output directory: %s", args.output_dir)
     logger.info("Requested output formats: %s", [fmt.value for fmt in output_formats])
+    logger.info("Duplicate detection: %s", args.dedupe)
+    if args.profile != "off":
+        logger.info(
+            "Profiling: %s (interval=%.1fms, slow threshold=%.1fs)",
+            args.profile,
+            args.profile_interval,
+            args.profile_slow_seconds,
+        )
+    if args.memory_profile != "off":
+        logger.info("Memory accounting: %s", args.memory_profile)
+    if args.stream_pages:
+        logger.info(
+            "Streaming DocTags per page (window=%d page(s)).",
+            args.page_window,
+        )
+    if args.progressive:
+        logger.info(
+            "Progressive conversion: first %d page(s), widening while missing %s",
+            args.progressive_pages,
+            args.required_fields,
+        )
+    if args.stream_jsonl:
+        logger.info(
+            "Streaming records to %s (doctags=%s, flush_every=%d); file outputs disabled.",
+            args.stream_jsonl,
+            args.stream_doctags,
+            args.flush_every,
+        )
     logger.info("PDF backend: %s", args.pdf_backend)
     logger.info("OCR engine: %s", args.ocr_engine)
     logger.info("Accelerator: %s", summarise_accelerator(pipeline_options.accelerator_options.device))
@@ -690,7 +1186,72 @@ def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
         "--log-path",
         type=Path,
         default=BASE_DIR / "convert.log",
-        help="Log file path; the file is truncated at the start of each run.",
+        help=(
+            "Log file path; the previous run's log is rotated to <log-path>.1 at start-up "
+            "and the file is rotated by size during the run."
+        ),
+    )
+    parser.add_argument(
+        "--progress",
+        choices=PROGRESS_MODES,
+        default="auto",
+        help=(
+            "Live progress bar with pages, rolling pages/s, slowest stage, failures and "
+            "ETA; console logging drops to warnings while it is shown. auto shows it "
+            "when stderr is a terminal (default: auto)."
+        ),
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help=(
+            "Serve Prometheus metrics (documents, pages, failures by class, stage latency "
+            "histograms, queue depth, worker utilization) on http://127.0.0.1:PORT/metrics."
+        ),
+    )
+    parser.add_argument(
+        "--metrics-textfile",
+        type=Path,
+        default=None,
+        help="Periodically rewrite the metrics to this .prom file for a node exporter.",
+    )
+    parser.add_argument(
+        "--metrics-interval",
+        type=float,
+        default=METRICS_INTERVAL,
+        help=f"Seconds between textfile rewrites (default: {METRICS_INTERVAL:g}).",
+    )
+    parser.add_argument(
+        "--log-level",
+        action="append",
+        default=None,
+        metavar="NAME=LEVEL",
+        help=(
+            "Per-logger level, repeatable, e.g. docling=INFO or root=DEBUG "
+            f"(default: {' '.join(LOG_LEVELS)})."
+        ),
+    )
+    parser.add_argument(
+        "--log-max-mb",
+        type=float,
+        default=LOG_MAX_MB,
+        help=f"Rotate the log file beyond this size in MiB (default: {LOG_MAX_MB}).",
+    )
+    parser.add_argument(
+        "--log-backups",
+        type=int,
+        default=LOG_BACKUPS,
+        help=f"Rotated log files to keep (default: {LOG_BACKUPS}).",
+    )
+    parser.add_argument(
+        "--config-log",
+        type=Path,
+        default=None,
+        help=(
+            "File receiving the configuration snapshot once per run "
+            "(default: <log-path stem>.config.log next to the log file)."
+        ),
     )
     parser.add_argument(
         "--list-options",
@@ -704,6 +1265,125 @@ def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
         default=[OutputFormat.DOCTAGS.value],
         help="One or more output formats using OutputFormat enum values.",
     )
+    parser.add_argument(
+        "--dedupe",
+        choices=DEDUPE_MODES,
+        default="exact",
+        help=(
+            "Convert each unique input once and link duplicates to its outputs: "
+            "exact (identical bytes), text (identical text layer too) or off."
+        ),
+    )
+    parser.add_argument(
+        "--stream-jsonl",
+        type=Path,
+        default=None,
+        help=(
+            "Streaming mode: extract ground-truth fields from each converted document "
+            "in memory and append records to this JSONL file instead of writing "
+            "per-document outputs."
+        ),
+    )
+    parser.add_argument(
+        "--stream-doctags",
+        action="store_true",
+        help="In streaming mode, include the DocTags string in every record.",
+    )
+    parser.add_argument(
+        "--flush-every",
+        type=int,
+        default=DEFAULT_FLUSH_EVERY,
+        help="In streaming mode, flush the JSONL sink after this many records.",
+    )
+    parser.add_argument(
+        "--stream-pages",
+        action="store_true",
+        help=(
+            "Append each page's DocTags to <stem>.doctags.txt (separated by "
+            "<page_break>) as soon as the page is converted. Requires "
+            "--output-formats doctags; cannot be combined with --stream-jsonl or "
+            "--progressive."
+        ),
+    )
+    parser.add_argument(
+        "--page-window",
+        type=int,
+        default=1,
+        help=(
+            "With --stream-pages, pages converted per pipeline call (default: 1). "
+            "Each call re-opens and re-parses the PDF, so larger windows amortise "
+            "that cost on big files at the price of more pages held in memory."
+        ),
+    )
+    parser.add_argument(
+        "--profile",
+        choices=PROFILE_MODES,
+        default="off",
+        help=(
+            "Per-document profiling: deterministic (cProfile .prof + summary), sampling "
+            "(collapsed stacks for flamegraphs) or slow (sampling, kept only for "
+            "documents slower than --profile-slow-seconds)."
+        ),
+    )
+    parser.add_argument(
+        "--profile-dir",
+        type=Path,
+        default=None,
+        help="Directory for profiles (default: <output-dir>/profiles).",
+    )
+    parser.add_argument(
+        "--profile-interval",
+        type=float,
+        default=5.0,
+        help="Sampling interval in milliseconds (default: 5).",
+    )
+    parser.add_argument(
+        "--profile-slow-seconds",
+        type=float,
+        default=DEFAULT_SLOW_SECONDS,
+        help="In slow mode, keep profiles of documents taking at least this long.",
+    )
+    parser.add_argument(
+        "--memory-profile",
+        choices=MEMORY_MODES,
+        default="off",
+        help=(
+            "Per-document and per-stage memory accounting: rss (process high-water "
+            "mark) or full (rss plus tracemalloc Python heap peaks, slower). Writes "
+            "memory_report.jsonl and memory_summary.json to --reports-dir."
+        ),
+    )
+    parser.add_argument(
+        "--reports-dir",
+        type=Path,
+        default=BASE_DIR / "output" / "reports",
+        help=(
+            "Directory for run artifacts such as memory reports, kept apart from the "
+            "exported documents (default: Main/output/reports)."
+        ),
+    )
+    parser.add_argument(
+        "--run-report",
+        type=Path,
+        default=None,
+        help=(
+            "JSONL run report with one line per document (input, content hash, config "
+            "hash, status, pages, timings, outputs, error class); appended across runs "
+            "(default: <output-dir>/run_report.jsonl)."
+        ),
+    )
+    parser.add_argument(
+        "--run-report-max-mb",
+        type=float,
+        default=DEFAULT_MAX_MB,
+        help=f"Rotate the run report beyond this size in MiB (default: {DEFAULT_MAX_MB}).",
+    )
+    parser.add_argument(
+        "--run-report-backups",
+        type=int,
+        default=DEFAULT_BACKUPS,
+        help=f"Rotated run reports to keep (default: {DEFAULT_BACKUPS}).",
+    )
     parser.add_argument(
         "--max-pages",
         type=int,
@@ -728,6 +1408,28 @@ def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
         default=None,
         help="Optional page range in the form start:end (1-indexed, inclusive).",
     )
+    parser.add_argument(
+        "--progressive",
+        action="store_true",
+        help=(
+            "Convert the first page(s) of the page range, run extraction and convert "
+            "the rest only when required fields are missing. Exported files then "
+            "cover only the converted pages."
+        ),
+    )
+    parser.add_argument(
+        "--progressive-pages",
+        type=int,
+        default=1,
+        help="Pages converted in the first progressive pass (default: 1).",
+    )
+    parser.add_argument(
+        "--required-fields",
+        nargs="+",
+        choices=GROUND_TRUTH_FIELDS,
+        default=list(GROUND_TRUTH_FIELDS),
+        help="Fields that must be found before progressive conversion stops.",
+    )
 
     parser.add_argument(
         "--document-timeout",
@@ -1038,7 +1740,36 @@ def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     )
     parser.add_argument("--pdf-password", default=None)
 
-    return parser.parse_args(argv)
+    args = parser.parse_args(argv)
+    validate_arguments(parser, args)
+    return args
+
+
+def validate_arguments(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    """Reject option combinations that would otherwise be silently ignored.
+
+    ``--stream-pages`` writes only DocTags, page by page, so it cannot honour
+    other output formats, ``--stream-jsonl`` or ``--progressive``.
+
+    Raises:
+        SystemExit: Through ``parser.error`` for an invalid combination.
+    """
+
+    if args.page_window < 1:
+        parser.error("--page-window must be at least 1.")
+    if args.progressive_pages < 1:
+        parser.error("--progressive-pages must be at least 1.")
+    if not args.stream_pages:
+        return
+    if args.stream_jsonl:
+        parser.error("--stream-pages cannot be combined with --stream-jsonl.")
+    if args.progressive:
+        parser.error("--stream-pages cannot be combined with --progressive.")
+    others = [value for value in args.output_formats if value != OutputFormat.DOCTAGS.value]
+    if others:
+        parser.error(
+            f"--stream-pages writes DocTags only; drop --output-formats {' '.join(others)}."
+        )
 
 
 def main(argv: Optional[Sequence[str]] = None) -> int:
@@ -1052,14 +1783,37 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     args.input_dir.mkdir(parents=True, exist_ok=True)
     args.output_dir.mkdir(parents=True, exist_ok=True)
 
-    logger = configure_logging(args.log_path)
+    logger = configure_logging(
+        args.log_path,
+        args.log_level or LOG_LEVELS,
+        args.log_max_mb,
+        args.log_backups,
+        progress=progress_enabled(args.progress),
+    )
+    try:
+        return run(args, logger)
+    finally:
+        stop_logging()
+
+
+def run(args: argparse.Namespace, logger: logging.Logger) -> int:
+    """Convert the input directory with logging already configured."""
+
     logger.info("Docling converter starting.")
 
     output_formats = resolve_output_formats(args.output_formats)
     pipeline_options = build_pipeline_options(args)
     backend_options = build_pdf_backend_options(args)
 
-    log_configuration(logger, args, pipeline_options, backend_options, output_formats)
+    config_path = args.config_log or args.log_path.with_name(
+        f"{args.log_path.stem}.config.log"
+    )
+    config_logger = snapshot_logger(config_path)
+    try:
+        log_configuration(config_logger, args, pipeline_options, backend_options, output_formats)
+    finally:
+        close_logger(config_logger)
+    logger.info("Configuration snapshot written to %s", config_path)
 
     failures = convert_documents(
         args=args,
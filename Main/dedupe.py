@@ -0,0 +1,223 @@
+"""Duplicate-invoice detection for ``convert.py`` input discovery.
+
+Suppliers often deliver the same PDF twice (e-mail and portal). Hashing
+inputs before conversion lets each unique content go through the Docling
+models once:
+
+* ``exact`` mode groups files by SHA-256 of their bytes.
+* ``text`` mode also groups files whose text layer is identical after
+  whitespace and case normalisation, catching re-rendered copies with a
+  different PDF producer. The text layer is read with ``pypdfium2`` (a
+  Docling dependency); files without a text layer, such as scans, only take
+  part in exact matching.
+
+Duplicates receive links to the outputs of the first file in their group (see
+``link_outputs``) instead of a conversion of their own.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import logging
+import os
+import re
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+DEDUPE_MODES = ("off", "exact", "text")
+HASH_WORKERS = 8
+
+_WHITESPACE = re.compile(r"\s+")
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class DuplicateGroup:
+    """Inputs sharing one conversion: ``canonical`` plus its duplicates."""
+
+    canonical: Path
+    duplicates: List[Path] = field(default_factory=list)
+    """Inputs with byte-identical content."""
+    near_duplicates: List[Path] = field(default_factory=list)
+    """Inputs whose text layer matched but whose bytes differ."""
+
+    @property
+    def members(self) -> List[Path]:
+        """Every duplicate, exact ones first."""
+
+        return self.duplicates + self.near_duplicates
+
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 hex digest of a file's bytes."""
+
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def text_fingerprint(path: Path) -> Optional[str]:
+    """Hash of the normalised PDF text layer, or ``None`` when there is none."""
+
+    import pypdfium2 as pdfium
+
+    digest = hashlib.sha256()
+    has_text = False
+    document = pdfium.PdfDocument(str(path))
+    try:
+        for page in document:
+            textpage = page.get_textpage()
+            text = _WHITESPACE.sub(" ", textpage.get_text_range()).strip().casefold()
+            textpage.close()
+            page.close()
+            if text:
+                has_text = True
+            digest.update(text.encode("utf-8"))
+            digest.update(b"\f")
+    finally:
+        document.close()
+    return digest.hexdigest() if has_text else None
+
+
+def _safe_text_fingerprint(path: Path) -> Optional[str]:
+    try:
+        return text_fingerprint(path)
+    except Exception as exc:  # noqa: BLE001 -- unreadable text layer: exact match only
+        LOGGER.debug("No text fingerprint for %s: %s", path, exc)
+        return None
+
+
+def group_duplicates(paths: Sequence[Path], mode: str = "exact") -> List[DuplicateGroup]:
+    """Group inputs by identical content.
+
+    Args:
+        paths: Input PDFs in processing order; the first file of each group
+            becomes its canonical member.
+        mode: One of ``DEDUPE_MODES``.
+
+    Returns:
+        One group per unique content, in the order of the canonical files.
+    """
+
+    if mode == "off":
+        return [DuplicateGroup(path) for path in paths]
+
+    with ThreadPoolExecutor(max_workers=HASH_WORKERS) as pool:
+        digests = list(pool.map(file_sha256, paths))
+        texts: List[Optional[str]] = (
+            list(pool.map(_safe_text_fingerprint, paths)) if mode == "text" else [None] * len(paths)
+        )
+
+    groups: List[DuplicateGroup] = []
+    by_digest: Dict[str, DuplicateGroup] = {}
+    by_text: Dict[str, DuplicateGroup] = {}
+    for path, digest, text in zip(paths, digests, texts):
+        group = by_digest.get(digest)
+        if group is not None:
+            group.duplicates.append(path)
+        elif text is not None and text in by_text:
+            group = by_text[text]
+            group.near_duplicates.append(path)
+        else:
+            group = DuplicateGroup(path)
+            groups.append(group)
+        by_digest.setdefault(digest, group)
+        if text is not None:
+            by_text.setdefault(text, group)
+    return groups
+
+
+def link_file(source: Path, destination: Path) -> None:
+    """Point ``destination`` at ``source``: hard link, else symlink, else copy."""
+
+    if destination.exists() or destination.is_symlink():
+        if destination.samefile(source):
+            return
+        destination.unlink()
+    try:
+        os.link(source, destination)
+    except OSError:
+        try:
+            destination.symlink_to(source.resolve())
+        except OSError:
+            shutil.copy2(source, destination)
+
+
+def link_outputs(
+    output_dir: Path, canonical_stem: str, duplicate_stem: str, suffixes: Iterable[str]
+) -> List[Path]:
+    """Link a duplicate's outputs to those of its canonical input.
+
+    Returns:
+        The linked destination paths.
+    """
+
+    linked: List[Path] = []
+    for suffix in suffixes:
+        source = output_dir / f"{canonical_stem}{suffix}"
+        if not source.exists():
+            continue
+        destination = output_dir / f"{duplicate_stem}{suffix}"
+        if destination == source:
+            continue
+        link_file(source, destination)
+        linked.append(destination)
+    return linked
+
+
+def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse CLI arguments for a duplicate scan."""
+
+    parser = argparse.ArgumentParser(description="Report duplicate PDFs in an input directory.")
+    parser.add_argument(
+        "input_dir",
+        type=Path,
+        nargs="?",
+        default=Path(__file__).resolve().parent / "input",
+        help="Directory containing source PDFs (default: Main/input).",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=DEDUPE_MODES[1:],
+        default="exact",
+        help="exact: identical bytes; text: identical text layer as well.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Application entry point."""
+
+    args = parse_arguments(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(message)s")
+    paths = sorted(
+        path
+        for path in args.input_dir.rglob("*")
+        if path.is_file() and path.suffix.lower() == ".pdf"
+    )
+    groups = group_duplicates(paths, args.mode)
+    for group in groups:
+        for duplicate in group.duplicates:
+            LOGGER.info("%s duplicates %s (exact)", duplicate, group.canonical)
+        for duplicate in group.near_duplicates:
+            LOGGER.info("%s duplicates %s (text layer)", duplicate, group.canonical)
+    LOGGER.info(
+        "%d input(s), %d unique, %d exact duplicate(s), %d near-duplicate(s)",
+        len(paths),
+        len(groups),
+        sum(len(group.duplicates) for group in groups),
+        sum(len(group.near_duplicates) for group in groups),
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
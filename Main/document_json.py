@@ -0,0 +1,316 @@
+"""Fast loader for DoclingDocument JSON written by ``convert.py``.
+
+``DoclingDocument.load_from_json`` validates every text, table cell and
+provenance entry through pydantic before the first field can be read, which
+dominates bulk reprocessing of stored ``*.json`` outputs. This loader instead:
+
+* parses with ``orjson`` or ``msgspec`` when installed, falling back to the
+  standard library ``json`` module;
+* wraps the raw payload in ``LazyDocument``, whose ``texts``, ``tables``,
+  ``pictures`` and ``groups`` views only wrap an item when it is accessed and
+  whose ``resolve`` follows ``#/texts/N``-style ``$ref`` pointers; and
+* offers the same ``iterate_items`` / ``pages[n].size`` / ``prov[0].bbox``
+  surface that :func:`extract.parse_document` relies on, so extraction runs on
+  the raw dicts directly.
+
+Pass ``validate=True`` to :func:`load_document` to get a fully validated
+``DoclingDocument`` instead (required for the Docling exporters).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+try:  # Optional fast JSON parsers, fastest first.
+    import orjson
+
+    _loads: Callable[[bytes], Any] = orjson.loads
+    JSON_BACKEND = "orjson"
+except ImportError:  # pragma: no cover - depends on the environment
+    try:
+        import msgspec
+
+        _loads = msgspec.json.decode
+        JSON_BACKEND = "msgspec"
+    except ImportError:
+        _loads = json.loads
+        JSON_BACKEND = "json"
+
+LOGGER = logging.getLogger(__name__)
+
+
+def is_docling_json(path: Path) -> bool:
+    """Whether ``path`` holds a serialised ``DoclingDocument``.
+
+    Only the first 512 bytes are read, so run artifacts such as
+    ``memory_summary.json`` next to the outputs are skipped cheaply.
+    """
+
+    with path.open("rb") as handle:
+        head = handle.read(512)
+    return b'"schema_name"' in head and b"DoclingDocument" in head
+
+
+def docling_json_paths(directory: Path) -> List[Path]:
+    """Stored DoclingDocument JSON files under ``directory``, sorted."""
+
+    return [path for path in sorted(directory.rglob("*.json")) if is_docling_json(path)]
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON with the fastest available backend."""
+
+    if isinstance(data, str) and JSON_BACKEND == "msgspec":
+        data = data.encode("utf-8")
+    return _loads(data)
+
+
+class BoxView:
+    """Read-only bounding box with the ``docling_core`` coordinate helpers used here."""
+
+    __slots__ = ("l", "t", "r", "b", "coord_origin")
+
+    def __init__(self, raw: Dict[str, Any]) -> None:
+        self.l = raw["l"]
+        self.t = raw["t"]
+        self.r = raw["r"]
+        self.b = raw["b"]
+        self.coord_origin = raw.get("coord_origin", "TOPLEFT")
+
+    def to_top_left_origin(self, page_height: float) -> "BoxView":
+        """Return the box with a top-left origin (Docling's ``BoundingBox`` semantics)."""
+
+        if self.coord_origin != "BOTTOMLEFT":
+            return self
+        return BoxView(
+            {
+                "l": self.l,
+                "t": page_height - self.t,
+                "r": self.r,
+                "b": page_height - self.b,
+                "coord_origin": "TOPLEFT",
+            }
+        )
+
+
+class NodeView:
+    """Attribute access over one raw JSON object, wrapping children on demand."""
+
+    __slots__ = ("_raw",)
+
+    def __init__(self, raw: Dict[str, Any]) -> None:
+        self._raw = raw
+
+    @property
+    def raw(self) -> Dict[str, Any]:
+        """The underlying parsed JSON object."""
+
+        return self._raw
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            value = self._raw[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        return _wrap(name, value)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Like ``dict.get`` but returning wrapped values."""
+
+        return _wrap(name, self._raw[name]) if name in self._raw else default
+
+    def __repr__(self) -> str:
+        return f"NodeView({self._raw.get('self_ref', '?')})"
+
+
+def _wrap(name: str, value: Any) -> Any:
+    if isinstance(value, dict):
+        return BoxView(value) if name == "bbox" else NodeView(value)
+    if isinstance(value, list) and value and isinstance(value[0], dict):
+        return ListView(value)
+    return value
+
+
+class ListView(Sequence[Any]):
+    """Sequence over raw JSON objects that wraps each element when accessed."""
+
+    __slots__ = ("_raw",)
+
+    def __init__(self, raw: List[Any]) -> None:
+        self._raw = raw
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __getitem__(self, index: Any) -> Any:  # type: ignore[override]
+        if isinstance(index, slice):
+            return [_wrap("", item) for item in self._raw[index]]
+        return _wrap("", self._raw[index])
+
+    def __iter__(self) -> Iterator[Any]:
+        return (_wrap("", item) for item in self._raw)
+
+
+class PagesView:
+    """``pages`` mapping that accepts integer page numbers like ``DoclingDocument``."""
+
+    __slots__ = ("_raw",)
+
+    def __init__(self, raw: Dict[str, Any]) -> None:
+        self._raw = raw
+
+    def __getitem__(self, page_no: int) -> NodeView:
+        return NodeView(self._raw[str(page_no)])
+
+    def __contains__(self, page_no: object) -> bool:
+        return str(page_no) in self._raw
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def keys(self) -> List[int]:
+        return sorted(int(key) for key in self._raw)
+
+
+class LazyDocument:
+    """Lazy, validation-free view over a DoclingDocument JSON payload."""
+
+    COLLECTIONS = ("texts", "tables", "pictures", "groups", "key_value_items", "form_items")
+
+    def __init__(self, payload: Dict[str, Any]) -> None:
+        self.payload = payload
+        self.name = payload.get("name", "")
+        self.pages = PagesView(payload.get("pages", {}))
+
+    def __getattr__(self, name: str) -> Any:
+        if name in self.COLLECTIONS:
+            return ListView(self.payload.get(name, []))
+        if name in ("body", "furniture", "origin"):
+            return NodeView(self.payload.get(name) or {})
+        raise AttributeError(name)
+
+    def resolve(self, ref: str) -> Dict[str, Any]:
+        """Return the raw object a ``$ref`` such as ``#/texts/3`` points to."""
+
+        parts = ref.lstrip("#/").split("/")
+        node: Any = self.payload
+        for part in parts:
+            node = node[int(part)] if isinstance(node, list) else node[part]
+        return node
+
+    def iterate_items(
+        self,
+        root: Optional[Dict[str, Any]] = None,
+        with_groups: bool = False,
+        traverse_pictures: bool = False,
+        page_no: Optional[int] = None,
+        _level: int = 0,
+    ) -> Iterator[Tuple[NodeView, int]]:
+        """Walk the ``body`` tree in reading order like ``DoclingDocument.iterate_items``.
+
+        Only body-layer items are yielded; groups are traversed but only
+        yielded with ``with_groups``; picture children are skipped unless
+        ``traverse_pictures`` is set.
+        """
+
+        node = root if root is not None else self.payload["body"]
+        ref = node.get("self_ref", "")
+        is_group = ref == "#/body" or ref.startswith("#/groups/")
+        if node.get("content_layer", "body") == "body":
+            on_page = page_no is None or any(
+                prov.get("page_no") == page_no for prov in node.get("prov", [])
+            )
+            if on_page and (with_groups or not is_group):
+                yield NodeView(node), _level
+            _level += 1
+        if ref.startswith("#/pictures/") and not traverse_pictures:
+            return
+        for child in node.get("children", []):
+            yield from self.iterate_items(
+                self.resolve(child["$ref"]), with_groups, traverse_pictures, page_no, _level
+            )
+
+    def validate(self) -> Any:
+        """Build the fully validated ``DoclingDocument`` for this payload."""
+
+        from docling_core.types.doc import DoclingDocument
+
+        return DoclingDocument.model_validate(self.payload)
+
+
+def load_document(path: Path, validate: bool = False) -> Any:
+    """Load a stored DoclingDocument JSON file.
+
+    Args:
+        path: ``*.json`` written by ``convert.py``.
+        validate: Return a fully validated ``DoclingDocument`` instead of a
+            ``LazyDocument``.
+
+    Returns:
+        ``LazyDocument`` by default, otherwise ``DoclingDocument``.
+    """
+
+    document = LazyDocument(loads(path.read_bytes()))
+    return document.validate() if validate else document
+
+
+def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse CLI arguments for the loader benchmark."""
+
+    parser = argparse.ArgumentParser(
+        description=(
+            "Load stored DoclingDocument JSON files lazily (or validated) and report "
+            "load and extraction throughput."
+        )
+    )
+    parser.add_argument("inputs", nargs="+", type=Path, help="JSON files or directories.")
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="Build full pydantic DoclingDocument models instead of lazy views.",
+    )
+    parser.add_argument(
+        "--extract",
+        action="store_true",
+        help="Also run field extraction on every loaded document.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Application entry point."""
+
+    args = parse_arguments(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(message)s")
+    from extract import extract_document
+
+    paths: List[Path] = []
+    for entry in args.inputs:
+        paths.extend(docling_json_paths(entry) if entry.is_dir() else [entry])
+
+    started = time.perf_counter()
+    for path in paths:
+        document = load_document(path, validate=args.validate)
+        if args.extract:
+            record = extract_document(document, f"{path.stem}.pdf").to_record()
+            LOGGER.debug("%s", record)
+    elapsed = time.perf_counter() - started
+    LOGGER.info(
+        "Loaded %d document(s) with %s (%s) in %.3fs | %.1f docs/s",
+        len(paths),
+        JSON_BACKEND,
+        "validated" if args.validate else "lazy",
+        elapsed,
+        len(paths) / elapsed if elapsed else 0.0,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
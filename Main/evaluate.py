@@ -0,0 +1,564 @@
+"""Accuracy and latency evaluation against ``ground_truth_template.json``.
+
+Speed work on ``convert.py`` is only safe when its effect on extraction
+quality is measured at the same time. ``evaluate`` runs conversion plus
+:func:`extract.extract_document` over every labelled PDF in parallel worker
+processes (each holding one warm converter) and reports:
+
+* per-field exact-match accuracy and normalised-match accuracy (case,
+  whitespace, legal forms and OCR digit swaps folded via :mod:`suppliers`);
+* per-document latency percentiles and pages/docs per second for the run.
+
+Any flag that ``evaluate`` does not know is forwarded to
+``convert.parse_arguments``, so the same knobs can be compared, e.g.
+``python evaluate.py --table-mode fast --ocr-engine rapidocr``. With
+``--stored`` the conversion is skipped and stored DocTags/JSON outputs are
+scored instead (extraction latency only).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import multiprocessing
+import platform
+import re
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from extract import GROUND_TRUTH_FIELDS
+from metrics import DEFAULT_INTERVAL as METRICS_INTERVAL
+from metrics import ConversionMetrics, MetricsExporter
+from progress import PROGRESS_MODES, BatchProgress, progress_enabled
+from suppliers import normalise_coc, normalise_name, normalise_vat
+
+BASE_DIR = Path(__file__).resolve().parent
+DEFAULT_GROUND_TRUTH = BASE_DIR / "output" / "ground_truth_template.json"
+DEFAULT_INPUT_DIR = BASE_DIR / "input"
+LATENCY_PERCENTILES = (50, 90, 95, 99)
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _normalise_invoice_number(value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    return re.sub(r"[\s.\-/]", "", str(value)).upper() or None
+
+
+FIELD_NORMALISERS: Dict[str, Callable[[Optional[str]], Optional[str]]] = {
+    "supplier_name": lambda value: normalise_name(value) if value else None,
+    "supplier_coc_number": normalise_coc,
+    "supplier_tax_number": normalise_vat,
+    "invoice_number": _normalise_invoice_number,
+}
+"""Per-field normalisation applied before the lenient comparison."""
+
+
+@dataclass
+class DocumentOutcome:
+    """Prediction and timing for one labelled document."""
+
+    filename: str
+    record: Optional[Dict[str, Optional[str]]]
+    latency: float
+    pages: int
+    error: Optional[str] = None
+    peak_rss_mb: float = 0.0
+    """Worker process resident-set high-water mark after this document."""
+    stage_times: Dict[str, float] = field(default_factory=dict)
+    """Seconds per pipeline stage (Docling profiling keys plus ``extract``)."""
+
+
+@dataclass
+class FieldScore:
+    """Exact and normalised hits for one field."""
+
+    total: int = 0
+    exact: int = 0
+    normalised: int = 0
+
+    @property
+    def exact_accuracy(self) -> float:
+        """Share of labelled values matched exactly."""
+
+        return self.exact / self.total if self.total else 0.0
+
+    @property
+    def normalised_accuracy(self) -> float:
+        """Share of labelled values matched after normalisation."""
+
+        return self.normalised / self.total if self.total else 0.0
+
+
+@dataclass
+class EvaluationReport:
+    """Aggregate accuracy and throughput for one evaluation run."""
+
+    documents: int = 0
+    failures: int = 0
+    pages: int = 0
+    wall_time: float = 0.0
+    peak_rss_mb: float = 0.0
+    fields: Dict[str, FieldScore] = field(
+        default_factory=lambda: {name: FieldScore() for name in GROUND_TRUTH_FIELDS}
+    )
+    latencies: List[float] = field(default_factory=list)
+    stage_times: Dict[str, List[float]] = field(default_factory=dict)
+    """Per-document seconds for every stage that reported a timing."""
+    mismatches: List[Dict[str, Optional[str]]] = field(default_factory=list)
+    """Values that differ even after normalisation."""
+
+    def latency_percentiles(self) -> Dict[str, float]:
+        """Per-document latency percentiles in seconds."""
+
+        if not self.latencies:
+            return {}
+        values = np.percentile(self.latencies, LATENCY_PERCENTILES)
+        summary = {f"p{pct}": float(value) for pct, value in zip(LATENCY_PERCENTILES, values)}
+        summary["max"] = float(max(self.latencies))
+        return summary
+
+    @property
+    def pages_per_second(self) -> float:
+        """Converted pages per second of wall time."""
+
+        return self.pages / self.wall_time if self.wall_time else 0.0
+
+    @property
+    def docs_per_second(self) -> float:
+        """Documents per second of wall time."""
+
+        return self.documents / self.wall_time if self.wall_time else 0.0
+
+    def overall_accuracy(self, normalised: bool = False) -> float:
+        """Accuracy over every labelled field of every document."""
+
+        total = sum(score.total for score in self.fields.values())
+        hits = sum(
+            score.normalised if normalised else score.exact for score in self.fields.values()
+        )
+        return hits / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable summary."""
+
+        return {
+            "documents": self.documents,
+            "failures": self.failures,
+            "pages": self.pages,
+            "wall_time": self.wall_time,
+            "pages_per_second": self.pages_per_second,
+            "docs_per_second": self.docs_per_second,
+            "peak_rss_mb": self.peak_rss_mb,
+            "latency": self.latency_percentiles(),
+            "stages": {name: float(sum(values)) for name, values in self.stage_times.items()},
+            "accuracy": {
+                "exact": self.overall_accuracy(),
+                "normalised": self.overall_accuracy(normalised=True),
+            },
+            "fields": {
+                name: {
+                    **asdict(score),
+                    "exact_accuracy": score.exact_accuracy,
+                    "normalised_accuracy": score.normalised_accuracy,
+                }
+                for name, score in self.fields.items()
+            },
+            "mismatches": self.mismatches,
+        }
+
+
+def load_ground_truth(path: Path) -> Dict[str, Dict[str, Optional[str]]]:
+    """Load labelled records keyed by filename."""
+
+    records = json.loads(path.read_text(encoding="utf-8"))
+    return {record["filename"]: record for record in records}
+
+
+def score_outcomes(
+    outcomes: Sequence[DocumentOutcome],
+    truth: Dict[str, Dict[str, Optional[str]]],
+    wall_time: float,
+) -> EvaluationReport:
+    """Compare predictions with labels and aggregate timings.
+
+    Failed documents count as misses for every labelled field.
+    """
+
+    report = EvaluationReport(documents=len(outcomes), wall_time=wall_time)
+    for outcome in outcomes:
+        report.latencies.append(outcome.latency)
+        report.pages += outcome.pages
+        report.peak_rss_mb = max(report.peak_rss_mb, outcome.peak_rss_mb)
+        for stage, seconds in outcome.stage_times.items():
+            report.stage_times.setdefault(stage, []).append(seconds)
+        if outcome.error is not None:
+            report.failures += 1
+        predicted = outcome.record or {}
+        expected = truth[outcome.filename]
+        for name in GROUND_TRUTH_FIELDS:
+            wanted = expected.get(name)
+            if wanted is None:
+                continue
+            got = predicted.get(name)
+            score = report.fields[name]
+            score.total += 1
+            if got == wanted:
+                score.exact += 1
+            normalise = FIELD_NORMALISERS[name]
+            if got is not None and normalise(got) == normalise(wanted):
+                score.normalised += 1
+            elif got != wanted:
+                report.mismatches.append(
+                    {"filename": outcome.filename, "field": name, "expected": wanted, "got": got}
+                )
+    return report
+
+
+def peak_rss_mb() -> float:
+    """Resident-set high-water mark of the current process in MiB."""
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in KiB on Linux.
+    return peak / (1 << 20) if platform.system() == "Darwin" else peak / 1024
+
+
+_WORKER: Dict[str, Any] = {}
+
+
+def _init_converter(convert_argv: Sequence[str], ready: Any) -> None:
+    import convert
+    from docling.datamodel.base_models import InputFormat
+    from docling.datamodel.settings import settings
+
+    settings.debug.profile_pipeline_timings = True
+
+    args = convert.parse_arguments(list(convert_argv))
+    _WORKER["args"] = args
+    _WORKER["ready"] = ready
+    converter = convert.build_converter(
+        convert.build_pipeline_options(args),
+        convert.build_pdf_backend_options(args),
+        args.pdf_backend,
+    )
+    converter.initialize_pipeline(InputFormat.PDF)
+    _WORKER["converter"] = converter
+
+
+def _warm_up() -> None:
+    """Worker: block until every worker has run its initializer.
+
+    One of these tasks is submitted per worker before the clock starts. Each
+    holds its worker until all of them reach the barrier, so every process
+    has loaded its models before the first timed document.
+    """
+
+    _WORKER["ready"].wait()
+
+
+def convert_and_extract(path: str) -> DocumentOutcome:
+    """Worker: convert one PDF on the warm converter and extract its fields."""
+
+    import convert
+    from extract import extract_document
+
+    source = Path(path)
+    filename = f"{source.stem}.pdf"
+    args = _WORKER["args"]
+    converter = _WORKER["converter"]
+    page_range = (
+        convert.parse_page_range(args.page_range) if args.page_range else convert.DEFAULT_PAGE_RANGE
+    )
+    max_num_pages = args.max_pages if args.max_pages is not None else sys.maxsize
+    max_file_size = args.max_file_size if args.max_file_size is not None else sys.maxsize
+
+    stage_times: Dict[str, float] = {}
+    started = time.perf_counter()
+    try:
+        if args.progressive:
+            result, extraction = convert.convert_progressive(
+                converter, source, args, page_range, max_num_pages, max_file_size, LOGGER
+            )
+        else:
+            result = converter.convert(
+                source=source,
+                raises_on_error=args.raises_on_error,
+                max_num_pages=max_num_pages,
+                max_file_size=max_file_size,
+                page_range=page_range,
+            )
+            extract_started = time.perf_counter()
+            extraction = extract_document(result.document, filename)
+            stage_times["extract"] = time.perf_counter() - extract_started
+    except Exception as exc:  # noqa: BLE001 -- score the document as a miss
+        return DocumentOutcome(
+            filename, None, time.perf_counter() - started, 0, f"{type(exc).__name__}: {exc}"
+        )
+    latency = time.perf_counter() - started
+    pages = len(result.pages) if result.pages else 0
+    for stage, item in (getattr(result, "timings", None) or {}).items():
+        stage_times[stage] = float(sum(item.times))
+    return DocumentOutcome(
+        filename, extraction.to_record(), latency, pages, None, peak_rss_mb(), stage_times
+    )
+
+
+def extract_stored(path: str) -> DocumentOutcome:
+    """Worker: extract fields from a stored DocTags or JSON output."""
+
+    from document_json import load_document
+    from extract import PAGE_BREAK, extract_document, extract_fields
+    from reextract import record_filename
+
+    source = Path(path)
+    filename = record_filename(source)
+    started = time.perf_counter()
+    try:
+        if source.name.endswith(".json"):
+            document = load_document(source)
+            pages = len(document.pages)
+            result = extract_document(document, filename)
+        else:
+            doctags = source.read_text(encoding="utf-8")
+            pages = doctags.count(PAGE_BREAK) + 1
+            result = extract_fields(doctags, filename)
+    except Exception as exc:  # noqa: BLE001 -- score the document as a miss
+        return DocumentOutcome(
+            filename, None, time.perf_counter() - started, 0, f"{type(exc).__name__}: {exc}"
+        )
+    latency = time.perf_counter() - started
+    return DocumentOutcome(
+        filename, result.to_record(), latency, pages, None, peak_rss_mb(), {"extract": latency}
+    )
+
+
+def labelled_inputs(
+    truth: Dict[str, Dict[str, Optional[str]]], input_dir: Path, stored: bool
+) -> List[Path]:
+    """Locate the PDF (or stored output) for every labelled filename."""
+
+    if stored:
+        from reextract import collect_inputs, record_filename
+
+        available = {record_filename(path): path for path in collect_inputs([input_dir])}
+    else:
+        available = {
+            f"{path.stem}.pdf": path
+            for path in input_dir.rglob("*")
+            if path.is_file() and path.suffix.lower() == ".pdf"
+        }
+    paths: List[Path] = []
+    for filename in truth:
+        if filename in available:
+            paths.append(available[filename])
+        else:
+            LOGGER.warning("No input found for labelled document %s", filename)
+    return paths
+
+
+def evaluate(
+    paths: Sequence[Path],
+    truth: Dict[str, Dict[str, Optional[str]]],
+    workers: int,
+    convert_argv: Sequence[str] = (),
+    stored: bool = False,
+    show_progress: bool = False,
+    metrics: Optional[ConversionMetrics] = None,
+) -> EvaluationReport:
+    """Run conversion (or stored extraction) in parallel and score the results.
+
+    Conversion workers load their pipeline in the pool initializer and are
+    all warmed up before the clock starts, so the reported throughput and
+    latencies exclude model loading.
+
+    With ``show_progress`` a live bar tracks finished documents, pages/s,
+    the slowest stage and failures as workers report back; ``metrics``
+    receives the same per-document updates for export.
+    """
+
+    if stored:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        worker = extract_stored
+    else:
+        ready = multiprocessing.Barrier(workers)
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_converter,
+            initargs=(list(convert_argv), ready),
+        )
+        worker = convert_and_extract
+    with pool:
+        if not stored:
+            for future in [pool.submit(_warm_up) for _ in range(workers)]:
+                future.result()
+        started = time.perf_counter()
+        if metrics is not None:
+            metrics.batch_started(len(paths))
+        finished: Dict[int, DocumentOutcome] = {}
+        with BatchProgress(len(paths), enabled=show_progress, desc="evaluate") as progress:
+            futures = {pool.submit(worker, str(path)): index for index, path in enumerate(paths)}
+            for future in as_completed(futures):
+                outcome = finished[futures[future]] = future.result()
+                progress.update(
+                    pages=outcome.pages,
+                    stage_times=outcome.stage_times,
+                    failed=outcome.error is not None,
+                )
+                if metrics is not None:
+                    metrics.document_finished(
+                        pages=outcome.pages,
+                        status="success" if outcome.error is None else "failure",
+                        error_class=outcome.error.split(":", 1)[0] if outcome.error else None,
+                        stage_times=outcome.stage_times,
+                        busy_seconds=outcome.latency,
+                    )
+    outcomes = [finished[index] for index in range(len(paths))]
+    for outcome in outcomes:
+        if outcome.error is not None:
+            LOGGER.error("Evaluation failed for %s: %s", outcome.filename, outcome.error)
+    return score_outcomes(outcomes, truth, time.perf_counter() - started)
+
+
+def format_report(report: EvaluationReport) -> List[str]:
+    """Human-readable report lines."""
+
+    lines = [f"{'field':<22}{'n':>4}{'exact':>9}{'normalised':>12}"]
+    for name, score in report.fields.items():
+        lines.append(
+            f"{name:<22}{score.total:>4}{score.exact_accuracy:>9.1%}"
+            f"{score.normalised_accuracy:>12.1%}"
+        )
+    lines.append(
+        f"{'overall':<22}{'':>4}{report.overall_accuracy():>9.1%}"
+        f"{report.overall_accuracy(normalised=True):>12.1%}"
+    )
+    latency = report.latency_percentiles()
+    lines.append(
+        "latency (s): " + ", ".join(f"{key}={value:.3f}" for key, value in latency.items())
+    )
+    lines.append(
+        f"documents={report.documents} failures={report.failures} pages={report.pages} "
+        f"wall={report.wall_time:.2f}s | {report.pages_per_second:.2f} pages/s, "
+        f"{report.docs_per_second:.2f} docs/s | peak worker RSS {report.peak_rss_mb:.0f} MiB"
+    )
+    for mismatch in report.mismatches:
+        lines.append(
+            f"  miss {mismatch['filename']} {mismatch['field']}: "
+            f"expected {mismatch['expected']!r}, got {mismatch['got']!r}"
+        )
+    return lines
+
+
+def parse_arguments(
+    argv: Optional[Sequence[str]] = None,
+) -> Tuple[argparse.Namespace, List[str]]:
+    """Parse evaluation flags; unknown flags are returned for ``convert.py``."""
+
+    parser = argparse.ArgumentParser(
+        description=(
+            "Score conversion + extraction against the ground-truth template: "
+            "per-field accuracy, latency percentiles and pages/s. Unrecognised "
+            "flags are passed to convert.py's option parser."
+        )
+    )
+    parser.add_argument(
+        "--ground-truth",
+        type=Path,
+        default=DEFAULT_GROUND_TRUTH,
+        help="Labelled records (default: Main/output/ground_truth_template.json).",
+    )
+    parser.add_argument(
+        "--input-dir",
+        type=Path,
+        default=DEFAULT_INPUT_DIR,
+        help="Directory with the labelled PDFs, or stored outputs with --stored.",
+    )
+    parser.add_argument(
+        "--stored",
+        action="store_true",
+        help="Score stored DocTags/JSON outputs in --input-dir instead of converting.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=2,
+        help="Worker processes, each with its own warm converter (default: 2).",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Also write the report as JSON to this path.",
+    )
+    parser.add_argument(
+        "--progress",
+        choices=PROGRESS_MODES,
+        default="auto",
+        help="Live progress bar across workers; auto shows it on a terminal (default: auto).",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Serve Prometheus metrics on http://127.0.0.1:PORT/metrics during the run.",
+    )
+    parser.add_argument(
+        "--metrics-textfile",
+        type=Path,
+        default=None,
+        help="Periodically rewrite the metrics to this .prom file for a node exporter.",
+    )
+    parser.add_argument(
+        "--metrics-interval",
+        type=float,
+        default=METRICS_INTERVAL,
+        help=f"Seconds between textfile rewrites (default: {METRICS_INTERVAL:g}).",
+    )
+    return parser.parse_known_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Application entry point."""
+
+    args, convert_argv = parse_arguments(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(message)s")
+    truth = load_ground_truth(args.ground_truth)
+    paths = labelled_inputs(truth, args.input_dir, args.stored)
+    if not paths:
+        LOGGER.warning("No labelled inputs found in %s.", args.input_dir)
+        return 1
+
+    metrics = ConversionMetrics(args.workers)
+    with MetricsExporter(
+        metrics, args.metrics_port, args.metrics_textfile, args.metrics_interval
+    ) as exporter:
+        if exporter.address is not None:
+            LOGGER.info("Serving metrics on http://%s:%d/metrics", *exporter.address)
+        report = evaluate(
+            paths,
+            truth,
+            args.workers,
+            convert_argv,
+            args.stored,
+            show_progress=progress_enabled(args.progress),
+            metrics=metrics,
+        )
+    for line in format_report(report):
+        LOGGER.info("%s", line)
+    if args.output:
+        args.output.write_text(json.dumps(report.to_dict(), indent=2), encoding="utf-8")
+        LOGGER.info("Wrote report to %s", args.output)
+    return 1 if report.failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
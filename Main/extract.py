@@ -0,0 +1,993 @@
+"""Rule-based invoice field extraction from DocTags.
+
+This module turns the DocTags emitted by ``convert.py`` into the records kept in
+``Main/output/ground_truth_template.json`` without calling an LLM. It follows
+the key/value strategy spelled out in ``Main/Prompt-scrapbook.txt``: find the
+key labels (``KvK``, ``BTW nr.``, ``Factuurnummer`` ...), collect the values
+that sit to the right of or below those keys on the 500x500 ``<loc_*>`` grid,
+and pair them up.
+
+Pairing is solved globally rather than greedily. For every document a cost
+matrix of ``fields x candidate values`` is built from:
+
+* spatial distance between key and value boxes,
+* row/column alignment (same ``y1`` to the right, same ``x1`` below), and
+* validator scores (KvK length, VAT checksum, invoice-number shape).
+
+``scipy.optimize.linear_sum_assignment`` then picks the conflict-free pairing
+with minimal total cost in one call, so two keys can never claim the same value
+(as happens with EF1's merged ``"24500464 Date 22-01-2024 Customer VAT Invoice
+number"`` line). ``extract_batch`` runs the same solve over many documents.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import re
+import sys
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+LOC_GRID = 500
+"""DocTags coordinates span a 500x500 grid per page."""
+
+GROUND_TRUTH_FIELDS: Tuple[str, ...] = (
+    "supplier_name",
+    "supplier_coc_number",
+    "supplier_tax_number",
+    "invoice_number",
+)
+"""Record keys used by ``Main/output/ground_truth_template.json``."""
+
+ROW_TOLERANCE = 3
+COLUMN_TOLERANCE = 4
+ACCEPT_THRESHOLD = 0.9
+NO_KEY_COST = 0.95
+INFEASIBLE_COST = 1e6
+
+ELEMENT_PATTERN = re.compile(
+    r"<(?P<tag>[a-z_0-9]+)>"
+    r"<loc_(?P<x1>\d+)><loc_(?P<y1>\d+)><loc_(?P<x2>\d+)><loc_(?P<y2>\d+)>"
+    r"(?P<body>.*?)</(?P=tag)>",
+    re.DOTALL,
+)
+"""Top-level DocTags element with its four ``<loc_*>`` tags."""
+
+_INNER_TAG_PATTERN = re.compile(r"<[^>]+>")
+_OTSL_TOKEN_PATTERN = re.compile(r"<(fcel|ecel|lcel|ucel|xcel|ched|rhed|srow|nl)>")
+PAGE_BREAK = "<page_break>"
+
+OTSL_CONTENT_TOKENS = frozenset({"fcel", "ched", "rhed", "srow"})
+"""OTSL cell tokens that may carry text."""
+
+
+@dataclass(frozen=True)
+class BoundingBox:
+    """Box on the DocTags ``<loc_*>`` grid (top-left origin)."""
+
+    x1: int
+    y1: int
+    x2: int
+    y2: int
+
+
+@dataclass(frozen=True)
+class TextElement:
+    """Text-bearing DocTags element, including individual OTSL cells.
+
+    Attributes:
+        tag: DocTags tag (``text``, ``section_header_level_1``...) or the OTSL
+            cell token (``fcel``, ``ched``...) for table cells.
+        text: Plain text with inner tags removed.
+        bbox: Element box; table cells get an estimate derived from the grid.
+        page_no: 1-based page number.
+        index: Position within the parsed element list.
+    """
+
+    tag: str
+    text: str
+    bbox: BoundingBox
+    page_no: int
+    index: int
+
+
+@dataclass(frozen=True)
+class OtslCell:
+    """Single decoded OTSL cell."""
+
+    token: str
+    text: str
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """Key labels, value shape and validator for one paired field."""
+
+    name: str
+    key_pattern: re.Pattern[str]
+    value_pattern: re.Pattern[str]
+    validator: Callable[[str], float]
+
+
+@dataclass(frozen=True)
+class _Span:
+    element: int
+    start: int
+    end: int
+    text: str
+
+
+@dataclass
+class FieldMatch:
+    """Value chosen for a field together with the evidence behind it."""
+
+    field: str
+    value: str
+    confidence: float
+    page_no: int
+    value_bbox: BoundingBox
+    key_text: Optional[str] = None
+    key_bbox: Optional[BoundingBox] = None
+
+
+@dataclass
+class ExtractionResult:
+    """Fields extracted from one document.
+
+    ``method`` names the path that produced the values (``pairing`` for the
+    full assignment solve).
+    """
+
+    filename: str
+    fields: Dict[str, Optional[str]]
+    confidence: Dict[str, float]
+    matches: Dict[str, FieldMatch] = field(default_factory=dict)
+    method: str = "pairing"
+
+    def to_record(self) -> Dict[str, Optional[str]]:
+        """Return the result in the ground-truth template schema."""
+
+        record: Dict[str, Optional[str]] = {"filename": self.filename}
+        for name in GROUND_TRUTH_FIELDS:
+            record[name] = self.fields.get(name)
+        return record
+
+
+def parse_loc_box(x1: str, y1: str, x2: str, y2: str) -> BoundingBox:
+    """Build a ``BoundingBox`` from ``<loc_*>`` captures."""
+
+    return BoundingBox(int(x1), int(y1), int(x2), int(y2))
+
+
+def decode_otsl(body: str) -> List[List[OtslCell]]:
+    """Split an OTSL body into rows of cells.
+
+    Args:
+        body: Content of an ``<otsl>`` element after its location tags.
+
+    Returns:
+        Rows of ``OtslCell``; each ``<nl>`` closes a row.
+    """
+
+    rows: List[List[OtslCell]] = []
+    current: List[OtslCell] = []
+    parts = _OTSL_TOKEN_PATTERN.split(body)
+    # parts alternates: leading text, token, text, token, text...
+    for position in range(1, len(parts), 2):
+        token = parts[position]
+        text = parts[position + 1]
+        if "<" in text:
+            text = _INNER_TAG_PATTERN.sub("", text)
+        text = text.strip()
+        if token == "nl":
+            rows.append(current)
+            current = []
+            continue
+        current.append(OtslCell(token=token, text=text))
+    if current:
+        rows.append(current)
+    return rows
+
+
+def parse_doctags(
+    doctags: str,
+    max_pages: Optional[int] = None,
+    box_filter: Optional[Callable[[BoundingBox], bool]] = None,
+) -> List[TextElement]:
+    """Parse DocTags into text elements with page-grid bounding boxes.
+
+    Pictures are skipped; OTSL tables are expanded into one element per
+    non-empty cell with a box estimated from the table grid.
+
+    Args:
+        doctags: DocTags string as written by ``export_to_doctags()``.
+        max_pages: Only parse the first ``max_pages`` pages when set.
+        box_filter: Only keep elements and table cells whose box passes this
+            predicate; the others are never built.
+
+    Returns:
+        Elements in reading order.
+    """
+
+    elements: List[TextElement] = []
+    pages = doctags.split(PAGE_BREAK, max_pages) if max_pages else doctags.split(PAGE_BREAK)
+    for page_no, page_text in enumerate(pages[:max_pages] if max_pages else pages, start=1):
+        for match in ELEMENT_PATTERN.finditer(page_text):
+            tag = match.group("tag")
+            if tag in {"picture", "chart"}:
+                continue
+            bbox = parse_loc_box(*match.group("x1", "y1", "x2", "y2"))
+            if box_filter is not None and not box_filter(bbox):
+                continue
+            body = match.group("body")
+            if tag == "otsl":
+                elements.extend(
+                    _table_cell_elements(body, bbox, page_no, len(elements), box_filter)
+                )
+                continue
+            text = _INNER_TAG_PATTERN.sub("", body).strip()
+            if text:
+                elements.append(TextElement(tag, text, bbox, page_no, len(elements)))
+    return elements
+
+
+def _table_cell_elements(
+    body: str,
+    table_bbox: BoundingBox,
+    page_no: int,
+    start_index: int,
+    box_filter: Optional[Callable[[BoundingBox], bool]] = None,
+) -> List[TextElement]:
+    rows = decode_otsl(body)
+    if not rows:
+        return []
+    num_cols = max(len(row) for row in rows) or 1
+    row_height = (table_bbox.y2 - table_bbox.y1) / len(rows)
+    col_width = (table_bbox.x2 - table_bbox.x1) / num_cols
+    xs = [int(table_bbox.x1 + col * col_width) for col in range(num_cols + 1)]
+    ys = [int(table_bbox.y1 + row * row_height) for row in range(len(rows) + 1)]
+
+    cells: List[TextElement] = []
+    for row_idx, row in enumerate(rows):
+        for col_idx, cell in enumerate(row):
+            if cell.token not in OTSL_CONTENT_TOKENS or not cell.text:
+                continue
+            bbox = BoundingBox(xs[col_idx], ys[row_idx], xs[col_idx + 1], ys[row_idx + 1])
+            if box_filter is not None and not box_filter(bbox):
+                continue
+            cells.append(
+                TextElement(cell.token, cell.text, bbox, page_no, start_index + len(cells))
+            )
+    return cells
+
+
+def _grid_box(bbox: Any, page_size: Any) -> BoundingBox:
+    """Map a Docling bounding box onto the top-left 500x500 DocTags grid."""
+
+    box = bbox.to_top_left_origin(page_height=page_size.height)
+    scale_x = LOC_GRID / page_size.width
+    scale_y = LOC_GRID / page_size.height
+    return BoundingBox(
+        round(box.l * scale_x), round(box.t * scale_y), round(box.r * scale_x), round(box.b * scale_y)
+    )
+
+
+def parse_document(document: Any, max_pages: Optional[int] = None) -> List[TextElement]:
+    """Build text elements straight from an in-memory ``DoclingDocument``.
+
+    Avoids serialising and re-parsing DocTags, but the elements are not
+    identical to ``parse_doctags(document.export_to_doctags())``: only body
+    items are visited (page headers and footers are skipped), and table
+    cells use their own boxes when Docling provides them and the table grid
+    estimate otherwise.
+
+    Args:
+        document: ``DoclingDocument`` from ``ConversionResult.document`` or
+            ``DoclingDocument.load_from_json``.
+        max_pages: Only include elements from the first ``max_pages`` pages.
+
+    Returns:
+        Elements in reading order.
+    """
+
+    elements: List[TextElement] = []
+    for item, _level in document.iterate_items():
+        label = getattr(item.label, "value", str(item.label))
+        if label in {"picture", "chart"} or not getattr(item, "prov", None):
+            continue
+        prov = item.prov[0]
+        if max_pages and prov.page_no > max_pages:
+            continue
+        page_size = document.pages[prov.page_no].size
+        bbox = _grid_box(prov.bbox, page_size)
+        if label == "table":
+            elements.extend(
+                _table_item_elements(item, bbox, page_size, prov.page_no, len(elements))
+            )
+            continue
+        text = (getattr(item, "text", "") or "").strip()
+        if not text:
+            continue
+        tag = f"section_header_level_{item.level}" if label == "section_header" else label
+        elements.append(TextElement(tag, text, bbox, prov.page_no, len(elements)))
+    return elements
+
+
+def _table_item_elements(
+    table: Any, table_bbox: BoundingBox, page_size: Any, page_no: int, start_index: int
+) -> List[TextElement]:
+    data = table.data
+    num_rows = max(data.num_rows, 1)
+    num_cols = max(data.num_cols, 1)
+    row_height = (table_bbox.y2 - table_bbox.y1) / num_rows
+    col_width = (table_bbox.x2 - table_bbox.x1) / num_cols
+
+    cells: List[TextElement] = []
+    ordered = sorted(
+        data.table_cells, key=lambda c: (c.start_row_offset_idx, c.start_col_offset_idx)
+    )
+    for cell in ordered:
+        text = (cell.text or "").strip()
+        if not text:
+            continue
+        if cell.column_header:
+            token = "ched"
+        elif cell.row_header:
+            token = "rhed"
+        elif cell.row_section:
+            token = "srow"
+        else:
+            token = "fcel"
+        if cell.bbox is not None:
+            bbox = _grid_box(cell.bbox, page_size)
+        else:
+            row, col = cell.start_row_offset_idx, cell.start_col_offset_idx
+            bbox = BoundingBox(
+                int(table_bbox.x1 + col * col_width),
+                int(table_bbox.y1 + row * row_height),
+                int(table_bbox.x1 + (col + 1) * col_width),
+                int(table_bbox.y1 + (row + 1) * row_height),
+            )
+        cells.append(TextElement(token, text, bbox, page_no, start_index + len(cells)))
+    return cells
+
+
+_DATE_PATTERN = re.compile(r"^\d{1,4}[-/.]\d{1,2}[-/.]\d{1,4}$")
+_POSTCODE_PATTERN = re.compile(r"^\d{4}[A-Z]{2}$")
+_IBAN_PATTERN = re.compile(r"^[A-Z]{2}\d{2}[A-Z]{4}\d{7,}$")
+_NL_VAT_PATTERN = re.compile(r"^NL(\d{9})B(\d{2})$")
+_EU_VAT_PATTERN = re.compile(r"^[A-Z]{2}[0-9A-Z]{8,12}$")
+
+
+def validate_coc_number(value: str) -> float:
+    """Score a Dutch Chamber of Commerce (KvK) number; KvK numbers are 8 digits."""
+
+    return 1.0 if len(value) == 8 and value.isdigit() else 0.0
+
+
+def validate_vat_number(value: str) -> float:
+    """Score a VAT identifier.
+
+    Dutch numbers (``NL#########B##``) pass when the nine digits satisfy either
+    the legacy eleven-test or the mod-97 check used for newer btw-id numbers.
+    Other EU-shaped identifiers receive a partial score.
+    """
+
+    match = _NL_VAT_PATTERN.match(value)
+    if match:
+        digits = match.group(1)
+        weighted = sum(int(d) * w for d, w in zip(digits[:8], range(9, 1, -1)))
+        if (weighted - int(digits[8])) % 11 == 0:
+            return 1.0
+        # N=23, L=21, B=11 when letters are mapped for the ISO 7064 check.
+        if int(f"2321{digits}11{match.group(2)}") % 97 == 1:
+            return 1.0
+        return 0.5
+    if _EU_VAT_PATTERN.match(value) and not _IBAN_PATTERN.match(value):
+        return 0.6
+    return 0.0
+
+
+def validate_invoice_number(value: str) -> float:
+    """Score an invoice-number candidate, rejecting dates, IBANs and VAT ids."""
+
+    if (
+        _DATE_PATTERN.match(value)
+        or _POSTCODE_PATTERN.match(value)
+        or _IBAN_PATTERN.match(value)
+        or _NL_VAT_PATTERN.match(value)
+    ):
+        return 0.0
+    if not any(char.isdigit() for char in value):
+        return 0.0
+    if value.isdigit():
+        if 5 <= len(value) <= 12:
+            return 1.0
+        return 0.6 if len(value) == 4 else 0.3
+    return 0.8
+
+
+FIELD_SPECS: Tuple[FieldSpec, ...] = (
+    FieldSpec(
+        name="supplier_coc_number",
+        key_pattern=re.compile(
+            r"\b(?:kvk(?:[\s\-]*(?:nr\.?|nummer))?|k\.v\.k\.?|kamer\s+van\s+koophandel"
+            r"|chamber\s+of\s+commerce(?:\s+(?:number|no\.?))?|coc(?:\s+(?:number|no\.?))?"
+            r"|handelsregister)",
+            re.IGNORECASE,
+        ),
+        value_pattern=re.compile(r"(?<![\dA-Za-z])\d{8}(?![\dA-Za-z])"),
+        validator=validate_coc_number,
+    ),
+    FieldSpec(
+        name="supplier_tax_number",
+        key_pattern=re.compile(
+            r"\b(?:btw[\s\-]*(?:nr\.?|nummer|id(?:entificatienummer)?|no\.?)?"
+            r"|vat(?:[\s\-]*(?:number|no\.?|nr\.?|id|reg\.?\s*no\.?))?"
+            r"|tax\s*id|ust[\s\-]*id(?:nr\.?)?)",
+            re.IGNORECASE,
+        ),
+        value_pattern=re.compile(r"\b[A-Z]{2}[0-9A-Z]{8,12}\b"),
+        validator=validate_vat_number,
+    ),
+    FieldSpec(
+        name="invoice_number",
+        key_pattern=re.compile(
+            r"\b(?:factuur[\s\-]*(?:nummer|nr\.?|no\.?)|invoice[\s\-]*(?:number|no\.?|nr\.?|#)"
+            r"|rechnungs[\s\-]*(?:nummer|nr\.?))",
+            re.IGNORECASE,
+        ),
+        value_pattern=re.compile(r"(?<![\w\-/])(?=[\w\-/]*\d)[A-Za-z0-9][\w\-/]{3,19}(?![\w\-/])"),
+        validator=validate_invoice_number,
+    ),
+)
+
+FIELD_SPEC_MAP: Dict[str, FieldSpec] = {spec.name: spec for spec in FIELD_SPECS}
+
+KEY_LABEL_PATTERN = re.compile(
+    r"\b(?=[^\W\d_])(?:"
+    + "|".join(
+        "(?P<{}>{})".format(spec.name, spec.key_pattern.pattern.removeprefix(r"\b"))
+        for spec in FIELD_SPECS
+    )
+    + ")",
+    re.IGNORECASE,
+)
+"""Key labels of every field in one pattern; ``lastgroup`` names the field.
+
+Every label starts at a word boundary with a letter, so a single scan with one
+boundary check up front costs about a third of one ``finditer`` per field.
+"""
+
+_VALUE_CHECKS: Tuple[Tuple[Callable[[str], Any], Callable[[str], float]], ...] = tuple(
+    (spec.value_pattern.fullmatch, spec.validator) for spec in FIELD_SPECS
+)
+
+_CUSTOMER_PREFIX = re.compile(r"(?:customer|klant|client|uw|your)[\s\-]*$", re.IGNORECASE)
+_LEGAL_FORM_PATTERN = re.compile(
+    r"(?<!\w)(?:B\.\s?V\.?|BV|N\.\s?V\.?|NV|V\.O\.F\.?|VOF|GmbH|Ltd\.?|Limited|LLC|Inc\.?|SARL|AG)"
+    r"(?=[\s,)]|$)"
+)
+_NAME_STOP_PATTERN = re.compile(r"[:;(]|^\d+$")
+
+
+@dataclass(frozen=True)
+class _TextIndex:
+    """All element texts joined by NUL so each pattern scans a document once."""
+
+    text: str
+    starts: List[int]
+
+    @classmethod
+    def build(cls, elements: Sequence[TextElement]) -> "_TextIndex":
+        starts: List[int] = []
+        offset = 0
+        for element in elements:
+            starts.append(offset)
+            offset += len(element.text) + 1
+        return cls("\x00".join(element.text for element in elements), starts)
+
+    def locate(self, position: int) -> Tuple[int, int]:
+        """Map a joined-text offset to ``(element_index, local_offset)``."""
+
+        element = bisect_right(self.starts, position) - 1
+        return element, position - self.starts[element]
+
+
+def find_keys(
+    elements: Sequence[TextElement], spec: FieldSpec, index: Optional[_TextIndex] = None
+) -> List[_Span]:
+    """Locate key-label occurrences for ``spec``, ignoring customer-side labels."""
+
+    index = index or _TextIndex.build(elements)
+    spans: List[_Span] = []
+    for match in spec.key_pattern.finditer(index.text):
+        span = _key_span(elements, index, match)
+        if span is not None:
+            spans.append(span)
+    return spans
+
+
+def find_all_keys(
+    elements: Sequence[TextElement], index: Optional[_TextIndex] = None
+) -> List[List[_Span]]:
+    """Locate the key labels of every field in one scan, in ``FIELD_SPECS`` order."""
+
+    index = index or _TextIndex.build(elements)
+    keys_per_field: Dict[str, List[_Span]] = {spec.name: [] for spec in FIELD_SPECS}
+    for match in KEY_LABEL_PATTERN.finditer(index.text):
+        span = _key_span(elements, index, match)
+        if span is not None:
+            keys_per_field[match.lastgroup].append(span)
+    return list(keys_per_field.values())
+
+
+def _key_span(
+    elements: Sequence[TextElement], index: _TextIndex, match: re.Match[str]
+) -> Optional[_Span]:
+    element, start = index.locate(match.start())
+    if _CUSTOMER_PREFIX.search(elements[element].text[max(0, start - 12) : start]):
+        return None
+    return _Span(element, start, start + len(match.group(0)), match.group(0))
+
+
+def find_candidates(
+    elements: Sequence[TextElement], index: Optional[_TextIndex] = None
+) -> List[_Span]:
+    """Collect every token that matches at least one field's value shape."""
+
+    index = index or _TextIndex.build(elements)
+    seen: Dict[Tuple[int, int], _Span] = {}
+    for spec in FIELD_SPECS:
+        for match in spec.value_pattern.finditer(index.text):
+            if (match.start(), match.end()) in seen:
+                continue
+            element, start = index.locate(match.start())
+            seen[(match.start(), match.end())] = _Span(
+                element, start, start + len(match.group(0)), match.group(0)
+            )
+    return [seen[key] for key in sorted(seen)]
+
+
+def _has_inline_label(element: TextElement, cand: _Span) -> bool:
+    """Return ``True`` when a candidate is preceded by a label in its element."""
+
+    prefix = element.text[: cand.start].rstrip()
+    return bool(prefix) and (prefix[-1].isalpha() or prefix[-1] == ":")
+
+
+def _is_prose_key(element: TextElement, key: _Span) -> bool:
+    """Return ``True`` when a key label is part of a sentence, not a label.
+
+    ``"Please mention the invoice number on your payment slip."`` contains the
+    words of a key but is followed by more lowercase prose, whereas real labels
+    end the element or are followed by punctuation or a value.
+    """
+
+    tail = element.text[key.end :].lstrip(" ,")
+    return bool(tail) and tail[0].islower()
+
+
+def _spatial_costs(
+    elements: Sequence[TextElement], keys: Sequence[_Span], candidates: Sequence[_Span]
+) -> np.ndarray:
+    """Return a ``keys x candidates`` matrix of layout costs."""
+
+    key_boxes = np.array(
+        [_box_tuple(elements[k.element]) for k in keys], dtype=np.float64
+    ).reshape(-1, 5)
+    cand_boxes = np.array(
+        [_box_tuple(elements[c.element]) for c in candidates], dtype=np.float64
+    ).reshape(-1, 5)
+
+    kx1, ky1, kx2, _, kpage = (key_boxes[:, i : i + 1] for i in range(5))
+    cx1, cy1, _, _, cpage = (cand_boxes[:, i] for i in range(5))
+
+    dx_right = cx1 - kx2
+    dy_below = cy1 - ky1
+    row_aligned = (np.abs(cy1 - ky1) <= ROW_TOLERANCE) & (dx_right >= -2)
+    col_aligned = (np.abs(cx1 - kx1) <= COLUMN_TOLERANCE) & (dy_below > 0)
+    distance = np.hypot(cx1 - kx1, cy1 - ky1) / LOC_GRID
+
+    costs = 0.4 + distance
+    costs = np.where(col_aligned, 0.1 + np.maximum(dy_below, 0) / LOC_GRID, costs)
+    costs = np.where(row_aligned, 0.05 + np.maximum(dx_right, 0) / LOC_GRID, costs)
+    costs = np.where(kpage != cpage, INFEASIBLE_COST, costs)
+
+    # ``Debtor number 650580`` already has its own label; borrowing that value
+    # for a key in another element is unlikely.
+    labelled = np.array([_has_inline_label(elements[c.element], c) for c in candidates])
+    costs = costs + np.where(labelled, 0.2, 0.0)
+
+    # Key and value inside the same element (``KvK: 76906973``) beat layout.
+    by_element: Dict[int, List[int]] = {}
+    for col, cand in enumerate(candidates):
+        by_element.setdefault(cand.element, []).append(col)
+    for row, key in enumerate(keys):
+        element = elements[key.element]
+        for col in by_element.get(key.element, ()):
+            cand = candidates[col]
+            if cand.start >= key.end:
+                gap = element.text[key.end : cand.start]
+                costs[row, col] = 0.02 * min(len(gap.split()), 10)
+            elif cand.end <= key.start:
+                costs[row, col] = 0.25
+            else:
+                costs[row, col] = INFEASIBLE_COST
+        if _is_prose_key(element, key):
+            costs[row] += 0.3
+    return costs
+
+
+def _box_tuple(element: TextElement) -> Tuple[int, int, int, int, int]:
+    box = element.bbox
+    return (box.x1, box.y1, box.x2, box.y2, element.page_no)
+
+
+def _validity_costs(candidates: Sequence[_Span]) -> np.ndarray:
+    """Return a ``fields x candidates`` matrix of validator costs.
+
+    Repeated candidate texts (the same KvK number in header and footer) are
+    scored once.
+    """
+
+    scored: Dict[str, Tuple[float, ...]] = {}
+    for cand in candidates:
+        if cand.text not in scored:
+            scored[cand.text] = tuple(
+                validator(cand.text) if fullmatch(cand.text) else 0.0
+                for fullmatch, validator in _VALUE_CHECKS
+            )
+    scores = np.array([scored[cand.text] for cand in candidates], dtype=np.float64)
+    scores = scores.reshape(len(candidates), len(FIELD_SPECS)).T
+    return np.where(scores > 0, 1.0 - scores, INFEASIBLE_COST)
+
+
+def build_cost_matrix(
+    elements: Sequence[TextElement],
+    candidates: Sequence[_Span],
+    index: Optional[_TextIndex] = None,
+) -> Tuple[np.ndarray, List[List[_Span]], np.ndarray]:
+    """Build the ``fields x candidates`` cost matrix for one document.
+
+    Args:
+        elements: Parsed DocTags elements.
+        candidates: Value candidates from :func:`find_candidates`.
+        index: Joined-text index shared with :func:`find_candidates`.
+
+    Returns:
+        Tuple of the cost matrix, the key spans per field, and for every cell the
+        index of the key span that produced the minimal cost (``-1`` if none).
+    """
+
+    num_fields = len(FIELD_SPECS)
+    costs = np.full((num_fields, len(candidates)), INFEASIBLE_COST)
+    best_key = np.full((num_fields, len(candidates)), -1, dtype=np.int64)
+    keys_per_field: List[List[_Span]] = []
+    if not candidates:
+        return costs, [[] for _ in FIELD_SPECS], best_key
+
+    index = index or _TextIndex.build(elements)
+    keys_per_field = find_all_keys(elements, index)
+    all_keys = [key for keys in keys_per_field for key in keys]
+    spatial = _spatial_costs(elements, all_keys, candidates) if all_keys else None
+    validity = _validity_costs(candidates)
+
+    offset = 0
+    for row, keys in enumerate(keys_per_field):
+        validity_cost = validity[row]
+        if keys and spatial is not None:
+            block = spatial[offset : offset + len(keys)]
+            offset += len(keys)
+            best_key[row] = block.argmin(axis=0)
+            costs[row] = block.min(axis=0) + 0.5 * validity_cost
+        else:
+            costs[row] = NO_KEY_COST + validity_cost
+    return costs, keys_per_field, best_key
+
+
+def solve_assignment(costs: np.ndarray) -> List[Tuple[int, int, float]]:
+    """Solve one document's pairing with a single optimal-assignment call.
+
+    Args:
+        costs: ``fields x candidates`` matrix.
+
+    Returns:
+        ``(field_row, candidate_col, cost)`` triples below ``ACCEPT_THRESHOLD``.
+    """
+
+    if costs.size == 0:
+        return []
+    rows, cols = linear_sum_assignment(costs)
+    return [
+        (int(r), int(c), float(costs[r, c]))
+        for r, c in zip(rows, cols)
+        if costs[r, c] < ACCEPT_THRESHOLD
+    ]
+
+
+def solve_each_assignment(
+    cost_matrices: Sequence[np.ndarray],
+) -> List[List[Tuple[int, int, float]]]:
+    """Solve several documents' pairings, one ``solve_assignment`` call each.
+
+    This is a loop, not a batched solve: SciPy has no batched assignment
+    solver and a block-diagonal matrix would scale cubically with the batch.
+    """
+
+    return [solve_assignment(costs) for costs in cost_matrices]
+
+
+NAME_ANCHOR_CONFIDENCE = 0.9
+NAME_ROW_BAND_CONFIDENCE = 0.7
+NAME_FALLBACK_CONFIDENCE = 0.3
+
+
+def extract_supplier_name(
+    elements: Sequence[TextElement], anchors: Iterable[int]
+) -> Tuple[Optional[str], float]:
+    """Find the supplier's legal name near the supplier's CoC/VAT values.
+
+    The anchor element itself is checked first, then elements on the same row
+    band, and finally the last legal-form name in the document.
+
+    Args:
+        elements: Parsed DocTags elements.
+        anchors: Element indices holding the supplier CoC or VAT number.
+
+    Returns:
+        ``(name, confidence)``; name is ``None`` when no legal form is found.
+    """
+
+    anchor_list = list(anchors)
+    for anchor in anchor_list:
+        name = company_name_in(elements[anchor].text)
+        if name:
+            return name, NAME_ANCHOR_CONFIDENCE
+    for anchor in anchor_list:
+        box = elements[anchor].bbox
+        page_no = elements[anchor].page_no
+        for element in elements:
+            if element.page_no != page_no or element.index == anchor:
+                continue
+            if element.bbox.y1 <= box.y2 and element.bbox.y2 >= box.y1:
+                name = company_name_in(element.text)
+                if name:
+                    return name, NAME_ROW_BAND_CONFIDENCE
+    for element in reversed(elements):
+        name = company_name_in(element.text)
+        if name:
+            return name, NAME_FALLBACK_CONFIDENCE
+    return None, 0.0
+
+
+def company_name_in(text: str) -> Optional[str]:
+    """Return the company name ending in a legal form (``B.V.``, ``GmbH``...)."""
+
+    match = _LEGAL_FORM_PATTERN.search(text)
+    if not match:
+        return None
+    words = text[: match.start()].split()
+    name_words: List[str] = []
+    for word in reversed(words[-4:]):
+        if _NAME_STOP_PATTERN.search(word):
+            break
+        name_words.insert(0, word)
+    if not name_words:
+        return None
+    return " ".join(name_words + [match.group(0)])
+
+
+def extract_fields(doctags: str, filename: str = "") -> ExtractionResult:
+    """Extract the ground-truth fields from a DocTags string.
+
+    Args:
+        doctags: DocTags content for one document.
+        filename: Source filename recorded in the result.
+
+    Returns:
+        ``ExtractionResult`` with values, confidences and evidence.
+    """
+
+    return extract_from_elements(parse_doctags(doctags), filename)
+
+
+def extract_document(document: Any, filename: str = "") -> ExtractionResult:
+    """Extract the ground-truth fields from an in-memory ``DoclingDocument``.
+
+    Args:
+        document: Docling document, e.g. ``ConversionResult.document``.
+        filename: Source filename recorded in the result.
+
+    Returns:
+        ``ExtractionResult`` with values, confidences and evidence.
+    """
+
+    return extract_from_elements(parse_document(document), filename)
+
+
+def extract_from_elements(elements: Sequence[TextElement], filename: str = "") -> ExtractionResult:
+    """Run the full pairing path over already parsed elements.
+
+    Args:
+        elements: Output of :func:`parse_doctags`.
+        filename: Source filename recorded in the result.
+
+    Returns:
+        ``ExtractionResult`` with values, confidences and evidence.
+    """
+
+    index = _TextIndex.build(elements)
+    candidates = find_candidates(elements, index)
+    costs, keys_per_field, best_key = build_cost_matrix(elements, candidates, index)
+    return _result_from_assignment(
+        filename, elements, candidates, keys_per_field, best_key, solve_assignment(costs)
+    )
+
+
+def extract_batch(documents: Iterable[Tuple[str, str]]) -> List[ExtractionResult]:
+    """Extract fields for many ``(filename, doctags)`` pairs.
+
+    Args:
+        documents: Iterable of ``(filename, doctags)`` tuples.
+
+    Returns:
+        One ``ExtractionResult`` per input, in order.
+    """
+
+    prepared = []
+    for filename, doctags in documents:
+        elements = parse_doctags(doctags)
+        index = _TextIndex.build(elements)
+        candidates = find_candidates(elements, index)
+        prepared.append(
+            (filename, elements, candidates, *build_cost_matrix(elements, candidates, index))
+        )
+
+    solutions = solve_each_assignment([item[3] for item in prepared])
+    return [
+        _result_from_assignment(filename, elements, candidates, keys, best_key, solution)
+        for (filename, elements, candidates, _, keys, best_key), solution in zip(
+            prepared, solutions
+        )
+    ]
+
+
+def _result_from_assignment(
+    filename: str,
+    elements: Sequence[TextElement],
+    candidates: Sequence[_Span],
+    keys_per_field: Sequence[Sequence[_Span]],
+    best_key: np.ndarray,
+    assignment: Sequence[Tuple[int, int, float]],
+) -> ExtractionResult:
+    fields: Dict[str, Optional[str]] = {name: None for name in GROUND_TRUTH_FIELDS}
+    confidence: Dict[str, float] = {name: 0.0 for name in GROUND_TRUTH_FIELDS}
+    matches: Dict[str, FieldMatch] = {}
+
+    for row, col, cost in assignment:
+        spec = FIELD_SPECS[row]
+        cand = candidates[col]
+        element = elements[cand.element]
+        key_idx = int(best_key[row, col])
+        key = keys_per_field[row][key_idx] if key_idx >= 0 else None
+        score = max(0.0, min(1.0, 1.0 - cost))
+        fields[spec.name] = cand.text
+        confidence[spec.name] = round(score, 3)
+        matches[spec.name] = FieldMatch(
+            field=spec.name,
+            value=cand.text,
+            confidence=score,
+            page_no=element.page_no,
+            value_bbox=element.bbox,
+            key_text=key.text if key else None,
+            key_bbox=elements[key.element].bbox if key else None,
+        )
+
+    anchors = [
+        candidates[col].element
+        for row, col, _ in assignment
+        if FIELD_SPECS[row].name in ("supplier_tax_number", "supplier_coc_number")
+    ]
+    if elements:
+        name, name_confidence = extract_supplier_name(elements, anchors)
+        fields["supplier_name"] = name
+        confidence["supplier_name"] = name_confidence
+    return ExtractionResult(filename, fields, confidence, matches)
+
+
+def ruleset_version() -> str:
+    """Return a short hash of this module's source.
+
+    Any edit to the patterns, validators or cost weights changes the version,
+    so stored extraction results can be invalidated without a manual bump.
+    """
+
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:12]
+
+
+def source_filename(doctags_path: Path) -> str:
+    """Map ``EF1.doctags.txt`` back to the ``EF1.pdf`` filename used in records."""
+
+    name = doctags_path.name
+    if name.endswith(".doctags.txt"):
+        name = name[: -len(".doctags.txt")]
+    return f"{name}.pdf"
+
+
+def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse CLI arguments for standalone extraction."""
+
+    parser = argparse.ArgumentParser(
+        description="Extract ground-truth invoice fields from DocTags files."
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        type=Path,
+        help="DocTags files or directories containing *.doctags.txt files.",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Write records as JSON to this path instead of stdout.",
+    )
+    parser.add_argument(
+        "--supplier-registry",
+        type=Path,
+        default=None,
+        help="SQLite registry built by suppliers.py; canonicalises supplier names.",
+    )
+    return parser.parse_args(argv)
+
+
+def collect_doctags_paths(inputs: Iterable[Path]) -> List[Path]:
+    """Expand files and directories into a sorted list of DocTags files."""
+
+    paths: List[Path] = []
+    for entry in inputs:
+        if entry.is_dir():
+            paths.extend(sorted(entry.rglob("*.doctags.txt")))
+        else:
+            paths.append(entry)
+    return paths
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Application entry point."""
+
+    args = parse_arguments(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(message)s")
+    paths = collect_doctags_paths(args.inputs)
+    results = extract_batch(
+        (source_filename(path), path.read_text(encoding="utf-8")) for path in paths
+    )
+    records = [result.to_record() for result in results]
+    if args.supplier_registry:
+        from suppliers import SupplierRegistry, apply_registry
+
+        registry = SupplierRegistry.open(args.supplier_registry)
+        resolved = sum(apply_registry(record, registry) is not None for record in records)
+        registry.close()
+        logging.info("Resolved %d/%d supplier(s) via registry.", resolved, len(records))
+
+    payload = json.dumps(records, indent=2)
+    if args.output:
+        args.output.write_text(payload, encoding="utf-8")
+        logging.info("Wrote %d record(s) to %s", len(results), args.output)
+    else:
+        print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
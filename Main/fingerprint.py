@@ -0,0 +1,441 @@
+"""Supplier layout fingerprints with cached field zones.
+
+Suppliers send the same layout every month: OfficeGrip's ``Factuur`` header
+always sits at ``<loc_24><loc_92>``. Instead of running the full key/value
+pairing from :mod:`extract` on every invoice, this module hashes a coarse
+signature of the first page:
+
+* section headers (text plus position bucketed to ``FINGERPRINT_BUCKET`` loc
+  units),
+* the first picture box (usually the logo).
+
+The signature is read straight from the header and picture tags of the raw
+first-page DocTags, so a known layout costs that scan plus parsing the few
+elements that overlap the cached zones. Pages with neither headers nor a
+picture have no usable signature and always take the full path.
+
+The first time a fingerprint is seen the full path runs and, when every field
+is found with high confidence, the value boxes are stored as field zones. Later
+documents with the same fingerprint read the values straight out of those zones.
+Every value must still score at least as well on the validators from
+:mod:`extract` as the value the zone was learned from (alphanumeric invoice
+numbers score 0.8 and non-Dutch VAT ids 0.6, so one global floor would reject
+those suppliers every time). If any zone fails, the document falls back to
+the full path and the template is re-learned, or dropped when the document is
+no longer confident enough to learn from. When the supplier name was not
+confident enough to cache, hits still look it up with
+:func:`extract.extract_supplier_name`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from extract import (
+    FIELD_SPEC_MAP,
+    FIELD_SPECS,
+    GROUND_TRUTH_FIELDS,
+    PAGE_BREAK,
+    BoundingBox,
+    ExtractionResult,
+    FieldMatch,
+    TextElement,
+    collect_doctags_paths,
+    extract_from_elements,
+    extract_supplier_name,
+    parse_doctags,
+    source_filename,
+)
+
+BASE_DIR = Path(__file__).resolve().parent
+DEFAULT_INDEX_PATH = BASE_DIR / "output" / "fingerprints.json"
+
+FINGERPRINT_BUCKET = 16
+"""Loc units per bucket; absorbs small shifts between renderings."""
+
+ZONE_MARGIN = 6
+LEARN_CONFIDENCE = 0.7
+DEFAULT_VALIDATOR_FLOOR = 0.5
+"""Floor for zones stored before per-field floors were recorded."""
+FAST_PATH_CONFIDENCE = 0.95
+
+_PICTURE_PATTERN = re.compile(r"<picture><loc_(\d+)><loc_(\d+)><loc_(\d+)><loc_(\d+)>")
+_HEADER_PATTERN = re.compile(
+    r"<(?P<tag>title|section_header_level_\d+)><loc_(?P<x1>\d+)><loc_(?P<y1>\d+)>"
+    r"<loc_\d+><loc_\d+>(?P<body>.*?)</(?P=tag)>",
+    re.DOTALL,
+)
+_TAG_PATTERN = re.compile(r"<[^>]+>")
+_WHITESPACE = re.compile(r"\s+")
+_NAME_ANCHOR_FIELDS = ("supplier_coc_number", "supplier_tax_number")
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LayoutSignature:
+    """Coarse description of a first page used to recognise a supplier layout."""
+
+    headers: Tuple[Tuple[str, int, int], ...]
+    logo: Optional[Tuple[int, int, int, int]]
+
+    def __bool__(self) -> bool:
+        """``False`` when page 1 has no headers and no picture to match on."""
+
+        return bool(self.headers) or self.logo is not None
+
+    def digest(self) -> str:
+        """Return a short, stable hash of the signature."""
+
+        canonical = json.dumps([self.headers, self.logo], separators=(",", ":"))
+        return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class LayoutTemplate:
+    """Cached field zones for one fingerprint."""
+
+    fingerprint: str
+    supplier_name: Optional[str]
+    zones: Dict[str, BoundingBox]
+    hits: int = 0
+    floors: Dict[str, float] = field(default_factory=dict)
+
+    def floor(self, name: str) -> float:
+        """Minimum validator score accepted for zone ``name``."""
+
+        return self.floors.get(name, DEFAULT_VALIDATOR_FLOOR)
+
+    def to_dict(self) -> Dict[str, object]:
+        """Serialise for the JSON index file."""
+
+        return {
+            "fingerprint": self.fingerprint,
+            "supplier_name": self.supplier_name,
+            "zones": {
+                name: [box.x1, box.y1, box.x2, box.y2] for name, box in self.zones.items()
+            },
+            "hits": self.hits,
+            "floors": self.floors,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, object]) -> "LayoutTemplate":
+        """Rebuild a template from its JSON form."""
+
+        zones = payload.get("zones") or {}
+        assert isinstance(zones, dict)
+        return cls(
+            fingerprint=str(payload["fingerprint"]),
+            supplier_name=payload.get("supplier_name"),  # type: ignore[arg-type]
+            zones={name: BoundingBox(*coords) for name, coords in zones.items()},
+            hits=int(payload.get("hits", 0)),  # type: ignore[arg-type]
+            floors=dict(payload.get("floors") or {}),  # type: ignore[arg-type]
+        )
+
+
+def _bucket(value: int) -> int:
+    return value // FINGERPRINT_BUCKET
+
+
+def _normalise(text: str) -> str:
+    return _WHITESPACE.sub(" ", text).strip().casefold()
+
+
+def first_page_doctags(doctags: str) -> str:
+    """Return the DocTags of page 1 (everything before the first page break)."""
+
+    return doctags.split(PAGE_BREAK, 1)[0]
+
+
+def layout_signature(first_page: str) -> LayoutSignature:
+    """Compute the layout signature from raw first-page DocTags.
+
+    Only the header and picture tags are scanned; nothing is parsed into
+    elements.
+
+    Args:
+        first_page: DocTags of page 1, see :func:`first_page_doctags`.
+
+    Returns:
+        ``LayoutSignature`` for page 1.
+    """
+
+    headers = []
+    for match in _HEADER_PATTERN.finditer(first_page):
+        text = _normalise(_TAG_PATTERN.sub("", match.group("body")))
+        if text:
+            x1, y1 = int(match.group("x1")), int(match.group("y1"))
+            headers.append((text[:40], _bucket(x1), _bucket(y1)))
+
+    logo: Optional[Tuple[int, int, int, int]] = None
+    picture = _PICTURE_PATTERN.search(first_page)
+    if picture:
+        x1, y1, x2, y2 = (int(value) for value in picture.groups())
+        logo = (_bucket(x1), _bucket(y1), _bucket(x2), _bucket(y2))
+    return LayoutSignature(headers=tuple(sorted(headers)), logo=logo)
+
+
+def _overlaps(box: BoundingBox, zone: BoundingBox, margin: int) -> bool:
+    return (
+        box.x1 <= zone.x2 + margin
+        and box.x2 >= zone.x1 - margin
+        and box.y1 <= zone.y2 + margin
+        and box.y2 >= zone.y1 - margin
+    )
+
+
+def zone_elements(first_page: str, zones: Sequence[BoundingBox]) -> List[TextElement]:
+    """Parse only the page-1 elements and table cells that overlap ``zones``.
+
+    Element ``index`` values count the kept elements only and do not match
+    :func:`extract.parse_doctags` over the whole page.
+    """
+
+    return parse_doctags(
+        first_page,
+        box_filter=lambda box: any(_overlaps(box, zone, ZONE_MARGIN) for zone in zones),
+    )
+
+
+def extract_with_zones(
+    first_page: str, template: LayoutTemplate, filename: str
+) -> Optional[ExtractionResult]:
+    """Read field values from cached zones, verifying each with its validator.
+
+    Args:
+        first_page: DocTags of page 1, see :func:`first_page_doctags`.
+        template: Cached zones for the document's fingerprint.
+        filename: Source filename recorded in the result.
+
+    Returns:
+        ``ExtractionResult`` when every zone yields a value scoring at least
+        the zone's validator floor, else ``None``. ``supplier_name`` is left
+        empty when the template has none.
+    """
+
+    elements = zone_elements(first_page, list(template.zones.values()))
+    fields: Dict[str, Optional[str]] = {name: None for name in GROUND_TRUTH_FIELDS}
+    confidence: Dict[str, float] = {name: 0.0 for name in GROUND_TRUTH_FIELDS}
+    matches: Dict[str, FieldMatch] = {}
+    taken: set[str] = set()
+
+    for name, zone in template.zones.items():
+        spec = FIELD_SPEC_MAP[name]
+        found: Optional[Tuple[str, float, TextElement]] = None
+        for element in elements:
+            if not _overlaps(element.bbox, zone, ZONE_MARGIN):
+                continue
+            for match in spec.value_pattern.finditer(element.text):
+                score = spec.validator(match.group(0))
+                if score >= template.floor(name) and match.group(0) not in taken:
+                    found = (match.group(0), score, element)
+                    break
+            if found:
+                break
+        if found is None:
+            return None
+        value, score, element = found
+        taken.add(value)
+        fields[name] = value
+        confidence[name] = round(FAST_PATH_CONFIDENCE * score, 3)
+        matches[name] = FieldMatch(
+            field=name,
+            value=value,
+            confidence=FAST_PATH_CONFIDENCE * score,
+            page_no=1,
+            value_bbox=element.bbox,
+        )
+
+    if template.supplier_name:
+        wanted = _normalise(template.supplier_name)
+        # Tags become spaces so a name split by inline markup still matches.
+        if wanted not in first_page.casefold() and wanted not in _normalise(
+            _TAG_PATTERN.sub(" ", first_page)
+        ):
+            return None
+        fields["supplier_name"] = template.supplier_name
+        confidence["supplier_name"] = FAST_PATH_CONFIDENCE
+
+    return ExtractionResult(filename, fields, confidence, matches, method="fingerprint")
+
+
+def _fill_supplier_name(result: ExtractionResult, elements: Sequence[TextElement]) -> None:
+    """Look up the supplier name next to the CoC/VAT values read from zones."""
+
+    boxes = [
+        result.matches[name].value_bbox for name in _NAME_ANCHOR_FIELDS if name in result.matches
+    ]
+    anchors = [
+        element.index for element in elements if element.page_no == 1 and element.bbox in boxes
+    ]
+    name, name_confidence = extract_supplier_name(elements, anchors)
+    result.fields["supplier_name"] = name
+    result.confidence["supplier_name"] = name_confidence
+
+
+class FingerprintIndex:
+    """JSON-backed map from layout fingerprints to cached field zones."""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path
+        self.templates: Dict[str, LayoutTemplate] = {}
+        self.stats: Dict[str, int] = {"fast": 0, "full": 0, "rejected": 0, "learned": 0}
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: Path) -> "FingerprintIndex":
+        """Load an index from ``path``; a missing file yields an empty index."""
+
+        index = cls(path)
+        if path.exists():
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            for entry in payload.get("templates", []):
+                template = LayoutTemplate.from_dict(entry)
+                index.templates[template.fingerprint] = template
+        return index
+
+    def save(self) -> None:
+        """Write the index back to disk when it changed."""
+
+        if self.path is None or not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"templates": [t.to_dict() for t in self.templates.values()]}
+        self.path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        self._dirty = False
+
+    def learn(self, fingerprint: str, result: ExtractionResult) -> bool:
+        """Store field zones from a confident full-path result.
+
+        Returns:
+            ``True`` when a template was stored.
+        """
+
+        zones: Dict[str, BoundingBox] = {}
+        floors: Dict[str, float] = {}
+        for spec in FIELD_SPECS:
+            match = result.matches.get(spec.name)
+            if match is None or match.page_no != 1 or match.confidence < LEARN_CONFIDENCE:
+                return False
+            zones[spec.name] = match.value_bbox
+            floors[spec.name] = spec.validator(match.value)
+        supplier_name = result.fields.get("supplier_name")
+        if result.confidence.get("supplier_name", 0.0) < LEARN_CONFIDENCE:
+            supplier_name = None
+        self.templates[fingerprint] = LayoutTemplate(
+            fingerprint, supplier_name, zones, floors=floors
+        )
+        self.stats["learned"] += 1
+        self._dirty = True
+        return True
+
+    def extract(self, doctags: str, filename: str = "") -> ExtractionResult:
+        """Extract fields, taking the zone fast path for known layouts.
+
+        Args:
+            doctags: DocTags content for one document.
+            filename: Source filename recorded in the result.
+
+        Returns:
+            ``ExtractionResult``; ``method`` tells which path produced it.
+        """
+
+        first_page = first_page_doctags(doctags)
+        signature = layout_signature(first_page)
+        if not signature:
+            self.stats["full"] += 1
+            return extract_from_elements(parse_doctags(doctags), filename)
+        fingerprint = signature.digest()
+        template = self.templates.get(fingerprint)
+        if template is not None:
+            result = extract_with_zones(first_page, template, filename)
+            if result is not None:
+                if result.fields["supplier_name"] is None:
+                    _fill_supplier_name(result, parse_doctags(doctags))
+                # Hit counts are persisted with the next real change only, so a
+                # run of pure cache hits does not rewrite the index.
+                template.hits += 1
+                self.stats["fast"] += 1
+                return result
+            self.stats["rejected"] += 1
+            LOGGER.info("Cached zones for %s rejected by validators; re-learning.", filename)
+
+        self.stats["full"] += 1
+        result = extract_from_elements(parse_doctags(doctags), filename)
+        if not self.learn(fingerprint, result) and template is not None:
+            del self.templates[fingerprint]
+            self._dirty = True
+            LOGGER.info("Dropped cached zones for %s; document not confident enough.", filename)
+        return result
+
+
+def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse CLI arguments for fingerprint-assisted extraction."""
+
+    parser = argparse.ArgumentParser(
+        description=(
+            "Extract invoice fields from DocTags, reusing cached field zones for "
+            "supplier layouts seen before."
+        )
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        type=Path,
+        help="DocTags files or directories containing *.doctags.txt files.",
+    )
+    parser.add_argument(
+        "--index",
+        type=Path,
+        default=DEFAULT_INDEX_PATH,
+        help="Fingerprint index JSON file (default: Main/output/fingerprints.json).",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Write records as JSON to this path instead of stdout.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Application entry point."""
+
+    args = parse_arguments(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(message)s")
+    index = FingerprintIndex.load(args.index)
+
+    records: List[Dict[str, Optional[str]]] = []
+    for path in collect_doctags_paths(args.inputs):
+        result = index.extract(path.read_text(encoding="utf-8"), source_filename(path))
+        records.append(result.to_record())
+    index.save()
+
+    payload = json.dumps(records, indent=2)
+    if args.output:
+        args.output.write_text(payload, encoding="utf-8")
+    else:
+        print(payload)
+    LOGGER.info(
+        "Fingerprint stats: fast=%d full=%d rejected=%d learned=%d templates=%d",
+        index.stats["fast"],
+        index.stats["full"],
+        index.stats["rejected"],
+        index.stats["learned"],
+        len(index.templates),
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,464 @@
+"""Line-item extraction from OTSL tables into typed columnar rows.
+
+Invoice tables reach this repo as OTSL strings: inside ``<otsl>`` elements in
+the DocTags output, or as ``tables[*].data.otsl_seq`` in the JSON written by
+``convert.py``. EF1's billing table looks like::
+
+    <srow>363470.001 - George Hintzenweg 89 ...<lcel><ecel><nl>
+    <rhed>Lease fee<fcel>01-01-2024 - 31-01-2024<fcel>262,26<nl>
+
+This module decodes a whole batch of tables at once with pandas string
+methods. ``extractall`` tokenises every OTSL string in one pass. Row and
+column indices come from cumulative counts. Dutch decimals (``€ 2.877,12``),
+percentages (``21,00%``) and date ranges (``01-01-2024 - 31-01-2024``) are
+parsed column-wise. Cells are then assigned a role:
+
+* from the ``<ched>`` column header via ``HEADER_ROLES`` (``Aantal`` →
+  quantity, ``Stukprijs`` → unit_price ...) when the cell parses as that
+  type, or
+* from the cell's type: a date range is the period, a percentage the VAT
+  rate, the right-most decimal the amount. For the description, a
+  description column wins, then a ``<rhed>`` row header, then the right-most
+  text label.
+
+``<srow>`` rows become the ``section`` of the rows below them. The resulting
+line items (``LINE_ITEM_SCHEMA``) are appended batch by batch to a Parquet or
+Arrow IPC file, so spend analytics can read millions of lines without any
+per-document Python.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import re
+import sys
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from document_json import docling_json_paths, loads
+from extract import ELEMENT_PATTERN, collect_doctags_paths, source_filename
+
+BASE_DIR = Path(__file__).resolve().parent
+DEFAULT_OUTPUT_PATH = BASE_DIR / "output" / "line_items.parquet"
+DEFAULT_BATCH_SIZE = 256
+
+HEADER_ROLES = {
+    "aantal": "quantity",
+    "qty": "quantity",
+    "quantity": "quantity",
+    "stuks": "quantity",
+    "omschrijving": "description",
+    "description": "description",
+    "product": "description",
+    "artikel": "description",
+    "stukprijs": "unit_price",
+    "prijs": "unit_price",
+    "unit price": "unit_price",
+    "price": "unit_price",
+    "btw%": "vat_rate",
+    "btw": "vat_rate",
+    "vat%": "vat_rate",
+    "vat": "vat_rate",
+    "totaal": "amount",
+    "total": "amount",
+    "bedrag": "amount",
+    "amount": "amount",
+    "periode": "period",
+    "period": "period",
+}
+"""Lower-cased column header → line-item role."""
+
+TOTAL_PATTERN = re.compile(
+    r"^(?:sub)?tota+l|^(?:vat|btw)\b|openstaand|aanbetaald|te betalen|amount due",
+    re.IGNORECASE,
+)
+"""Descriptions marking summary rows rather than billed items."""
+
+LINE_ITEM_SCHEMA = pa.schema(
+    [
+        ("filename", pa.string()),
+        ("table", pa.int32()),
+        ("row", pa.int32()),
+        ("section", pa.string()),
+        ("description", pa.string()),
+        ("quantity", pa.float64()),
+        ("unit_price", pa.float64()),
+        ("vat_rate", pa.float64()),
+        ("amount", pa.float64()),
+        ("period_start", pa.timestamp("ms")),
+        ("period_end", pa.timestamp("ms")),
+        ("is_total", pa.bool_()),
+    ]
+)
+
+_CELL_PATTERN = r"<(?P<token>fcel|ecel|lcel|ucel|xcel|ched|rhed|srow|nl)>(?P<text>[^<]*)"
+_DECIMAL_PATTERN = r"(?:€\s*)?-?(?:\d{1,3}(?:\.\d{3})+|\d+)(?:,\d{1,4})?"
+_PERCENT_PATTERN = r"\d{1,3}(?:,\d+)?\s*%"
+_DATE = r"\d{1,2}-\d{1,2}-\d{4}"
+_DATE_RANGE_PATTERN = rf"(?P<start>{_DATE})\s*(?:-|–|t/m|tot)\s*(?P<end>{_DATE})"
+_QUANTITY_PATTERN = r"\d{1,6}(?:,\d+)?"
+
+LOGGER = logging.getLogger(__name__)
+
+
+def parse_dutch_decimals(text: pd.Series) -> pd.Series:
+    """Parse ``€ 2.877,12``-style strings; anything else becomes ``NaN``."""
+
+    cleaned = text.str.strip()
+    numeric = cleaned.str.fullmatch(_DECIMAL_PATTERN, na=False)
+    values = (
+        cleaned.where(numeric)
+        .str.replace(r"[€\s.]", "", regex=True)
+        .str.replace(",", ".", regex=False)
+    )
+    return pd.to_numeric(values, errors="coerce")
+
+
+def parse_percentages(text: pd.Series) -> pd.Series:
+    """Parse ``21,00%`` into ``21.0``; anything else becomes ``NaN``."""
+
+    cleaned = text.str.strip()
+    percent = cleaned.str.fullmatch(_PERCENT_PATTERN, na=False)
+    values = cleaned.where(percent).str.rstrip("% ").str.replace(",", ".", regex=False)
+    return pd.to_numeric(values, errors="coerce")
+
+
+def parse_date_ranges(text: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """Parse ``dd-mm-yyyy - dd-mm-yyyy`` ranges into start and end timestamps."""
+
+    parts = text.str.extract(rf"^\s*{_DATE_RANGE_PATTERN}\s*$")
+    start = pd.to_datetime(parts["start"], format="%d-%m-%Y", errors="coerce")
+    end = pd.to_datetime(parts["end"], format="%d-%m-%Y", errors="coerce")
+    return start, end
+
+
+def decode_cells(tables: pd.DataFrame) -> pd.DataFrame:
+    """Tokenise OTSL strings into one row per cell.
+
+    Args:
+        tables: Frame with ``filename``, ``table`` and ``otsl`` columns.
+
+    Returns:
+        Cells with ``filename``, ``table``, ``row``, ``col``, ``token``,
+        ``text``, ``header`` and ``section`` columns. Empty and span cells are
+        dropped after they have advanced the column counter.
+    """
+
+    columns = ["filename", "table", "row", "col", "token", "text", "header", "section"]
+    if tables.empty:
+        return pd.DataFrame(columns=columns)
+    tokens = tables["otsl"].str.extractall(_CELL_PATTERN)
+    if tokens.empty:
+        return pd.DataFrame(columns=columns)
+    tokens = tokens.reset_index(level="match", drop=True)
+    tokens["text"] = tokens["text"].str.strip()
+
+    is_newline = tokens["token"].eq("nl")
+    group = tokens.index
+    tokens["row"] = is_newline.groupby(group).cumsum() - is_newline
+    cells = tokens[~is_newline].copy()
+    cells["col"] = cells.groupby([cells.index, "row"]).cumcount()
+    cells = cells.join(tables[["filename", "table"]])
+
+    headers = (
+        cells[cells["token"].eq("ched") & cells["text"].ne("")]
+        .groupby(["filename", "table", "col"])["text"]
+        .agg(" ".join)
+        .rename("header")
+    )
+    cells = cells.join(headers, on=["filename", "table", "col"])
+
+    section_rows = (
+        cells[cells["token"].eq("srow") & cells["text"].ne("")]
+        .groupby(["filename", "table", "row"])["text"]
+        .agg(" ".join)
+    )
+    if section_rows.empty:
+        cells["section"] = None
+    else:
+        section_frame = section_rows.reset_index()
+        # Consecutive <srow> rows (site address, then contract id) form one section.
+        run_start = section_frame.groupby(["filename", "table"])["row"].diff().ne(1)
+        section_frame["run"] = run_start.cumsum()
+        section_frame["section"] = section_frame.groupby("run")["text"].transform(" / ".join)
+        row_sections = (
+            cells[["filename", "table", "row"]]
+            .drop_duplicates()
+            .merge(section_frame[["filename", "table", "row", "section"]], how="left")
+            .sort_values(["filename", "table", "row"])
+        )
+        row_sections["section"] = row_sections.groupby(["filename", "table"])["section"].ffill()
+        cells = cells.merge(row_sections, on=["filename", "table", "row"], how="left")
+
+    cells = cells[cells["text"].ne("") & ~cells["token"].isin(["ecel", "lcel", "ucel", "xcel"])]
+    return cells[columns].reset_index(drop=True)
+
+
+def line_items(tables: pd.DataFrame) -> pd.DataFrame:
+    """Turn a batch of OTSL tables into typed line items.
+
+    Args:
+        tables: Frame with ``filename``, ``table`` (index within the document)
+            and ``otsl`` columns.
+
+    Returns:
+        Frame matching ``LINE_ITEM_SCHEMA``; rows without a description,
+        amount or period are dropped.
+    """
+
+    cells = decode_cells(tables)
+    cells = cells[~cells["token"].isin(["ched", "srow"])]
+    if cells.empty:
+        return pd.DataFrame({name: pd.Series(dtype=object) for name in LINE_ITEM_SCHEMA.names})
+
+    text = cells["text"]
+    decimal = parse_dutch_decimals(text)
+    percent = parse_percentages(text)
+    period_start, period_end = parse_date_ranges(text)
+    quantity = pd.to_numeric(
+        text.where(text.str.fullmatch(_QUANTITY_PATTERN, na=False)).str.replace(",", "."),
+        errors="coerce",
+    )
+
+    typed_role = pd.Series(None, index=cells.index, dtype=object)
+    typed_role = typed_role.mask(text.str.contains(r"[^\W\d_]", regex=True), "description")
+    typed_role = typed_role.mask(decimal.notna(), "amount")
+    typed_role = typed_role.mask(percent.notna(), "vat_rate")
+    typed_role = typed_role.mask(period_start.notna(), "period")
+    header_role = cells["header"].str.lower().str.strip().map(HEADER_ROLES)
+    # Header roles only stick when the cell parses as that role's type, so a
+    # "Verzend kosten" label under a price header still reads as text.
+    parses = (
+        header_role.eq("description")
+        | (header_role.isin(["amount", "unit_price"]) & decimal.notna())
+        | (header_role.eq("vat_rate") & percent.notna())
+        | (header_role.eq("quantity") & quantity.notna())
+        | (header_role.eq("period") & period_start.notna())
+    )
+    role = header_role.where(parses, typed_role)
+
+    # Description preference: the description column, then a row header, then
+    # the right-most other text cell (the label next to the amount).
+    priority = pd.Series(2, index=cells.index)
+    priority = priority.mask(cells["token"].eq("rhed"), 1).mask(parses & header_role.eq("description"), 0)
+    order = cells["col"].where(priority < 2, -cells["col"])
+
+    values = pd.DataFrame(
+        {
+            "filename": cells["filename"],
+            "table": cells["table"],
+            "row": cells["row"],
+            "col": cells["col"],
+            "section": cells["section"],
+            "role": role,
+            "priority": priority,
+            "order": order,
+            "text": text,
+            "number": decimal.where(role.isin(["amount", "unit_price"]))
+            .fillna(percent.where(role.eq("vat_rate")))
+            .fillna(quantity.where(role.eq("quantity"))),
+            "period_start": period_start,
+            "period_end": period_end,
+        }
+    )
+    keys = ["filename", "table", "row"]
+    # Numbers take the right-most cell of their role.
+    descriptions = (
+        values[values["role"].eq("description")]
+        .sort_values(["priority", "order"], kind="stable")
+        .groupby(keys, sort=False)["text"]
+        .first()
+        .rename("description")
+    )
+    numbers = (
+        values.dropna(subset=["number"])
+        .groupby(keys + ["role"], sort=False)["number"]
+        .last()
+        .unstack("role")
+    )
+    periods = (
+        values.dropna(subset=["period_start"])
+        .groupby(keys, sort=False)[["period_start", "period_end"]]
+        .first()
+    )
+    sections = values.groupby(keys, sort=False)["section"].first()
+
+    items = pd.concat([sections, descriptions, numbers, periods], axis=1)
+    for name in ("quantity", "unit_price", "vat_rate", "amount"):
+        if name not in items:
+            items[name] = float("nan")
+    for name in ("period_start", "period_end"):
+        if name not in items:
+            items[name] = pd.NaT
+    items = items[
+        items["description"].notna() & (items["amount"].notna() | items["period_start"].notna())
+    ]
+    items["is_total"] = items["description"].str.contains(TOTAL_PATTERN, na=False)
+    items = items.reset_index().sort_values(keys, kind="stable")
+    return items[LINE_ITEM_SCHEMA.names].reset_index(drop=True)
+
+
+def tables_from_doctags(filename: str, doctags: str) -> List[Tuple[str, int, str]]:
+    """Collect ``(filename, table_index, otsl)`` tuples from a DocTags string."""
+
+    return [
+        (filename, index, match.group("body"))
+        for index, match in enumerate(
+            m for m in ELEMENT_PATTERN.finditer(doctags) if m.group("tag") == "otsl"
+        )
+    ]
+
+
+def tables_from_json(filename: str, payload: dict) -> List[Tuple[str, int, str]]:
+    """Collect OTSL strings from ``tables[*].data.otsl_seq`` in ``convert.py`` JSON."""
+
+    tables = []
+    for index, table in enumerate(payload.get("tables", [])):
+        data = table.get("data") or {}
+        otsl = data.get("otsl_seq") if isinstance(data, dict) else None
+        if otsl:
+            tables.append((filename, index, otsl))
+    return tables
+
+
+def tables_from_document(filename: str, document: Any) -> List[Tuple[str, int, str]]:
+    """Collect OTSL strings from an in-memory ``DoclingDocument``."""
+
+    return [
+        (filename, index, table.export_to_otsl(doc=document))
+        for index, table in enumerate(document.tables)
+    ]
+
+
+def read_tables(path: Path) -> List[Tuple[str, int, str]]:
+    """Read OTSL tables from a ``.doctags.txt`` or ``convert.py`` ``.json`` file."""
+
+    if path.name.endswith(".json"):
+        filename = f"{path.name[: -len('.json')]}.pdf"
+        return tables_from_json(filename, loads(path.read_bytes()))
+    return tables_from_doctags(source_filename(path), path.read_text(encoding="utf-8"))
+
+
+def to_table_frame(tables: Iterable[Tuple[str, int, str]]) -> pd.DataFrame:
+    """Build the ``filename``/``table``/``otsl`` frame consumed by :func:`line_items`."""
+
+    return pd.DataFrame(list(tables), columns=["filename", "table", "otsl"])
+
+
+class LineItemWriter:
+    """Append line-item batches to one Parquet or Arrow IPC file."""
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.rows = 0
+        if path.suffix.lower() in {".arrow", ".feather", ".ipc"}:
+            self._writer: Any = pa.ipc.new_file(str(path), LINE_ITEM_SCHEMA)
+        else:
+            self._writer = pq.ParquetWriter(str(path), LINE_ITEM_SCHEMA, compression="zstd")
+
+    def write(self, items: pd.DataFrame) -> None:
+        """Append one batch of rows from :func:`line_items`."""
+
+        if items.empty:
+            return
+        table = pa.Table.from_pandas(items, schema=LINE_ITEM_SCHEMA, preserve_index=False)
+        self._writer.write_table(table)
+        self.rows += table.num_rows
+
+    def close(self) -> None:
+        self._writer.close()
+
+    def __enter__(self) -> "LineItemWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def collect_inputs(inputs: Iterable[Path]) -> List[Path]:
+    """Expand files and directories into DocTags and ``convert.py`` JSON files.
+
+    Directories yield their ``*.doctags.txt`` files, plus any DoclingDocument JSON
+    without a DocTags sibling, so each document is read once.
+    """
+
+    paths: List[Path] = []
+    for entry in inputs:
+        if entry.is_dir():
+            doctags = collect_doctags_paths([entry])
+            stems = {path.name[: -len(".doctags.txt")] for path in doctags}
+            paths.extend(doctags)
+            paths.extend(path for path in docling_json_paths(entry) if path.stem not in stems)
+        else:
+            paths.append(entry)
+    return paths
+
+
+def _batches(paths: Sequence[Path], size: int) -> Iterator[Sequence[Path]]:
+    for start in range(0, len(paths), size):
+        yield paths[start : start + size]
+
+
+def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse CLI arguments for line-item extraction."""
+
+    parser = argparse.ArgumentParser(
+        description="Extract invoice line items from OTSL tables into Parquet or Arrow."
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        type=Path,
+        help="DocTags/JSON files or directories produced by convert.py.",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=DEFAULT_OUTPUT_PATH,
+        help=(
+            "Destination file; .arrow/.feather/.ipc writes Arrow IPC, anything else "
+            "Parquet (default: Main/output/line_items.parquet)."
+        ),
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="Documents decoded together and written as one row group.",
+    )
+    parser.add_argument(
+        "--include-totals",
+        action="store_true",
+        help="Keep summary rows (totals, VAT, amount due) in the output.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Application entry point."""
+
+    args = parse_arguments(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(message)s")
+
+    paths = collect_inputs(args.inputs)
+    with LineItemWriter(args.output) as writer:
+        for batch in _batches(paths, max(1, args.batch_size)):
+            tables = [table for path in batch for table in read_tables(path)]
+            items = line_items(to_table_frame(tables))
+            if not args.include_totals:
+                items = items[~items["is_total"]]
+            writer.write(items)
+    LOGGER.info(
+        "Wrote %d line item(s) from %d document(s) to %s", writer.rows, len(paths), args.output
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
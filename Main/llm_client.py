@@ -0,0 +1,496 @@
+"""LLM extraction client for the prompt in ``Main/Prompt-scrapbook.txt``.
+
+The client posts the scrapbook prompt plus a (compacted) DocTags payload to an
+OpenAI-compatible ``/v1/chat/completions`` endpoint and parses the four-line
+answer format the prompt asks for::
+
+    Supplier name: ...
+    Supplier chamber of commerce number: ...
+    Supplier tax id: ...
+    Invoice number: ...
+
+``StandInLlmClient`` implements the same interface without any network access
+by answering from the rule-based extractor, so cascades can be exercised
+offline.
+
+``BatchLlmClient`` packs many payloads into one request behind a byte-identical
+system prefix (the static instructions plus ``BATCH_INSTRUCTIONS``) so servers
+with prefix caching only process the instructions once. It runs a bounded
+number of concurrent requests with retries and keeps a ``ResponseCache`` keyed
+by payload hash and prompt version. ``llm_mock_server.py`` serves the same API
+locally for offline load tests; ``main`` drives such a load test.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import http.client
+import json
+import logging
+import re
+import sqlite3
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from extract import GROUND_TRUTH_FIELDS, collect_doctags_paths, extract_fields, source_filename
+
+BASE_DIR = Path(__file__).resolve().parent
+PROMPT_PATH = BASE_DIR / "Prompt-scrapbook.txt"
+DEFAULT_ENDPOINT = "http://127.0.0.1:8089/v1/chat/completions"
+DEFAULT_MODEL = "local-invoice-extractor"
+DEFAULT_CACHE_PATH = BASE_DIR / "output" / "llm_cache.sqlite"
+
+DEFAULT_BATCH_SIZE = 8
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RETRIES = 3
+RETRY_BACKOFF = 0.5
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+TRANSPORT_ERRORS = (urllib.error.URLError, http.client.HTTPException, TimeoutError, ConnectionError)
+MALFORMED_RESPONSE_ERRORS = (ValueError, KeyError, IndexError, TypeError)
+"""Raised by ``_post`` for bodies that are not JSON or lack ``choices[0].message.content``."""
+
+DOCUMENT_HEADER = "### Document {}"
+BATCH_INSTRUCTIONS = (
+    "The user message contains one or more documents. Each document starts with "
+    "a line '### Document <n>'. Answer every document in order: repeat its "
+    "'### Document <n>' line, then give the four answer lines for that document."
+)
+"""Appended to the static prompt; part of the cached prefix for every batch."""
+
+RESPONSE_LINES: Tuple[Tuple[str, str], ...] = (
+    ("Supplier name", "supplier_name"),
+    ("Supplier chamber of commerce number", "supplier_coc_number"),
+    ("Supplier tax id", "supplier_tax_number"),
+    ("Invoice number", "invoice_number"),
+)
+"""Answer line labels, in prompt order, mapped to ground-truth record keys."""
+
+RESPONSE_LABELS: Dict[str, str] = {label.lower(): key for label, key in RESPONSE_LINES}
+
+_EMPTY_ANSWERS = {"", "none", "n/a", "unknown", "not found", "-"}
+_DOCUMENT_HEADER_PATTERN = re.compile(r"^\W*#*\s*Document\s+(\d+)\W*$", re.IGNORECASE | re.MULTILINE)
+
+LOGGER = logging.getLogger(__name__)
+
+
+def load_prompt(path: Path = PROMPT_PATH) -> str:
+    """Return the static extraction instructions."""
+
+    return path.read_text(encoding="utf-8").strip()
+
+
+def parse_response(text: str) -> Dict[str, Optional[str]]:
+    """Parse the four-line answer into a ground-truth-schema field dict.
+
+    Unknown lines are ignored; missing or placeholder answers map to ``None``.
+    """
+
+    fields: Dict[str, Optional[str]] = {name: None for name in GROUND_TRUTH_FIELDS}
+    for line in text.splitlines():
+        label, separator, value = line.partition(":")
+        if not separator:
+            continue
+        key = RESPONSE_LABELS.get(label.strip().strip("*").strip().lower())
+        if key is None:
+            continue
+        cleaned = value.strip().strip("[]").strip()
+        fields[key] = None if cleaned.lower() in _EMPTY_ANSWERS else cleaned
+    return fields
+
+
+def format_response(fields: Dict[str, Optional[str]]) -> str:
+    """Render fields in the prompt's four-line answer format."""
+
+    return "\n".join(f"{label}: {fields.get(key) or ''}" for label, key in RESPONSE_LINES)
+
+
+def prompt_version(prompt: str) -> str:
+    """Return a short hash identifying the instructions a response was made with."""
+
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12]
+
+
+def render_batch(payloads: Sequence[str]) -> str:
+    """Join payloads into one user message with numbered document headers."""
+
+    return "\n\n".join(
+        f"{DOCUMENT_HEADER.format(number)}\n{payload}"
+        for number, payload in enumerate(payloads, start=1)
+    )
+
+
+def split_batch(text: str) -> Dict[int, str]:
+    """Split a batch (request or answer) into sections by document number."""
+
+    sections: Dict[int, str] = {}
+    headers = list(_DOCUMENT_HEADER_PATTERN.finditer(text))
+    for position, header in enumerate(headers):
+        end = headers[position + 1].start() if position + 1 < len(headers) else len(text)
+        sections[int(header.group(1))] = text[header.end() : end].strip()
+    return sections
+
+
+def parse_batch_response(text: str, count: int) -> List[Optional[Dict[str, Optional[str]]]]:
+    """Parse a batched answer into one field dict per document.
+
+    Documents the model skipped map to ``None`` so callers can retry them.
+    """
+
+    sections = split_batch(text)
+    return [
+        parse_response(sections[number]) if number in sections else None
+        for number in range(1, count + 1)
+    ]
+
+
+class LlmClient:
+    """Minimal client for an OpenAI-compatible chat completions endpoint."""
+
+    def __init__(
+        self,
+        endpoint: str = DEFAULT_ENDPOINT,
+        model: str = DEFAULT_MODEL,
+        timeout: float = 60.0,
+        prompt: Optional[str] = None,
+    ) -> None:
+        self.endpoint = endpoint
+        self.model = model
+        self.timeout = timeout
+        self.prompt = prompt if prompt is not None else load_prompt()
+
+    def complete(self, doctags: str) -> str:
+        """Send one prompt and return the raw answer text."""
+
+        return self._post(self.prompt, doctags)
+
+    def _post(self, system: str, user: str) -> str:
+        body = json.dumps(
+            {
+                "model": self.model,
+                "temperature": 0,
+                "cache_prompt": True,
+                "messages": [
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": user},
+                ],
+            }
+        ).encode("utf-8")
+        request = urllib.request.Request(
+            self.endpoint, data=body, headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            payload = json.loads(response.read().decode("utf-8"))
+        return payload["choices"][0]["message"]["content"]
+
+    def extract(self, doctags: str) -> Dict[str, Optional[str]]:
+        """Extract ground-truth fields from a DocTags payload."""
+
+        return parse_response(self.complete(doctags))
+
+
+class StandInLlmClient(LlmClient):
+    """Offline stand-in that answers from the rule-based extractor."""
+
+    def __init__(self) -> None:
+        super().__init__(endpoint="local://stand-in", prompt="")
+
+    def complete(self, doctags: str) -> str:
+        return format_response(extract_fields(doctags).fields)
+
+
+@dataclass
+class ClientStats:
+    """Counters for one ``BatchLlmClient``."""
+
+    documents: int = 0
+    cache_hits: int = 0
+    requests: int = 0
+    retries: int = 0
+    failures: int = 0
+    seconds: float = 0.0
+
+
+class ResponseCache:
+    """SQLite cache of parsed answers keyed by payload hash and prompt version."""
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, prompt_version TEXT NOT NULL, fields TEXT NOT NULL)"
+        )
+
+    @staticmethod
+    def key(payload: str, version: str) -> str:
+        """Cache key for ``payload`` answered under prompt ``version``."""
+
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return f"{version}:{digest}"
+
+    def get(self, key: str) -> Optional[Dict[str, Optional[str]]]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT fields FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: str, version: str, fields: Dict[str, Optional[str]]) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses (key, prompt_version, fields) VALUES (?, ?, ?)",
+                (key, version, json.dumps(fields)),
+            )
+            self._connection.commit()
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+class BatchLlmClient(LlmClient):
+    """Batched, cached and concurrent variant of :class:`LlmClient`.
+
+    Every request carries the same system message, so a server with prefix
+    caching (``cache_prompt`` on llama.cpp, automatic on most hosted APIs)
+    only processes the static instructions once. Payloads are answered from
+    the cache first; the rest are split into batches of ``batch_size`` and
+    sent with at most ``concurrency`` requests in flight. Connection errors,
+    ``RETRYABLE_STATUS`` responses and malformed response bodies are retried
+    with exponential backoff; a batch that still fails gets all-``None``
+    fields without affecting the other batches. Documents missing from a
+    batched answer are retried on their own.
+    """
+
+    def __init__(
+        self,
+        endpoint: str = DEFAULT_ENDPOINT,
+        model: str = DEFAULT_MODEL,
+        timeout: float = 120.0,
+        prompt: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        retries: int = DEFAULT_RETRIES,
+        cache: Optional[ResponseCache] = None,
+    ) -> None:
+        super().__init__(endpoint=endpoint, model=model, timeout=timeout, prompt=prompt)
+        self.system_prompt = f"{self.prompt}\n\n{BATCH_INSTRUCTIONS}"
+        self.version = prompt_version(self.system_prompt)
+        self.batch_size = max(1, batch_size)
+        self.concurrency = max(1, concurrency)
+        self.retries = retries
+        self.cache = cache
+        self.stats = ClientStats()
+        self._stats_lock = threading.Lock()
+
+    def extract(self, doctags: str) -> Dict[str, Optional[str]]:
+        return self.extract_many([doctags])[0]
+
+    def extract_many(self, payloads: Sequence[str]) -> List[Dict[str, Optional[str]]]:
+        """Extract fields for every payload, batching and caching as configured.
+
+        Args:
+            payloads: Compacted DocTags strings.
+
+        Returns:
+            One field dict per payload, in input order. Payloads whose requests
+            failed after all retries get all-``None`` fields and are not cached.
+        """
+
+        started = time.perf_counter()
+        results: List[Optional[Dict[str, Optional[str]]]] = [None] * len(payloads)
+        pending: Dict[str, List[int]] = {}
+        for position, payload in enumerate(payloads):
+            key = ResponseCache.key(payload, self.version)
+            cached = self.cache.get(key) if self.cache is not None else None
+            if cached is not None:
+                results[position] = cached
+                self.stats.cache_hits += 1
+            else:
+                pending.setdefault(key, []).append(position)
+
+        keys = list(pending)
+        batches = [keys[i : i + self.batch_size] for i in range(0, len(keys), self.batch_size)]
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            answers = pool.map(
+                lambda batch: self._answer([payloads[pending[key][0]] for key in batch]),
+                batches,
+            )
+            for batch, batch_answers in zip(batches, answers):
+                for key, fields in zip(batch, batch_answers):
+                    if fields is None:
+                        fields = {name: None for name in GROUND_TRUTH_FIELDS}
+                    elif self.cache is not None:
+                        self.cache.put(key, self.version, fields)
+                    for position in pending[key]:
+                        results[position] = dict(fields)
+
+        self.stats.documents += len(payloads)
+        self.stats.seconds += time.perf_counter() - started
+        return [fields or {name: None for name in GROUND_TRUTH_FIELDS} for fields in results]
+
+    def _answer(self, payloads: List[str]) -> List[Optional[Dict[str, Optional[str]]]]:
+        text = self._post_with_retries(render_batch(payloads))
+        if text is None:
+            return [None] * len(payloads)
+        answers = parse_batch_response(text, len(payloads))
+        if len(payloads) > 1:
+            for position, fields in enumerate(answers):
+                if fields is None:
+                    answers[position] = self._answer([payloads[position]])[0]
+        elif answers[0] is None:
+            answers[0] = parse_response(text)
+        return answers
+
+    def _post_with_retries(self, user: str) -> Optional[str]:
+        for attempt in range(self.retries + 1):
+            with self._stats_lock:
+                self.stats.requests += 1
+            try:
+                return self._post(self.system_prompt, user)
+            except urllib.error.HTTPError as exc:
+                if exc.code not in RETRYABLE_STATUS:
+                    LOGGER.warning("LLM request rejected with HTTP %d", exc.code)
+                    break
+                error: Exception = exc
+            except TRANSPORT_ERRORS as exc:
+                error = exc
+            except MALFORMED_RESPONSE_ERRORS as exc:
+                LOGGER.debug("Malformed LLM response: %r", exc)
+                error = exc
+            if attempt < self.retries:
+                with self._stats_lock:
+                    self.stats.retries += 1
+                time.sleep(RETRY_BACKOFF * 2**attempt)
+            else:
+                LOGGER.warning("LLM request failed after %d attempts: %s", attempt + 1, error)
+        with self._stats_lock:
+            self.stats.failures += 1
+        return None
+
+
+def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse CLI arguments for a batched extraction (load test) run."""
+
+    parser = argparse.ArgumentParser(
+        description=(
+            "Extract invoice fields through a batched LLM endpoint and report "
+            "throughput; pair with llm_mock_server.py for offline load tests."
+        )
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        type=Path,
+        help="DocTags files or directories containing *.doctags.txt files.",
+    )
+    parser.add_argument("--endpoint", default=DEFAULT_ENDPOINT, help="Chat completions URL.")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="Model name sent to the endpoint.")
+    parser.add_argument(
+        "--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Documents per request."
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Maximum number of requests in flight.",
+    )
+    parser.add_argument(
+        "--retries", type=int, default=DEFAULT_RETRIES, help="Retries per failed request."
+    )
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        default=DEFAULT_CACHE_PATH,
+        help="Response cache database (default: Main/output/llm_cache.sqlite).",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Disable the response cache.")
+    parser.add_argument(
+        "--no-compact",
+        action="store_true",
+        help="Send full DocTags instead of the cropped compaction from compact.py.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help=(
+            "Send each document this many times as distinct payloads (load testing; "
+            "combine with --no-cache)."
+        ),
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Write records as JSON to this path instead of stdout.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Application entry point."""
+
+    args = parse_arguments(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(message)s")
+
+    from compact import compact_doctags
+
+    paths = collect_doctags_paths(args.inputs)
+    payloads = []
+    for path in paths:
+        doctags = path.read_text(encoding="utf-8")
+        payloads.append(doctags if args.no_compact else compact_doctags(doctags, crop=True))
+
+    cache = None if args.no_cache else ResponseCache(args.cache)
+    client = BatchLlmClient(
+        endpoint=args.endpoint,
+        model=args.model,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        retries=args.retries,
+        cache=cache,
+    )
+    # Identical payloads are only sent once, so tag repeats to keep them distinct.
+    workload = payloads + [
+        f"{payload}\n<!-- load test copy {copy} -->"
+        for copy in range(1, max(1, args.repeat))
+        for payload in payloads
+    ]
+    answers = client.extract_many(workload)
+    if cache is not None:
+        cache.close()
+
+    records = []
+    for path, fields in zip(paths, answers):
+        records.append({"filename": source_filename(path), **fields})
+    payload = json.dumps(records, indent=2)
+    if args.output:
+        args.output.write_text(payload, encoding="utf-8")
+    else:
+        print(payload)
+
+    stats = client.stats
+    LOGGER.info(
+        "documents=%d cache_hits=%d requests=%d retries=%d failures=%d | %.2fs | %.1f docs/s",
+        stats.documents,
+        stats.cache_hits,
+        stats.requests,
+        stats.retries,
+        stats.failures,
+        stats.seconds,
+        stats.documents / stats.seconds if stats.seconds else 0.0,
+    )
+    return 1 if stats.failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""Local stand-in for an OpenAI-compatible chat completions server.
+
+Answers ``POST /v1/chat/completions`` from the rule-based extractor, in the
+single or batched answer format ``llm_client`` expects, and simulates the cost
+model of a real inference server so batching and prefix caching can be
+load-tested offline:
+
+* every request pays ``--overhead`` seconds;
+* prompt tokens are "prefilled" at ``--prefill-rate`` tokens/s, except for a
+  system prompt the server has already seen (prefix cache hit);
+* answer tokens are "decoded" at ``--decode-rate`` tokens/s; and
+* at most ``--slots`` requests are processed at the same time.
+
+``--failure-rate`` makes a share of requests return HTTP 503 to exercise the
+client's retries. Token counts use :func:`compact.estimate_tokens`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Sequence, Set
+
+from compact import estimate_tokens
+from extract import extract_fields
+from llm_client import DOCUMENT_HEADER, format_response, split_batch
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8089
+
+LOGGER = logging.getLogger(__name__)
+
+
+class MockLlmServer(ThreadingHTTPServer):
+    """HTTP server holding the simulated cost model and prefix cache."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple,
+        overhead: float = 0.05,
+        prefill_rate: float = 4000.0,
+        decode_rate: float = 400.0,
+        slots: int = 2,
+        failure_rate: float = 0.0,
+    ) -> None:
+        super().__init__(address, MockRequestHandler)
+        self.overhead = overhead
+        self.prefill_rate = prefill_rate
+        self.decode_rate = decode_rate
+        self.failure_rate = failure_rate
+        self.slots = threading.BoundedSemaphore(max(1, slots))
+        self.prefixes: Set[str] = set()
+        self.prefix_lock = threading.Lock()
+
+    def answer(self, system: str, user: str) -> str:
+        """Build the answer text and sleep for the simulated processing time."""
+
+        digest = hashlib.sha256(system.encode("utf-8")).hexdigest()
+        with self.prefix_lock:
+            cached = digest in self.prefixes
+            self.prefixes.add(digest)
+        prompt_tokens = estimate_tokens(user) + (0 if cached else estimate_tokens(system))
+
+        sections = split_batch(user)
+        if sections:
+            answer = "\n".join(
+                f"{DOCUMENT_HEADER.format(number)}\n"
+                f"{format_response(extract_fields(body).fields)}"
+                for number, body in sorted(sections.items())
+            )
+        else:
+            answer = format_response(extract_fields(user).fields)
+
+        with self.slots:
+            time.sleep(
+                self.overhead
+                + prompt_tokens / self.prefill_rate
+                + estimate_tokens(answer) / self.decode_rate
+            )
+        return answer
+
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    """Handle chat completion requests for :class:`MockLlmServer`."""
+
+    server: MockLlmServer
+
+    def do_POST(self) -> None:  # noqa: N802 -- http.server naming
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_error(404)
+            return
+        if random.random() < self.server.failure_rate:
+            self.send_error(503, "Simulated overload")
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            request = json.loads(self.rfile.read(length).decode("utf-8"))
+            messages = request["messages"]
+        except (ValueError, KeyError):
+            self.send_error(400, "Malformed request")
+            return
+        system = "".join(m["content"] for m in messages if m.get("role") == "system")
+        user = "".join(m["content"] for m in messages if m.get("role") == "user")
+
+        content = self.server.answer(system, user)
+        body = json.dumps(
+            {
+                "object": "chat.completion",
+                "model": request.get("model", ""),
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": content},
+                    }
+                ],
+            }
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        LOGGER.debug("%s - %s", self.address_string(), format % args)
+
+
+def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse CLI arguments for the mock server."""
+
+    parser = argparse.ArgumentParser(
+        description="Serve a local mock LLM endpoint for offline extraction load tests."
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Bind address.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Bind port.")
+    parser.add_argument(
+        "--overhead", type=float, default=0.05, help="Fixed seconds per request."
+    )
+    parser.add_argument(
+        "--prefill-rate", type=float, default=4000.0, help="Prompt tokens processed per second."
+    )
+    parser.add_argument(
+        "--decode-rate", type=float, default=400.0, help="Answer tokens generated per second."
+    )
+    parser.add_argument(
+        "--slots", type=int, default=2, help="Requests processed concurrently."
+    )
+    parser.add_argument(
+        "--failure-rate",
+        type=float,
+        default=0.0,
+        help="Share of requests answered with HTTP 503.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Application entry point."""
+
+    args = parse_arguments(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(message)s")
+    server = MockLlmServer(
+        (args.host, args.port),
+        overhead=args.overhead,
+        prefill_rate=args.prefill_rate,
+        decode_rate=args.decode_rate,
+        slots=args.slots,
+        failure_rate=args.failure_rate,
+    )
+    LOGGER.info(
+        "Mock LLM endpoint on http://%s:%d/v1/chat/completions", args.host, args.port
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
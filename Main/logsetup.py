@@ -0,0 +1,139 @@
+"""Non-blocking logging for ``convert.py``.
+
+The root logger gets a single :class:`logging.handlers.QueueHandler`: a log
+call on the conversion thread only formats the message and puts the record
+on an in-memory queue. A :class:`logging.handlers.QueueListener` thread
+drains the queue into
+
+* a size-rotated log file (``convert.log``, ``convert.log.1`` … ``.N``); the
+  previous run's log is rolled over at start-up, so ``convert.log`` always
+  holds the current run;
+* the console.
+
+Levels are set per logger from ``name=LEVEL`` specs (``docling=WARNING``
+silences Docling's per-document INFO lines while ours stay on), so filtered
+records are dropped before they reach the queue.
+
+The configuration snapshot is written once per run to its own file through
+:func:`snapshot_logger` instead of the main log.
+"""
+
+from __future__ import annotations
+
+import logging
+import logging.handlers
+import queue
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+LOG_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+DEFAULT_LEVELS = ("docling=WARNING",)
+DEFAULT_MAX_MB = 20
+DEFAULT_BACKUPS = 5
+
+_LISTENER: Optional[logging.handlers.QueueListener] = None
+
+
+def parse_levels(specs: Sequence[str]) -> Dict[str, int]:
+    """Turn ``name=LEVEL`` specs into ``{logger_name: level}``.
+
+    ``root`` (or an empty name) addresses the root logger.
+
+    Raises:
+        ValueError: For a malformed spec or unknown level name.
+    """
+
+    levels: Dict[str, int] = {}
+    for spec in specs:
+        name, sep, level_name = spec.rpartition("=")
+        level = logging.getLevelName(level_name.strip().upper())
+        if not sep or not isinstance(level, int):
+            raise ValueError(f"Invalid log level spec {spec!r}; expected name=LEVEL.")
+        levels["" if name.strip() in ("", "root") else name.strip()] = level
+    return levels
+
+
+def start_logging(
+    log_path: Path,
+    levels: Optional[Dict[str, int]] = None,
+    max_bytes: int = DEFAULT_MAX_MB << 20,
+    backups: int = DEFAULT_BACKUPS,
+    console_handler: Optional[logging.Handler] = None,
+) -> logging.Logger:
+    """Route the root logger through a queue to a rotating file and the console.
+
+    Args:
+        log_path: Destination for the log file.
+        levels: Per-logger levels; the root defaults to INFO.
+        max_bytes: Rotate the log file beyond this size (0 disables).
+        backups: Rotated log files kept.
+        console_handler: Replacement for the default ``StreamHandler``, e.g.
+            one that prints around a progress bar. Its own level is honoured.
+
+    Returns:
+        Configured root logger.
+    """
+
+    global _LISTENER
+    stop_logging()
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8", delay=True
+    )
+    if backups and log_path.exists() and log_path.stat().st_size:
+        file_handler.doRollover()
+    file_handler.setFormatter(formatter)
+    console_handler = console_handler or logging.StreamHandler()
+    console_handler.setFormatter(formatter)
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.handlers.clear()
+    root.addHandler(logging.handlers.QueueHandler(records))
+    root.setLevel(logging.INFO)
+    for name, level in (levels or {}).items():
+        logging.getLogger(name or None).setLevel(level)
+
+    _LISTENER = logging.handlers.QueueListener(
+        records, file_handler, console_handler, respect_handler_level=True
+    )
+    _LISTENER.start()
+    return root
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+
+    global _LISTENER
+    if _LISTENER is None:
+        return
+    _LISTENER.stop()
+    for handler in _LISTENER.handlers:
+        handler.close()
+    _LISTENER = None
+
+
+def snapshot_logger(path: Path) -> logging.Logger:
+    """Logger writing only to ``path`` (truncated), for the per-run config snapshot."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    logger = logging.getLogger("convert.configuration")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+    handler = logging.FileHandler(path, mode="w", encoding="utf-8")
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    logger.addHandler(handler)
+    return logger
+
+
+def close_logger(logger: logging.Logger) -> None:
+    """Close and detach the handlers of ``logger``."""
+
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
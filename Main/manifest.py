@@ -0,0 +1,141 @@
+"""Skip-unchanged output writes backed by a sidecar manifest.
+
+Rewriting identical DocTags/JSON files on every run makes synced output
+folders re-upload everything. ``write_if_changed`` compares the new payload's
+SHA-256 with the existing file before writing:
+
+* when an ``OutputManifest`` is given, its recorded hash is trusted as long as
+  the file's size and mtime still match, so unchanged files are not even read;
+* otherwise (or for files the manifest does not know) the existing file is
+  compared directly, which is cheap when sizes already differ.
+
+Writes go to a temporary file that replaces the destination, so a synced
+folder never sees a half-written output. ``WriteStats`` counts written and
+skipped files for the run summary.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+MANIFEST_NAME = ".export_manifest"
+
+
+@dataclass
+class WriteStats:
+    """Files written versus skipped because their bytes were unchanged."""
+
+    written: int = 0
+    skipped: int = 0
+    bytes_written: int = 0
+
+    def add(self, other: "WriteStats") -> None:
+        """Accumulate counts from another run or worker."""
+
+        self.written += other.written
+        self.skipped += other.skipped
+        self.bytes_written += other.bytes_written
+
+
+class OutputManifest:
+    """Per-directory record of output hashes, sizes and mtimes."""
+
+    def __init__(self, directory: Path) -> None:
+        self.path = directory / MANIFEST_NAME
+        self.entries: Dict[str, Dict[str, object]] = {}
+        self._dirty = False
+        if self.path.exists():
+            try:
+                self.entries = json.loads(self.path.read_text(encoding="utf-8"))
+            except ValueError:
+                self.entries = {}
+
+    def known_digest(self, destination: Path) -> Optional[str]:
+        """Return the recorded hash when the file on disk still matches the entry."""
+
+        entry = self.entries.get(destination.name)
+        if entry is None:
+            return None
+        try:
+            stat = destination.stat()
+        except FileNotFoundError:
+            return None
+        if entry.get("size") != stat.st_size or entry.get("mtime_ns") != stat.st_mtime_ns:
+            return None
+        return str(entry.get("sha256"))
+
+    def record(self, destination: Path, digest: str) -> None:
+        """Store the current state of ``destination``."""
+
+        stat = destination.stat()
+        self.entries[destination.name] = {
+            "sha256": digest,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the manifest back when it changed."""
+
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.entries, indent=1, sort_keys=True), encoding="utf-8")
+        self._dirty = False
+
+
+def _same_content(destination: Path, data: bytes) -> bool:
+    try:
+        if destination.stat().st_size != len(data):
+            return False
+    except FileNotFoundError:
+        return False
+    return destination.read_bytes() == data
+
+
+def write_if_changed(
+    destination: Path,
+    payload: str,
+    manifest: Optional[OutputManifest] = None,
+    stats: Optional[WriteStats] = None,
+) -> bool:
+    """Write ``payload`` to ``destination`` unless the file already holds it.
+
+    Args:
+        destination: Output file.
+        payload: Text to write (UTF-8).
+        manifest: Optional manifest for the destination directory.
+        stats: Optional counters to update.
+
+    Returns:
+        ``True`` when the file was written, ``False`` when it was skipped.
+    """
+
+    data = payload.encode("utf-8")
+    digest = hashlib.sha256(data).hexdigest()
+    known = manifest.known_digest(destination) if manifest is not None else None
+    unchanged = known == digest if known is not None else _same_content(destination, data)
+
+    if unchanged:
+        if manifest is not None and known is None:
+            manifest.record(destination, digest)
+        if stats is not None:
+            stats.skipped += 1
+        return False
+
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    temporary = destination.with_name(f".{destination.name}.tmp")
+    temporary.write_bytes(data)
+    os.replace(temporary, destination)
+    if manifest is not None:
+        manifest.record(destination, digest)
+    if stats is not None:
+        stats.written += 1
+        stats.bytes_written += len(data)
+    return True
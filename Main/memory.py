@@ -0,0 +1,316 @@
+"""Per-document and per-stage memory accounting for ``convert.py``.
+
+Container sizes, ``--max-file-size``/``--max-pages`` limits and worker counts
+should come from measurements. With ``--memory-profile`` every document
+records, for each stage run by ``convert.py`` (``convert`` — the whole
+Docling pipeline call —, ``extract`` and ``export``):
+
+* the process RSS high-water mark while the stage ran. On Linux the kernel's
+  ``VmHWM`` counter is reset through ``/proc/self/clear_refs`` before each
+  stage; elsewhere the lifetime ``ru_maxrss`` is used, which only shows
+  growth;
+* with ``full``, the Python heap peak from :mod:`tracemalloc` (noticeably
+  slower, and blind to native allocations such as model tensors).
+
+Each record also carries the page count, the largest page size and the OCR
+settings and is appended to ``memory_report.jsonl`` in the reports directory
+(``Main/output/reports`` by default, never the export directory that
+downstream tools glob for ``*.json``). At the end of a run,
+``summarise`` correlates the peaks with pages, page area and OCR, fits the
+RSS cost per page, and derives a worker count that fits the host's memory.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import platform
+import resource
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+MEMORY_MODES = ("off", "rss", "full")
+REPORT_NAME = "memory_report.jsonl"
+SUMMARY_NAME = "memory_summary.json"
+MIB = 1 << 20
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _read_status_kib(key: str) -> Optional[int]:
+    try:
+        with open("/proc/self/status", encoding="ascii") as handle:
+            for line in handle:
+                if line.startswith(key):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def _reset_rss_peak() -> bool:
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as handle:
+            handle.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def rss_peak_mb() -> float:
+    """Current RSS high-water mark in MiB."""
+
+    peak_kib = _read_status_kib("VmHWM:")
+    if peak_kib is not None:
+        return peak_kib / 1024
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / MIB if platform.system() == "Darwin" else peak / 1024
+
+
+def rss_current_mb() -> float:
+    """Current resident set size in MiB (falls back to the high-water mark)."""
+
+    current_kib = _read_status_kib("VmRSS:")
+    return current_kib / 1024 if current_kib is not None else rss_peak_mb()
+
+
+@dataclass
+class StageMemory:
+    """Memory used by one stage of one document."""
+
+    stage: str
+    seconds: float
+    rss_start_mb: float
+    rss_peak_mb: float
+    python_peak_mb: Optional[float] = None
+
+
+@dataclass
+class DocumentMemory:
+    """Memory record for one document."""
+
+    path: str
+    pages: int = 0
+    max_page_width: float = 0.0
+    max_page_height: float = 0.0
+    ocr: bool = False
+    ocr_engine: str = ""
+    ocr_full_page: bool = False
+    stages: List[StageMemory] = field(default_factory=list)
+
+    @property
+    def rss_peak_mb(self) -> float:
+        return max((stage.rss_peak_mb for stage in self.stages), default=0.0)
+
+    @property
+    def python_peak_mb(self) -> Optional[float]:
+        peaks = [stage.python_peak_mb for stage in self.stages if stage.python_peak_mb is not None]
+        return max(peaks) if peaks else None
+
+    @property
+    def max_page_area(self) -> float:
+        return self.max_page_width * self.max_page_height
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable record."""
+
+        payload = asdict(self)
+        payload["rss_peak_mb"] = self.rss_peak_mb
+        payload["python_peak_mb"] = self.python_peak_mb
+        return payload
+
+
+class MemoryTracker:
+    """Track memory per document and stage; a no-op in ``off`` mode."""
+
+    def __init__(self, mode: str = "off", report_dir: Optional[Path] = None) -> None:
+        self.mode = mode
+        self.report_path = report_dir / REPORT_NAME if report_dir is not None else None
+        self.documents: List[DocumentMemory] = []
+        self.current: Optional[DocumentMemory] = None
+        self._can_reset = False
+        if mode == "off":
+            return
+        if mode == "full" and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._can_reset = _reset_rss_peak()
+        if not self._can_reset:
+            LOGGER.warning("RSS peak cannot be reset on this platform; stage peaks only grow.")
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    @contextmanager
+    def document(self, path: Path, args: Any = None) -> Iterator[Optional[DocumentMemory]]:
+        """Collect stages for ``path``; the record is appended to the report on exit."""
+
+        if not self.enabled:
+            yield None
+            return
+        record = DocumentMemory(str(path))
+        if args is not None:
+            record.ocr = bool(args.do_ocr)
+            record.ocr_engine = args.ocr_engine if args.do_ocr else ""
+            record.ocr_full_page = bool(args.do_ocr and args.ocr_force_full_page)
+        self.current = record
+        try:
+            yield record
+        finally:
+            self.current = None
+            self.documents.append(record)
+            self._append(record)
+            LOGGER.info(
+                "Memory %s | pages=%d rss_peak=%.0fMiB python_peak=%s | %s",
+                path.name,
+                record.pages,
+                record.rss_peak_mb,
+                f"{record.python_peak_mb:.0f}MiB" if record.python_peak_mb is not None else "-",
+                ", ".join(f"{s.stage}={s.rss_peak_mb:.0f}MiB" for s in record.stages),
+            )
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Measure one stage of the current document."""
+
+        if not self.enabled or self.current is None:
+            yield
+            return
+        if self._can_reset:
+            _reset_rss_peak()
+        if self.mode == "full":
+            tracemalloc.reset_peak()
+        start_rss = rss_current_mb()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            python_peak = tracemalloc.get_traced_memory()[1] / MIB if self.mode == "full" else None
+            self.current.stages.append(
+                StageMemory(
+                    stage=name,
+                    seconds=time.perf_counter() - started,
+                    rss_start_mb=start_rss,
+                    rss_peak_mb=rss_peak_mb(),
+                    python_peak_mb=python_peak,
+                )
+            )
+
+    def describe(self, document: Any) -> None:
+        """Record page count and the largest page size of a converted document."""
+
+        if self.current is None:
+            return
+        pages = getattr(document, "pages", None) or {}
+        self.current.pages = len(pages)
+        for page in pages.values():
+            size = getattr(page, "size", None)
+            if size is None:
+                continue
+            self.current.max_page_width = max(self.current.max_page_width, float(size.width))
+            self.current.max_page_height = max(self.current.max_page_height, float(size.height))
+
+    def _append(self, record: DocumentMemory) -> None:
+        if self.report_path is None:
+            return
+        self.report_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.report_path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(record.to_dict()) + "\n")
+
+    def summarise(self) -> Dict[str, Any]:
+        """Correlate peaks with document features and suggest limits."""
+
+        records = [record for record in self.documents if record.stages]
+        if not records:
+            return {}
+        peaks = np.array([record.rss_peak_mb for record in records])
+        pages = np.array([record.pages for record in records], dtype=float)
+        areas = np.array([record.max_page_area for record in records])
+
+        def correlation(values: np.ndarray) -> Optional[float]:
+            if len(values) < 3 or np.ptp(values) == 0 or np.ptp(peaks) == 0:
+                return None
+            return float(np.corrcoef(values, peaks)[0, 1])
+
+        per_page = None
+        if len(records) >= 2 and np.ptp(pages) > 0:
+            slope, intercept = np.polyfit(pages, peaks, 1)
+            per_page = {"mib_per_page": float(slope), "base_mib": float(intercept)}
+
+        by_ocr: Dict[str, float] = {}
+        for flag in (False, True):
+            selected = [record.rss_peak_mb for record in records if record.ocr == flag]
+            if selected:
+                by_ocr["ocr" if flag else "no_ocr"] = float(np.mean(selected))
+
+        p95 = float(np.percentile(peaks, 95))
+        summary: Dict[str, Any] = {
+            "documents": len(records),
+            "rss_peak_mb": {
+                "max": float(peaks.max()),
+                "p95": p95,
+                "median": float(np.median(peaks)),
+            },
+            "correlation": {"pages": correlation(pages), "page_area": correlation(areas)},
+            "linear_fit": per_page,
+            "mean_rss_peak_by_ocr": by_ocr,
+            "stage_max_mb": {},
+            "largest": [
+                {"path": record.path, "rss_peak_mb": record.rss_peak_mb, "pages": record.pages}
+                for record in sorted(records, key=lambda item: -item.rss_peak_mb)[:5]
+            ],
+        }
+        for record in records:
+            for stage in record.stages:
+                current = summary["stage_max_mb"].get(stage.stage, 0.0)
+                summary["stage_max_mb"][stage.stage] = max(current, stage.rss_peak_mb)
+        python_peaks = [r.python_peak_mb for r in records if r.python_peak_mb is not None]
+        if python_peaks:
+            summary["python_peak_mb"] = {"max": max(python_peaks)}
+        total = _total_memory_mb()
+        if total:
+            summary["host_memory_mb"] = total
+            summary["suggested_workers"] = max(1, int(total * 0.8 // p95)) if p95 else None
+        return summary
+
+
+def _total_memory_mb() -> Optional[float]:
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / MIB
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def write_summary(tracker: MemoryTracker, directory: Path) -> Optional[Path]:
+    """Write and log the run's memory summary; returns its path."""
+
+    summary = tracker.summarise()
+    if not summary:
+        return None
+    directory.mkdir(parents=True, exist_ok=True)
+    target = directory / SUMMARY_NAME
+    target.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    fit = summary.get("linear_fit") or {}
+    LOGGER.info(
+        "Memory summary: rss peak max=%.0fMiB p95=%.0fMiB | corr(pages)=%s corr(area)=%s | "
+        "%s MiB/page | suggested workers=%s -> %s",
+        summary["rss_peak_mb"]["max"],
+        summary["rss_peak_mb"]["p95"],
+        _fmt(summary["correlation"]["pages"]),
+        _fmt(summary["correlation"]["page_area"]),
+        _fmt(fit.get("mib_per_page")),
+        summary.get("suggested_workers"),
+        target,
+    )
+    return target
+
+
+def _fmt(value: Optional[float]) -> str:
+    return "n/a" if value is None else f"{value:.2f}"
@@ -0,0 +1,267 @@
+"""Prometheus metrics for ``convert.py`` and ``evaluate.py`` runs.
+
+Metrics are kept in-process and rendered in the Prometheus text exposition
+format (version 0.0.4) without extra dependencies. They are exposed either way,
+or both:
+
+* ``--metrics-port``: an HTTP endpoint serving ``/metrics`` from a daemon
+  thread, for scraping while a long backfill runs;
+* ``--metrics-textfile``: a ``.prom`` file rewritten atomically every
+  ``--metrics-interval`` seconds and once more at the end, for the node
+  exporter's textfile collector.
+
+Exported series (prefix ``ivt_``):
+
+* ``documents_total{status}``, ``pages_total``, ``failures_total{error_class}``;
+* ``stage_seconds{stage}`` histogram per conversion stage;
+* ``queue_depth`` (documents not yet started), ``in_flight``, ``workers``
+  and ``worker_utilization`` (busy time over workers × wall time);
+* ``batch_documents`` and ``batch_started_timestamp_seconds``.
+
+Docling's internal page queues (``--queue-max-size``) are not observable
+from outside its pipeline, so queue depth is measured at document level.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+PREFIX = "ivt_"
+DEFAULT_INTERVAL = 15.0
+STAGE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(key: LabelKey, extra: Sequence[Tuple[str, str]] = ()) -> str:
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class ConversionMetrics:
+    """Thread-safe metric store for one batch.
+
+    Args:
+        workers: Number of conversion workers (1 for ``convert.py``).
+    """
+
+    def __init__(self, workers: int = 1) -> None:
+        self.workers = max(1, workers)
+        self.total = 0
+        self.finished = 0
+        self.pages = 0
+        self.busy_seconds = 0.0
+        self.started = time.time()
+        self.documents: Dict[str, int] = {}
+        self.failures: Dict[str, int] = {}
+        self.stage_counts: Dict[str, List[int]] = {}
+        self.stage_sums: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def batch_started(self, total: int) -> None:
+        """Reset the batch clock for ``total`` queued documents."""
+
+        with self._lock:
+            self.total = total
+            self.started = time.time()
+
+    def document_finished(
+        self,
+        documents: int = 1,
+        pages: int = 0,
+        status: str = "success",
+        error_class: Optional[str] = None,
+        stage_times: Optional[Mapping[str, float]] = None,
+        busy_seconds: float = 0.0,
+    ) -> None:
+        """Record one finished conversion.
+
+        Args:
+            documents: Documents it covered (duplicates share a conversion).
+            pages: Pages converted.
+            status: Conversion status, e.g. ``success`` or ``failure``.
+            error_class: Exception class name for failures.
+            stage_times: Seconds per stage; ``*total`` entries are skipped.
+            busy_seconds: Wall time the worker spent on the conversion.
+        """
+
+        with self._lock:
+            self.finished += documents
+            self.pages += pages
+            self.busy_seconds += busy_seconds
+            self.documents[status] = self.documents.get(status, 0) + documents
+            if error_class is not None:
+                self.failures[error_class] = self.failures.get(error_class, 0) + documents
+            for stage, seconds in (stage_times or {}).items():
+                if stage.endswith("total"):
+                    continue
+                counts = self.stage_counts.setdefault(stage, [0] * (len(STAGE_BUCKETS) + 1))
+                for index, bound in enumerate(STAGE_BUCKETS):
+                    if seconds <= bound:
+                        counts[index] += 1
+                counts[-1] += 1
+                self.stage_sums[stage] = self.stage_sums.get(stage, 0.0) + seconds
+
+    def render(self) -> str:
+        """Current values in the Prometheus text format."""
+
+        with self._lock:
+            now = time.time()
+            remaining = max(0, self.total - self.finished)
+            in_flight = min(self.workers, remaining)
+            elapsed = max(now - self.started, 1e-9)
+            utilization = min(1.0, self.busy_seconds / (self.workers * elapsed))
+            lines: List[str] = []
+
+            def family(name: str, kind: str, help_text: str) -> str:
+                full = PREFIX + name
+                lines.append(f"# HELP {full} {help_text}")
+                lines.append(f"# TYPE {full} {kind}")
+                return full
+
+            name = family("documents_total", "counter", "Documents processed by status.")
+            for status, count in sorted(self.documents.items()):
+                lines.append(f"{name}{_labels((('status', status),))} {count}")
+            name = family("pages_total", "counter", "Pages converted.")
+            lines.append(f"{name} {self.pages}")
+            name = family("failures_total", "counter", "Failed documents by error class.")
+            for error_class, count in sorted(self.failures.items()):
+                lines.append(f"{name}{_labels((('error_class', error_class),))} {count}")
+
+            name = family("stage_seconds", "histogram", "Per-document stage latency.")
+            for stage in sorted(self.stage_counts):
+                key: LabelKey = (("stage", stage),)
+                counts = self.stage_counts[stage]
+                for bound, count in zip(STAGE_BUCKETS + (float("inf"),), counts):
+                    le = _labels(key, (("le", _number(bound)),))
+                    lines.append(f"{name}_bucket{le} {count}")
+                lines.append(f"{name}_sum{_labels(key)} {self.stage_sums[stage]!r}")
+                lines.append(f"{name}_count{_labels(key)} {counts[-1]}")
+
+            gauges = (
+                ("batch_documents", "Documents in the current batch.", self.total),
+                ("queue_depth", "Documents waiting to start.", remaining - in_flight),
+                ("in_flight", "Documents being converted.", in_flight),
+                ("workers", "Conversion workers.", self.workers),
+                ("worker_utilization", "Busy time over workers x wall time.", utilization),
+                ("batch_started_timestamp_seconds", "Batch start (Unix time).", self.started),
+            )
+            for gauge, help_text, value in gauges:
+                name = family(gauge, "gauge", help_text)
+                lines.append(f"{name} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def write_textfile(metrics: ConversionMetrics, path: Path) -> None:
+    """Atomically replace ``path`` with the current metrics."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temporary.write_text(metrics.render(), encoding="utf-8")
+    os.replace(temporary, path)
+
+
+class MetricsExporter:
+    """Serve and/or periodically write ``metrics``; a no-op without targets.
+
+    Args:
+        metrics: Store to export.
+        port: Serve ``/metrics`` on this port when given (0 picks a free port).
+        textfile: Rewrite this ``.prom`` file every ``interval`` seconds.
+        interval: Textfile refresh period in seconds.
+        host: Bind address for the HTTP endpoint.
+    """
+
+    def __init__(
+        self,
+        metrics: ConversionMetrics,
+        port: Optional[int] = None,
+        textfile: Optional[Path] = None,
+        interval: float = DEFAULT_INTERVAL,
+        host: str = "127.0.0.1",
+    ) -> None:
+        self.metrics = metrics
+        self.textfile = textfile
+        self.interval = interval
+        self.server: Optional[ThreadingHTTPServer] = None
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        if port is not None:
+            self.server = ThreadingHTTPServer((host, port), self._handler())
+            self.server.daemon_threads = True
+            self._spawn(self.server.serve_forever, "metrics-http")
+        if textfile is not None:
+            write_textfile(metrics, textfile)
+            self._spawn(self._write_periodically, "metrics-textfile")
+
+    @property
+    def address(self) -> Optional[Tuple[str, int]]:
+        """``(host, port)`` of the HTTP endpoint, if serving."""
+
+        return self.server.server_address[:2] if self.server is not None else None
+
+    def _spawn(self, target, name: str) -> None:
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _handler(self) -> type:
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 -- http.server API
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        return Handler
+
+    def _write_periodically(self) -> None:
+        while not self._stop.wait(self.interval):
+            write_textfile(self.metrics, self.textfile)
+
+    def close(self) -> None:
+        """Write the final textfile and stop the endpoint."""
+
+        self._stop.set()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        for thread in self._threads:
+            thread.join()
+        self._threads.clear()
+        if self.textfile is not None:
+            write_textfile(self.metrics, self.textfile)
+
+    def __enter__(self) -> "MetricsExporter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -0,0 +1,177 @@
+"""Per-document profiling for ``convert.py --profile``.
+
+Three modes triage slow invoices without re-running them by hand:
+
+* ``deterministic`` wraps every document in :mod:`cProfile` and writes
+  ``<stem>.prof`` (for ``snakeviz``/``pstats``) plus a ``<stem>.pstats.txt``
+  summary of the most expensive functions. Exact call counts, but it only
+  sees the converting thread and slows Python-heavy code noticeably.
+* ``sampling`` runs a background thread that snapshots the stacks of every
+  other thread every ``interval`` seconds and writes ``<stem>.collapsed.txt``
+  in the collapsed-stack format of ``flamegraph.pl``/speedscope
+  (``thread;outer;...;inner count``). Overhead stays low and Docling's
+  pipeline threads are included.
+* ``slow`` samples every document the same way but only keeps the output of
+  documents that took longer than ``slow_seconds``.
+
+Profiles go to ``<output_dir>/profiles`` by default, next to the run's other
+outputs.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import logging
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from types import FrameType
+from typing import Iterator, List, Optional
+
+PROFILE_MODES = ("off", "deterministic", "sampling", "slow")
+DEFAULT_INTERVAL = 0.005
+DEFAULT_SLOW_SECONDS = 10.0
+PSTATS_LIMIT = 40
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Statistical profiler sampling all other threads' stacks on a timer."""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL) -> None:
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Begin sampling in a daemon thread."""
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampler thread."""
+
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                labels: List[str] = []
+                current: Optional[FrameType] = frame
+                while current is not None:
+                    labels.append(_frame_label(current))
+                    current = current.f_back
+                labels.append(names.get(ident, f"thread-{ident}"))
+                self.stacks[";".join(reversed(labels))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """Samples in collapsed-stack format, heaviest stacks first."""
+
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class DocumentProfiler:
+    """Profile each document according to the selected mode.
+
+    Args:
+        mode: One of ``PROFILE_MODES``.
+        directory: Destination for profile files.
+        interval: Sampling interval in seconds.
+        slow_seconds: Minimum document duration kept in ``slow`` mode.
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        directory: Path,
+        interval: float = DEFAULT_INTERVAL,
+        slow_seconds: float = DEFAULT_SLOW_SECONDS,
+    ) -> None:
+        self.mode = mode
+        self.directory = directory
+        self.interval = interval
+        self.slow_seconds = slow_seconds
+        self.written: List[Path] = []
+        if mode != "off":
+            directory.mkdir(parents=True, exist_ok=True)
+
+    @contextmanager
+    def document(self, stem: str) -> Iterator[None]:
+        """Profile the enclosed block as document ``stem``."""
+
+        if self.mode == "off":
+            yield
+            return
+        if self.mode == "deterministic":
+            with self._deterministic(stem):
+                yield
+            return
+        with self._sampled(stem):
+            yield
+
+    @contextmanager
+    def _deterministic(self, stem: str) -> Iterator[None]:
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            elapsed = time.perf_counter() - started
+            target = self.directory / f"{stem}.prof"
+            profiler.dump_stats(str(target))
+            summary = io.StringIO()
+            stats = pstats.Stats(profiler, stream=summary)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PSTATS_LIMIT)
+            summary_path = self.directory / f"{stem}.pstats.txt"
+            summary_path.write_text(summary.getvalue(), encoding="utf-8")
+            self.written.extend([target, summary_path])
+            LOGGER.info("Profile for %s (%.2fs) written to %s", stem, elapsed, target)
+
+    @contextmanager
+    def _sampled(self, stem: str) -> Iterator[None]:
+        sampler = StackSampler(self.interval)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            yield
+        finally:
+            sampler.stop()
+            elapsed = time.perf_counter() - started
+            if self.mode == "slow" and elapsed < self.slow_seconds:
+                LOGGER.debug("Discarded profile for %s (%.2fs)", stem, elapsed)
+            else:
+                target = self.directory / f"{stem}.collapsed.txt"
+                target.write_text(sampler.collapsed(), encoding="utf-8")
+                self.written.append(target)
+                LOGGER.info(
+                    "Sampled profile for %s (%.2fs, %d samples) written to %s",
+                    stem,
+                    elapsed,
+                    sampler.samples,
+                    target,
+                )
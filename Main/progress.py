@@ -0,0 +1,157 @@
+"""Live batch progress for ``convert.py`` and the worker pools of ``evaluate.py``.
+
+:class:`BatchProgress` wraps a :mod:`tqdm` bar counting documents (with
+tqdm's smoothed ETA) and adds a postfix with pages done, the rolling pages
+per second over the last ``window`` seconds, the stage with the highest mean
+time per document and the failure count::
+
+    convert:  41%|████      | 412/1000 [09:51<13:04, 0.75doc/s, pages=1203 | 2.1 pages/s |
+    slowest=convert 1.21s | failures=3]
+
+Updates happen in the process that collects results, so a pool only has to
+report each finished document once. Updates stay cheap: the postfix is
+recomputed per document without forcing a redraw, and tqdm redraws at most
+every ``mininterval`` seconds.
+
+While a bar is shown, console log lines go through :func:`tqdm.write`
+(:class:`TqdmHandler`) so they don't tear the bar.
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+import time
+from collections import deque
+from typing import IO, Any, Deque, Dict, Mapping, Optional, Tuple
+
+from tqdm import tqdm
+
+PROGRESS_MODES = ("auto", "on", "off")
+DEFAULT_WINDOW = 60.0
+
+
+def progress_enabled(mode: str, stream: IO[str] = sys.stderr) -> bool:
+    """Resolve ``auto`` to whether ``stream`` is a terminal."""
+
+    if mode == "auto":
+        return stream.isatty()
+    return mode == "on"
+
+
+class TqdmHandler(logging.StreamHandler):
+    """Console handler that prints above an active tqdm bar."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            tqdm.write(self.format(record), file=self.stream)
+        except Exception:  # noqa: BLE001 -- logging must never raise
+            self.handleError(record)
+
+
+class BatchProgress:
+    """Progress bar over a batch of documents.
+
+    Args:
+        total: Number of documents in the batch.
+        enabled: Show the bar; when ``False`` every call is a no-op.
+        desc: Bar label.
+        window: Seconds covered by the rolling pages/s rate.
+    """
+
+    def __init__(
+        self,
+        total: int,
+        enabled: bool = True,
+        desc: str = "convert",
+        window: float = DEFAULT_WINDOW,
+    ) -> None:
+        self.enabled = enabled
+        self.window = window
+        self.pages = 0
+        self.failures = 0
+        self.stage_totals: Dict[str, float] = {}
+        self.conversions = 0
+        self._recent: Deque[Tuple[float, int]] = deque()
+        self._window_start = time.monotonic()
+        self._bar: Optional[tqdm] = None
+        if enabled:
+            self._bar = tqdm(total=total, desc=desc, unit="doc", dynamic_ncols=True)
+
+    def update(
+        self,
+        documents: int = 1,
+        pages: int = 0,
+        stage_times: Optional[Mapping[str, float]] = None,
+        failed: bool = False,
+    ) -> None:
+        """Record finished documents.
+
+        Args:
+            documents: Documents finished (a conversion shared by duplicates
+                counts for all of them).
+            pages: Pages converted for these documents.
+            stage_times: Seconds per stage for one conversion; ``*total``
+                entries are ignored.
+            failed: Whether the documents failed.
+        """
+
+        if self._bar is None:
+            return
+        now = time.monotonic()
+        self.pages += pages
+        self.conversions += 1
+        if failed:
+            self.failures += documents
+        for stage, seconds in (stage_times or {}).items():
+            if not stage.endswith("total"):
+                self.stage_totals[stage] = self.stage_totals.get(stage, 0.0) + seconds
+        self._recent.append((now, pages))
+        while self._recent and now - self._recent[0][0] > self.window:
+            self._window_start = self._recent.popleft()[0]
+        self._bar.set_postfix_str(self.postfix(now), refresh=False)
+        self._bar.update(documents)
+
+    def rolling_pages_per_second(self, now: Optional[float] = None) -> float:
+        """Pages per second over the rolling window."""
+
+        if not self._recent:
+            return 0.0
+        now = time.monotonic() if now is None else now
+        elapsed = max(now - self._window_start, 1e-9)
+        return sum(pages for _, pages in self._recent) / elapsed
+
+    def slowest_stage(self) -> Optional[Tuple[str, float]]:
+        """``(stage, mean seconds per conversion)`` of the slowest stage."""
+
+        if not self.stage_totals or not self.conversions:
+            return None
+        stage = max(self.stage_totals, key=self.stage_totals.__getitem__)
+        return stage, self.stage_totals[stage] / self.conversions
+
+    def postfix(self, now: Optional[float] = None) -> str:
+        """Postfix text shown after the bar."""
+
+        parts = [
+            f"pages={self.pages}",
+            f"{self.rolling_pages_per_second(now):.1f} pages/s",
+        ]
+        slowest = self.slowest_stage()
+        if slowest is not None:
+            parts.append(f"slowest={slowest[0]} {slowest[1]:.2f}s")
+        parts.append(f"failures={self.failures}")
+        return " | ".join(parts)
+
+    def close(self) -> None:
+        """Draw the final state and release the terminal line."""
+
+        if self._bar is not None:
+            self._bar.set_postfix_str(self.postfix(), refresh=False)
+            self._bar.close()
+            self._bar = None
+
+    def __enter__(self) -> "BatchProgress":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,42 @@
+"""Result helpers for progressive conversion (``convert.py --progressive``).
+
+``convert.convert_progressive`` converts the leading pages first and only
+converts the rest of the page range when a required field is still missing.
+The two passes are merged here. Nothing in this module imports Docling
+itself, so the merge can be tested against stored documents.
+"""
+
+from __future__ import annotations
+
+from typing import Any, List, Sequence
+
+from extract import ExtractionResult
+
+SUCCESS_STATUS = "success"
+"""``ConversionStatus.SUCCESS`` value; the enum is a ``str`` subclass."""
+
+
+def missing_fields(extraction: ExtractionResult, required: Sequence[str]) -> List[str]:
+    """Return the required fields the extraction left empty."""
+
+    return [name for name in required if not extraction.fields.get(name)]
+
+
+def merge_results(head: Any, tail: Any) -> Any:
+    """Append the pages of ``tail`` (a later page window) to ``head`` in place.
+
+    Both results come from the same PDF, so page numbers stay as converted.
+    The tail's body items and pages are added to the head document with
+    ``DoclingDocument.add_document``; unlike ``DoclingDocument.concatenate``
+    this keeps the head's ``name``, ``origin`` and ``furniture`` and does not
+    renumber pages when the range starts after page 1. A non-success status
+    of either pass carries over to the merged result.
+    """
+
+    head.document.add_document(tail.document)
+    head.document.pages.update(tail.document.pages)
+    head.pages = list(head.pages or []) + list(tail.pages or [])
+    head.errors = list(head.errors or []) + list(tail.errors or [])
+    if head.status == SUCCESS_STATUS:
+        head.status = tail.status
+    return head
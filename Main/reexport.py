@@ -0,0 +1,146 @@
+"""Re-export stored DoclingDocument JSON into additional output formats.
+
+A ``convert.py`` run with ``--output-formats doctags json`` keeps the full
+document model on disk, so Markdown, HTML or text can be produced later
+without running any Docling model again. ``reexport`` loads each stored JSON
+(parsed by :mod:`document_json`, validated into a ``DoclingDocument``) and
+hands it to the same exporter table ``convert.export_conversion_results``
+uses (including the ``otsl_seq`` embedding for JSON), in parallel across
+worker processes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from convert import export_document, resolve_output_formats
+from document_json import docling_json_paths, load_document
+from manifest import WriteStats
+
+BASE_DIR = Path(__file__).resolve().parent
+DEFAULT_INPUT_DIR = BASE_DIR / "output" / "doctags"
+CHUNK_SIZE = 8
+
+LOGGER = logging.getLogger(__name__)
+
+
+def collect_json_paths(inputs: Sequence[Path]) -> List[Path]:
+    """Expand files and directories into stored DoclingDocument JSON files."""
+
+    paths: List[Path] = []
+    for entry in inputs:
+        if entry.is_dir():
+            paths.extend(docling_json_paths(entry))
+        else:
+            paths.append(entry)
+    return paths
+
+
+def reexport_path(
+    path: str, formats: Sequence[str], output_dir: Optional[Path]
+) -> Tuple[str, WriteStats, Optional[str]]:
+    """Worker: export one stored document.
+
+    Unchanged outputs are compared against the existing files and skipped.
+
+    Returns:
+        ``(path, write_stats, error)``; ``error`` is ``None`` on success.
+    """
+
+    source = Path(path)
+    stats = WriteStats()
+    try:
+        document = load_document(source, validate=True)
+        export_document(
+            document,
+            resolve_output_formats(formats),
+            output_dir if output_dir is not None else source.parent,
+            source.stem,
+            LOGGER,
+            stats=stats,
+        )
+    except Exception as exc:  # noqa: BLE001 -- report per document, keep going
+        return path, stats, f"{type(exc).__name__}: {exc}"
+    return path, stats, None
+
+
+def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse CLI arguments for re-export."""
+
+    parser = argparse.ArgumentParser(
+        description=(
+            "Render additional output formats from stored DoclingDocument JSON "
+            "without re-running conversion."
+        )
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="*",
+        type=Path,
+        default=[DEFAULT_INPUT_DIR],
+        help="Stored JSON files or directories (default: Main/output/doctags).",
+    )
+    parser.add_argument(
+        "--output-formats",
+        nargs="+",
+        required=True,
+        help="One or more OutputFormat values to render (e.g. md html).",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=None,
+        help="Destination directory (default: next to each JSON file).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: CPU count).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Application entry point."""
+
+    args = parse_arguments(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(message)s")
+    formats = [fmt.value for fmt in resolve_output_formats(args.output_formats)]
+    paths = collect_json_paths(args.inputs)
+
+    started = time.perf_counter()
+    failures = 0
+    totals = WriteStats()
+    worker = partial(reexport_path, formats=formats, output_dir=args.output_dir)
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        results = pool.map(worker, [str(p) for p in paths], chunksize=CHUNK_SIZE)
+        for path, stats, error in results:
+            totals.add(stats)
+            if error is not None:
+                failures += 1
+                LOGGER.error("Re-export failed for %s: %s", path, error)
+
+    elapsed = time.perf_counter() - started
+    LOGGER.info(
+        "Re-exported %d/%d document(s) to %s in %.2fs | "
+        "files written=%d skipped_unchanged=%d",
+        len(paths) - failures,
+        len(paths),
+        ", ".join(formats),
+        elapsed,
+        totals.written,
+        totals.skipped,
+    )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
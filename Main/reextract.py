@@ -0,0 +1,308 @@
+"""Incremental re-extraction over stored conversion outputs.
+
+Improving the pairing rules in :mod:`extract` should not mean re-running
+Docling over the archive. ``reextract`` runs only the extraction stage over
+the DocTags (``*.doctags.txt``) or DoclingDocument JSON (``*.json``) files
+that ``convert.py`` already wrote:
+
+* a JSON state file remembers, per input, its size, mtime, content hash, the
+  ``extract.ruleset_version()`` it was processed with and the resulting record;
+* inputs whose content and rule-set version are unchanged are skipped (the
+  content is only hashed when size or mtime moved);
+* the remaining inputs are extracted in parallel worker processes; and
+* every field whose value changed is written to a JSONL diff file.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from dedupe import file_sha256
+from document_json import is_docling_json, load_document
+from extract import (
+    GROUND_TRUTH_FIELDS,
+    collect_doctags_paths,
+    extract_document,
+    extract_fields,
+    ruleset_version,
+    source_filename,
+)
+
+BASE_DIR = Path(__file__).resolve().parent
+DEFAULT_INPUT_DIR = BASE_DIR / "output" / "doctags"
+DEFAULT_STATE_PATH = BASE_DIR / "output" / "reextract_state.json"
+DEFAULT_DIFF_PATH = BASE_DIR / "output" / "reextract_diff.jsonl"
+CHUNK_SIZE = 32
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class RunSummary:
+    """Counts for one re-extraction run."""
+
+    total: int = 0
+    skipped: int = 0
+    extracted: int = 0
+    changed_documents: int = 0
+    changed_fields: int = 0
+    failures: int = 0
+
+
+def collect_inputs(inputs: Sequence[Path]) -> List[Path]:
+    """Expand inputs into one stored output per document.
+
+    DocTags files are preferred; a ``.json`` file is only used when no DocTags
+    sibling exists for the same stem.
+    """
+
+    paths: List[Path] = []
+    for entry in inputs:
+        if not entry.is_dir():
+            paths.append(entry)
+            continue
+        doctags = collect_doctags_paths([entry])
+        stems = {path.parent / path.name[: -len(".doctags.txt")] for path in doctags}
+        paths.extend(doctags)
+        paths.extend(
+            path
+            for path in sorted(entry.rglob("*.json"))
+            if path.parent / path.stem not in stems and is_docling_json(path)
+        )
+    return sorted(paths)
+
+
+def record_filename(path: Path) -> str:
+    """Ground-truth ``filename`` for a stored DocTags or JSON output."""
+
+    if path.name.endswith(".json"):
+        return f"{path.stem}.pdf"
+    return source_filename(path)
+
+
+def extract_path(path: str) -> Tuple[str, Optional[Dict[str, Optional[str]]], Optional[str]]:
+    """Worker: extract one stored output.
+
+    Returns:
+        ``(path, record, error)``; ``record`` is ``None`` when extraction failed.
+    """
+
+    source = Path(path)
+    try:
+        if source.name.endswith(".json"):
+            result = extract_document(load_document(source), record_filename(source))
+        else:
+            result = extract_fields(source.read_text(encoding="utf-8"), record_filename(source))
+    except Exception as exc:  # noqa: BLE001 -- report per document, keep going
+        return path, None, f"{type(exc).__name__}: {exc}"
+    return path, result.to_record(), None
+
+
+def load_state(path: Path) -> Dict[str, Dict[str, Any]]:
+    """Load the per-input state written by the previous run."""
+
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8")).get("documents", {})
+
+
+def save_state(path: Path, documents: Dict[str, Dict[str, Any]]) -> None:
+    """Write the state file atomically."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_suffix(path.suffix + ".tmp")
+    temporary.write_text(json.dumps({"documents": documents}, indent=1), encoding="utf-8")
+    os.replace(temporary, path)
+
+
+def diff_records(
+    old: Optional[Dict[str, Optional[str]]], new: Dict[str, Optional[str]]
+) -> List[Dict[str, Optional[str]]]:
+    """List field changes between two records."""
+
+    previous = old or {}
+    return [
+        {
+            "filename": new.get("filename"),
+            "field": name,
+            "old": previous.get(name),
+            "new": new.get(name),
+        }
+        for name in GROUND_TRUTH_FIELDS
+        if previous.get(name) != new.get(name)
+    ]
+
+
+def plan(
+    paths: Sequence[Path], state: Dict[str, Dict[str, Any]], version: str, force: bool
+) -> Tuple[List[Path], Dict[str, Dict[str, Any]]]:
+    """Decide which inputs need extraction.
+
+    Returns:
+        ``(pending, fingerprints)`` where ``fingerprints`` maps every input to
+        its fresh size/mtime/hash entry.
+    """
+
+    pending: List[Path] = []
+    fingerprints: Dict[str, Dict[str, Any]] = {}
+    for path in paths:
+        key = str(path)
+        stat = path.stat()
+        entry = state.get(key, {})
+        fresh: Dict[str, Any] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        if entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+            fresh["sha256"] = entry.get("sha256")
+        else:
+            fresh["sha256"] = file_sha256(path)
+        fingerprints[key] = fresh
+        unchanged = (
+            entry.get("sha256") == fresh["sha256"]
+            and entry.get("ruleset") == version
+            and entry.get("record") is not None
+        )
+        if force or not unchanged:
+            pending.append(path)
+    return pending, fingerprints
+
+
+def reextract(
+    paths: Sequence[Path],
+    state_path: Path,
+    diff_path: Path,
+    workers: Optional[int] = None,
+    force: bool = False,
+) -> Tuple[RunSummary, List[Dict[str, Optional[str]]]]:
+    """Re-run extraction where inputs or rules changed.
+
+    Args:
+        paths: Stored DocTags/JSON outputs.
+        state_path: State file from previous runs (created when missing).
+        diff_path: JSONL file receiving one line per changed field.
+        workers: Worker processes; ``None`` uses the CPU count.
+        force: Ignore the state and re-extract everything.
+
+    Returns:
+        Run summary and the current record of every input.
+    """
+
+    version = ruleset_version()
+    state = load_state(state_path)
+    pending, fingerprints = plan(paths, state, version, force)
+    summary = RunSummary(total=len(paths), skipped=len(paths) - len(pending))
+
+    diff_path.parent.mkdir(parents=True, exist_ok=True)
+    with diff_path.open("w", encoding="utf-8") as diff_handle:
+        if pending:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = pool.map(
+                    extract_path, [str(path) for path in pending], chunksize=CHUNK_SIZE
+                )
+                for key, record, error in results:
+                    if record is None:
+                        summary.failures += 1
+                        LOGGER.error("Extraction failed for %s: %s", key, error)
+                        continue
+                    summary.extracted += 1
+                    changes = diff_records(state.get(key, {}).get("record"), record)
+                    if changes:
+                        summary.changed_documents += 1
+                        summary.changed_fields += len(changes)
+                        for change in changes:
+                            diff_handle.write(json.dumps(change, ensure_ascii=False) + "\n")
+                    state[key] = {**fingerprints[key], "ruleset": version, "record": record}
+
+    current = {str(path) for path in paths}
+    documents = {key: entry for key, entry in state.items() if key in current}
+    save_state(state_path, documents)
+    records = [documents[str(path)]["record"] for path in paths if str(path) in documents]
+    return summary, records
+
+
+def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse CLI arguments for incremental re-extraction."""
+
+    parser = argparse.ArgumentParser(
+        description=(
+            "Re-run field extraction over stored DocTags/JSON outputs, skipping "
+            "documents whose content and rule-set version are unchanged."
+        )
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="*",
+        type=Path,
+        default=[DEFAULT_INPUT_DIR],
+        help="Stored outputs or directories (default: Main/output/doctags).",
+    )
+    parser.add_argument(
+        "--state",
+        type=Path,
+        default=DEFAULT_STATE_PATH,
+        help="State file (default: Main/output/reextract_state.json).",
+    )
+    parser.add_argument(
+        "--diff",
+        type=Path,
+        default=DEFAULT_DIFF_PATH,
+        help="JSONL diff of changed fields (default: Main/output/reextract_diff.jsonl).",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Also write every current record as JSON to this path.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: CPU count).",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-extract every document regardless of the state file.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Application entry point."""
+
+    args = parse_arguments(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(message)s")
+
+    started = time.perf_counter()
+    summary, records = reextract(
+        collect_inputs(args.inputs), args.state, args.diff, args.workers, args.force
+    )
+    if args.output:
+        args.output.write_text(json.dumps(records, indent=2), encoding="utf-8")
+
+    LOGGER.info(
+        "Re-extraction (rules %s): total=%d skipped=%d extracted=%d failures=%d | "
+        "changed: %d document(s), %d field(s) -> %s | %.2fs",
+        ruleset_version(),
+        summary.total,
+        summary.skipped,
+        summary.extracted,
+        summary.failures,
+        summary.changed_documents,
+        summary.changed_fields,
+        args.diff,
+        time.perf_counter() - started,
+    )
+    return 1 if summary.failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+"""Structured per-document run report for ``convert.py``.
+
+Every converted document (and every duplicate that reused its conversion)
+becomes one JSON line in ``<output_dir>/run_report.jsonl``::
+
+    {"type": "document", "run_id": ..., "input_path": ..., "content_sha256": ...,
+     "config_hash": ..., "status": "success", "pages": 1,
+     "timings": {"convert": 3.1, "export": 0.02, "total": 3.2},
+     "outputs": [...], "error_class": null, ...}
+
+A final ``{"type": "run", ...}`` line carries the run's totals. Lines are
+appended to a single open handle and flushed per document, so a crash loses
+at most the document in flight. When the file would grow past ``max_bytes``
+it is rotated like :class:`logging.handlers.RotatingFileHandler`
+(``run_report.jsonl.1`` … ``.N``). Dashboards read these lines instead of
+scraping ``convert.log``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from dedupe import file_sha256
+
+REPORT_NAME = "run_report.jsonl"
+DEFAULT_MAX_MB = 50
+DEFAULT_BACKUPS = 5
+
+NON_CONFIG_OPTIONS = frozenset(
+    {
+        "input_dir",
+        "output_dir",
+        "log_path",
+        "log_level",
+        "log_max_mb",
+        "log_backups",
+        "config_log",
+        "list_options",
+        "progress",
+        "metrics_port",
+        "metrics_textfile",
+        "metrics_interval",
+        "profile",
+        "profile_dir",
+        "profile_interval",
+        "profile_slow_seconds",
+        "memory_profile",
+        "reports_dir",
+        "run_report",
+        "run_report_max_mb",
+        "run_report_backups",
+        "pdf_password",
+    }
+)
+"""Options that do not change conversion output and stay out of the config hash."""
+
+
+def config_hash(options: Dict[str, Any]) -> str:
+    """Short stable hash of the output-affecting conversion options."""
+
+    relevant = {key: value for key, value in options.items() if key not in NON_CONFIG_OPTIONS}
+    payload = json.dumps(relevant, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+
+@dataclass
+class DocumentEntry:
+    """One document's line in the run report."""
+
+    input_path: str
+    content_sha256: Optional[str] = None
+    status: str = "pending"
+    pages: int = 0
+    timings: Dict[str, float] = field(default_factory=dict)
+    outputs: List[str] = field(default_factory=list)
+    error_class: Optional[str] = None
+    error_message: Optional[str] = None
+    duplicate_of: Optional[str] = None
+    started_at: str = field(default_factory=_now)
+
+    @contextmanager
+    def timed(self, stage: str) -> Iterator[None]:
+        """Add the enclosed block's wall time to ``timings[stage]``."""
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.timings[stage] = self.timings.get(stage, 0.0) + elapsed
+
+    def fail(self, exc: BaseException) -> None:
+        """Mark the document as failed by ``exc``."""
+
+        self.status = "failure"
+        self.error_class = type(exc).__name__
+        self.error_message = str(exc)
+
+
+class RunReport:
+    """Append document entries to a size-rotated JSONL file.
+
+    Args:
+        path: Report file.
+        options: Parsed ``convert.py`` options; hashed into ``config_hash``.
+        max_bytes: Rotate before a write would exceed this size (0 disables).
+        backups: Number of rotated files kept.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        options: Dict[str, Any],
+        max_bytes: int = DEFAULT_MAX_MB << 20,
+        backups: int = DEFAULT_BACKUPS,
+    ) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.run_id = uuid.uuid4().hex[:12]
+        self.config_hash = config_hash(options)
+        self.started = time.perf_counter()
+        self.counts: Dict[str, int] = {}
+        self.pages = 0
+        self._handle = path.open("a", encoding="utf-8")
+
+    @contextmanager
+    def document(self, path: Path, duplicates: Sequence[Path] = ()) -> Iterator[DocumentEntry]:
+        """Yield the entry for ``path``; it and its duplicates are written on exit.
+
+        Duplicates inherit status, pages and timings and get their own hash
+        and output names (the canonical outputs with the stem swapped).
+        """
+
+        entry = DocumentEntry(str(path))
+        started = time.perf_counter()
+        try:
+            entry.content_sha256 = file_sha256(path)
+        except OSError as exc:
+            entry.fail(exc)
+        try:
+            yield entry
+        except BaseException as exc:
+            entry.fail(exc)
+            raise
+        finally:
+            entry.timings["total"] = time.perf_counter() - started
+            if entry.status == "pending":
+                entry.status = "success"
+            self.write(entry)
+            for duplicate in duplicates:
+                self.write(self._duplicate_entry(entry, path, duplicate))
+
+    @staticmethod
+    def _duplicate_entry(entry: DocumentEntry, canonical: Path, duplicate: Path) -> DocumentEntry:
+        outputs = []
+        for output in entry.outputs:
+            name = Path(output).name
+            if name.startswith(canonical.stem):
+                output = str(Path(output).with_name(duplicate.stem + name[len(canonical.stem):]))
+            outputs.append(output)
+        copy = DocumentEntry(
+            str(duplicate),
+            status=entry.status,
+            pages=entry.pages,
+            timings=dict(entry.timings),
+            outputs=outputs,
+            error_class=entry.error_class,
+            error_message=entry.error_message,
+            duplicate_of=str(canonical),
+            started_at=entry.started_at,
+        )
+        try:
+            copy.content_sha256 = file_sha256(duplicate)
+        except OSError:
+            pass
+        return copy
+
+    def write(self, entry: DocumentEntry) -> None:
+        """Append one document entry and flush it."""
+
+        self.counts[entry.status] = self.counts.get(entry.status, 0) + 1
+        self.pages += entry.pages
+        self._write_line({"type": "document", **self._common(), **asdict(entry)})
+
+    def close(self) -> None:
+        """Append the run summary line and close the file."""
+
+        if self._handle.closed:
+            return
+        self._write_line(
+            {
+                "type": "run",
+                **self._common(),
+                "finished_at": _now(),
+                "documents": sum(self.counts.values()),
+                "statuses": self.counts,
+                "pages": self.pages,
+                "seconds": time.perf_counter() - self.started,
+            }
+        )
+        self._handle.close()
+
+    def _common(self) -> Dict[str, Any]:
+        return {"run_id": self.run_id, "config_hash": self.config_hash}
+
+    def _write_line(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        if self.max_bytes and self._handle.tell() + len(line.encode("utf-8")) > self.max_bytes:
+            self._rotate()
+        self._handle.write(line)
+        self._handle.flush()
+
+    def _rotate(self) -> None:
+        self._handle.close()
+        if self.backups > 0:
+            for index in range(self.backups - 1, 0, -1):
+                source = self.path.with_name(f"{self.path.name}.{index}")
+                if source.exists():
+                    os.replace(source, self.path.with_name(f"{self.path.name}.{index + 1}"))
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+        self._handle = self.path.open("a", encoding="utf-8")
+
+    def __enter__(self) -> "RunReport":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,175 @@
+"""Append-only output sinks for the streaming modes of ``convert.py``.
+
+``JsonlSink`` writes extracted records as one JSON object per line while
+conversion continues, instead of materialising per-document output files. The
+file handle stays open for the whole run; buffered lines are flushed every
+``flush_every`` records or every ``flush_interval`` seconds, whichever comes
+first, so a crash loses at most one flush window. The interval is enforced by a
+background thread, so records written before a long document still reach the
+file while that document converts.
+
+``DocTagsPageWriter`` appends one document's DocTags page by page, separated
+by ``<page_break>``, to ``<dest>.partial``, so readers can follow the first
+page while later pages are still converting. The partial file replaces the
+destination only once every page is written; a failed conversion removes it
+and leaves the previous output in place.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Dict, Optional, Type
+
+DEFAULT_FLUSH_EVERY = 16
+DEFAULT_FLUSH_INTERVAL = 5.0
+
+
+class JsonlSink:
+    """Write records to a JSONL file, flushing in batches.
+
+    A ``flush_interval`` of zero or less disables the timer thread; lines are
+    then flushed by count and on ``close`` only.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        flush_every: int = DEFAULT_FLUSH_EVERY,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        append: bool = True,
+    ) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.flush_every = max(1, flush_every)
+        self.flush_interval = flush_interval
+        self.count = 0
+        self._pending = 0
+        self._handle = path.open("a" if append else "w", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._timer: Optional[threading.Thread] = None
+        if flush_interval > 0:
+            self._timer = threading.Thread(
+                target=self._flush_periodically, name="jsonl-flush", daemon=True
+            )
+            self._timer.start()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Append one record and flush when a flush window has elapsed."""
+
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._handle.write(line)
+            self.count += 1
+            self._pending += 1
+            if self._pending >= self.flush_every:
+                self._flush()
+
+    def flush(self) -> None:
+        """Push buffered lines to the operating system."""
+
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        self._handle.flush()
+        self._pending = 0
+
+    def _flush_periodically(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            with self._lock:
+                if self._pending and not self._handle.closed:
+                    self._flush()
+
+    def close(self) -> None:
+        """Stop the flush timer, then flush and close the underlying file."""
+
+        self._stop.set()
+        if self._timer is not None:
+            self._timer.join()
+            self._timer = None
+        with self._lock:
+            if not self._handle.closed:
+                self._flush()
+                self._handle.close()
+
+    def __enter__(self) -> "JsonlSink":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+class DocTagsPageWriter:
+    """Append per-page DocTags to one ``.doctags.txt`` file as pages complete.
+
+    Each page string (as returned by ``export_to_doctags(pages={n})``) loses
+    its ``<doctag>`` wrapper; pages are joined with ``<page_break>`` inside a
+    single wrapper, matching a whole-document export. Every page is flushed
+    immediately to ``partial_path``, which replaces ``path`` on :meth:`close`.
+    Leaving the context with an exception calls :meth:`discard` instead.
+    """
+
+    OPEN_TAG = "<doctag>"
+    CLOSE_TAG = "</doctag>"
+    PAGE_BREAK = "<page_break>"
+    PARTIAL_SUFFIX = ".partial"
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.partial_path = path.with_name(path.name + self.PARTIAL_SUFFIX)
+        self.pages = 0
+        self._handle = self.partial_path.open("w", encoding="utf-8")
+
+    def write_page(self, doctags: str) -> None:
+        """Append one page and flush it to the operating system."""
+
+        body = doctags.strip()
+        if body.startswith(self.OPEN_TAG):
+            body = body[len(self.OPEN_TAG) :]
+        if body.endswith(self.CLOSE_TAG):
+            body = body[: -len(self.CLOSE_TAG)]
+        self._handle.write(self.OPEN_TAG if self.pages == 0 else f"{self.PAGE_BREAK}\n")
+        self._handle.write(body)
+        self._handle.flush()
+        self.pages += 1
+
+    def close(self) -> None:
+        """Close the wrapper tag and move the finished file over ``path``."""
+
+        if not self._handle.closed:
+            if self.pages:
+                self._handle.write(self.CLOSE_TAG)
+            self._handle.close()
+            os.replace(self.partial_path, self.path)
+
+    def discard(self) -> None:
+        """Drop the partial file, keeping any previous output at ``path``."""
+
+        if not self._handle.closed:
+            self._handle.close()
+            self.partial_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "DocTagsPageWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
@@ -0,0 +1,474 @@
+"""Local supplier registry with exact-ID and fuzzy-name resolution.
+
+``supplier_name`` in the extracted records is free text from a letterhead
+(``"Eurofiber Nederland BV"``, ``"Officegrip Hardware B.V."``). This module
+loads the supplier master from CSV or Parquet into a SQLite file keyed by
+Chamber of Commerce (KvK) and VAT number, and stores a trigram index over
+normalised names for fuzzy lookups in the same file: ``trigram_counts`` holds
+the posting-list length per trigram and ``trigram_postings`` the list itself,
+packed as little-endian int32 supplier rowids. Opening a registry therefore
+costs nothing, and a lookup reads only the posting lists it probes and counts
+shared trigrams with NumPy.
+
+Resolution order:
+
+1. exact CoC number,
+2. exact VAT number,
+3. trigram search over normalised names.
+
+An exact ID hit short-circuits the fuzzy search entirely. Name normalisation
+folds case, strips legal forms and punctuation, and maps common OCR digit/letter
+confusions so ``"0fficeGrip Hardware BV"`` still finds ``OfficeGrip``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import logging
+import re
+import sqlite3
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent
+DEFAULT_REGISTRY_PATH = BASE_DIR / "output" / "suppliers.sqlite"
+
+COLUMN_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "supplier_id": ("supplier_id", "id", "vendor_id", "crediteurnummer"),
+    "name": ("name", "supplier_name", "vendor_name", "naam"),
+    "coc_number": ("coc_number", "supplier_coc_number", "kvk", "kvk_nummer", "coc"),
+    "vat_number": ("vat_number", "supplier_tax_number", "btw_nummer", "vat", "tax_number"),
+}
+"""Accepted source column names for each registry column."""
+
+MIN_NAME_SCORE = 0.6
+MAX_POSTING_SHARE = 0.02
+MIN_PROBE_TRIGRAMS = 4
+MAX_PROBE_TRIGRAMS = 8
+CANDIDATE_POOL = 25
+POSTING_DTYPE = np.dtype("<i4")
+
+_LEGAL_FORMS = re.compile(
+    r"\b(?:b\s?v|n\s?v|v\s?o\s?f|gmbh|ltd|limited|llc|inc|sarl|ag|holding)\b"
+)
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+_OCR_NAME_FIXES = str.maketrans({"0": "o", "1": "l", "5": "s", "8": "b", "|": "l"})
+_OCR_DIGIT_FIXES = str.maketrans({"O": "0", "o": "0", "I": "1", "l": "1", "S": "5", "B": "8"})
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Supplier:
+    """One row of the supplier master."""
+
+    supplier_id: str
+    name: str
+    coc_number: Optional[str]
+    vat_number: Optional[str]
+
+
+@dataclass(frozen=True)
+class SupplierMatch:
+    """Registry hit with the method that produced it."""
+
+    supplier: Supplier
+    score: float
+    method: str
+
+
+def normalise_name(name: str) -> str:
+    """Reduce a company name to the form used by the trigram index."""
+
+    folded = name.casefold().replace(".", "")
+    folded = _LEGAL_FORMS.sub(" ", folded)
+    folded = _NON_ALNUM.sub(" ", folded).translate(_OCR_NAME_FIXES)
+    return " ".join(folded.split())
+
+
+def normalise_coc(value: Optional[str]) -> Optional[str]:
+    """Return the 8-digit KvK number, repairing O/0 and l/1 OCR swaps."""
+
+    if not value:
+        return None
+    digits = re.sub(r"[\s.\-]", "", str(value)).translate(_OCR_DIGIT_FIXES)
+    return digits if digits.isdigit() else None
+
+
+def normalise_vat(value: Optional[str]) -> Optional[str]:
+    """Return an upper-case VAT id without separators."""
+
+    if not value:
+        return None
+    compact = re.sub(r"[\s.\-]", "", str(value)).upper()
+    return compact or None
+
+
+def trigrams(normalised: str) -> List[str]:
+    """Return the padded character trigrams of a normalised name."""
+
+    padded = f"  {normalised} "
+    return sorted({padded[i : i + 3] for i in range(len(padded) - 2)})
+
+
+def _dice(left: Sequence[str], right: Sequence[str]) -> float:
+    if not left or not right:
+        return 0.0
+    shared = len(set(left) & set(right))
+    return 2.0 * shared / (len(left) + len(right))
+
+
+def read_source_rows(source: Path) -> Iterator[Dict[str, Optional[str]]]:
+    """Yield supplier rows from a CSV or Parquet file with canonical column names.
+
+    Args:
+        source: ``.csv`` or ``.parquet`` file.
+
+    Raises:
+        ValueError: If the file type is unsupported or no name column exists.
+    """
+
+    suffix = source.suffix.lower()
+    if suffix == ".parquet":
+        import pandas as pd
+
+        frame = pd.read_parquet(source)
+        yield from _canonical_rows(source, list(frame.columns), frame.to_dict(orient="records"))
+    elif suffix == ".csv":
+        with source.open(newline="", encoding="utf-8-sig") as handle:
+            dialect = csv.Sniffer().sniff(handle.read(4096), delimiters=",;\t")
+            handle.seek(0)
+            reader = csv.DictReader(handle, dialect=dialect)
+            yield from _canonical_rows(source, list(reader.fieldnames or []), reader)
+    else:
+        raise ValueError(f"Unsupported supplier source '{source}'; use .csv or .parquet.")
+
+
+def _canonical_rows(
+    source: Path, columns: List[str], raw_rows: Iterable[Mapping[str, object]]
+) -> Iterator[Dict[str, Optional[str]]]:
+    lowered = {str(column).lower(): column for column in columns}
+    mapping: Dict[str, Optional[str]] = {}
+    for target, aliases in COLUMN_ALIASES.items():
+        mapping[target] = next((lowered[a] for a in aliases if a in lowered), None)
+    if mapping["name"] is None:
+        raise ValueError(f"No supplier name column found in {source}; saw {columns}.")
+
+    for position, raw in enumerate(raw_rows):
+        row: Dict[str, Optional[str]] = {}
+        for target, column in mapping.items():
+            value = raw.get(column) if column else None
+            # ``value != value`` filters pandas NaN for missing Parquet cells.
+            row[target] = None if value is None or value != value else str(value).strip()
+        row["supplier_id"] = row["supplier_id"] or str(position + 1)
+        yield row
+
+
+def _index_names(connection: sqlite3.Connection) -> None:
+    """(Re)create the trigram posting tables from ``suppliers.normalised_name``."""
+
+    postings: Dict[str, List[int]] = {}
+    for rowid, normalised in connection.execute("SELECT rowid, normalised_name FROM suppliers"):
+        for gram in trigrams(normalised):
+            postings.setdefault(gram, []).append(rowid)
+    with connection:
+        connection.executescript(
+            """
+            DROP TABLE IF EXISTS trigram_counts;
+            DROP TABLE IF EXISTS trigram_postings;
+            CREATE TABLE trigram_counts (
+                trigram TEXT PRIMARY KEY,
+                postings INTEGER NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TABLE trigram_postings (
+                trigram TEXT PRIMARY KEY,
+                rowids BLOB NOT NULL
+            );
+            """
+        )
+        connection.executemany(
+            "INSERT INTO trigram_counts VALUES (?, ?)",
+            ((gram, len(rowids)) for gram, rowids in postings.items()),
+        )
+        connection.executemany(
+            "INSERT INTO trigram_postings VALUES (?, ?)",
+            (
+                (gram, np.asarray(rowids, dtype=POSTING_DTYPE).tobytes())
+                for gram, rowids in postings.items()
+            ),
+        )
+
+
+def _placeholders(count: int) -> str:
+    return ", ".join("?" * count)
+
+
+class SupplierRegistry:
+    """SQLite-backed supplier master with a persisted trigram name index."""
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self._connection = connection
+        (self._size,) = connection.execute("SELECT COUNT(*) FROM suppliers").fetchone()
+
+    @classmethod
+    def build(cls, source: Path, db_path: Path = DEFAULT_REGISTRY_PATH) -> "SupplierRegistry":
+        """(Re)create the registry file from a CSV or Parquet supplier master.
+
+        Args:
+            source: Supplier master export.
+            db_path: Destination SQLite file; replaced if it exists.
+
+        Returns:
+            Opened registry.
+        """
+
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        if db_path.exists():
+            db_path.unlink()
+        connection = sqlite3.connect(db_path)
+        connection.executescript(
+            """
+            CREATE TABLE suppliers (
+                supplier_id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                normalised_name TEXT NOT NULL,
+                coc_number TEXT,
+                vat_number TEXT
+            );
+            """
+        )
+        rows = (
+            (
+                row["supplier_id"],
+                row["name"] or "",
+                normalise_name(row["name"] or ""),
+                normalise_coc(row["coc_number"]),
+                normalise_vat(row["vat_number"]),
+            )
+            for row in read_source_rows(source)
+        )
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO suppliers VALUES (?, ?, ?, ?, ?)", rows
+            )
+            connection.execute("CREATE INDEX idx_suppliers_coc ON suppliers (coc_number)")
+            connection.execute("CREATE INDEX idx_suppliers_vat ON suppliers (vat_number)")
+        _index_names(connection)
+        LOGGER.info("Built supplier registry %s from %s", db_path, source)
+        return cls(connection)
+
+    @classmethod
+    def open(cls, db_path: Path = DEFAULT_REGISTRY_PATH) -> "SupplierRegistry":
+        """Open an existing registry file read-only.
+
+        Registries built before the trigram tables existed are indexed in
+        place once.
+        """
+
+        if not db_path.exists():
+            raise FileNotFoundError(f"Supplier registry not found: {db_path}")
+        connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        indexed = connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'trigram_postings'"
+        ).fetchone()
+        if indexed is None:
+            connection.close()
+            LOGGER.info("Adding the trigram name index to %s", db_path)
+            writable = sqlite3.connect(db_path)
+            _index_names(writable)
+            writable.close()
+            connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        return cls(connection)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _fetch(self, column: str, value: str) -> Optional[Supplier]:
+        row = self._connection.execute(
+            "SELECT supplier_id, name, coc_number, vat_number FROM suppliers "
+            f"WHERE {column} = ? LIMIT 1",
+            (value,),
+        ).fetchone()
+        return Supplier(*row) if row else None
+
+    def by_coc(self, coc_number: Optional[str]) -> Optional[Supplier]:
+        """Exact lookup by KvK number."""
+
+        normalised = normalise_coc(coc_number)
+        return self._fetch("coc_number", normalised) if normalised else None
+
+    def by_vat(self, vat_number: Optional[str]) -> Optional[Supplier]:
+        """Exact lookup by VAT number."""
+
+        normalised = normalise_vat(vat_number)
+        return self._fetch("vat_number", normalised) if normalised else None
+
+    def search_name(self, name: str, limit: int = 5) -> List[SupplierMatch]:
+        """Fuzzy name search over the trigram index.
+
+        Only the rarest query trigrams are probed (very common ones such as
+        ``"ned"`` in *Nederland* would touch most of the table); the pooled
+        candidates are then re-scored with the Dice coefficient over all
+        trigrams.
+
+        Args:
+            name: Supplier name as extracted, possibly with OCR noise.
+            limit: Maximum number of matches returned.
+
+        Returns:
+            Matches sorted by descending score.
+        """
+
+        query = trigrams(normalise_name(name))
+        if not query or not self._size:
+            return []
+        lengths = dict(
+            self._connection.execute(
+                "SELECT trigram, postings FROM trigram_counts "
+                f"WHERE trigram IN ({_placeholders(len(query))})",
+                query,
+            )
+        )
+        common = max(50, int(self._size * MAX_POSTING_SHARE))
+        probes = sorted(lengths, key=lambda gram: (lengths[gram], gram))
+        selected = [g for g in probes if lengths[g] <= common][:MAX_PROBE_TRIGRAMS]
+        if len(selected) < MIN_PROBE_TRIGRAMS:
+            selected = probes[:MIN_PROBE_TRIGRAMS]
+        if not selected:
+            return []
+
+        blobs = dict(
+            self._connection.execute(
+                "SELECT trigram, rowids FROM trigram_postings "
+                f"WHERE trigram IN ({_placeholders(len(selected))})",
+                selected,
+            )
+        )
+        hits = np.frombuffer(b"".join(blobs[gram] for gram in selected), dtype=POSTING_DTYPE)
+        rowids, first, counts = np.unique(hits, return_index=True, return_counts=True)
+        # Ties go to the supplier seen first in the rarest posting lists.
+        pool = rowids[np.lexsort((first, -counts))[:CANDIDATE_POOL]].tolist()
+        rows = self._connection.execute(
+            "SELECT rowid, supplier_id, name, coc_number, vat_number, normalised_name "
+            f"FROM suppliers WHERE rowid IN ({_placeholders(len(pool))})",
+            pool,
+        ).fetchall()
+
+        scored: List[Tuple[float, int, Supplier]] = []
+        for rowid, *fields, normalised in rows:
+            scored.append((_dice(query, trigrams(normalised)), rowid, Supplier(*fields)))
+        scored.sort(key=lambda item: (-item[0], -item[1]))
+        return [
+            SupplierMatch(supplier, round(score, 3), "name")
+            for score, _, supplier in scored[:limit]
+        ]
+
+    def resolve(
+        self,
+        name: Optional[str] = None,
+        coc_number: Optional[str] = None,
+        vat_number: Optional[str] = None,
+    ) -> Optional[SupplierMatch]:
+        """Resolve a supplier, preferring exact IDs over the fuzzy name index.
+
+        Returns:
+            Best match, or ``None`` when nothing clears ``MIN_NAME_SCORE``.
+        """
+
+        supplier = self.by_coc(coc_number)
+        if supplier is not None:
+            return SupplierMatch(supplier, 1.0, "coc")
+        supplier = self.by_vat(vat_number)
+        if supplier is not None:
+            return SupplierMatch(supplier, 1.0, "vat")
+        if not name:
+            return None
+        matches = self.search_name(name, limit=1)
+        if matches and matches[0].score >= MIN_NAME_SCORE:
+            return matches[0]
+        return None
+
+    def resolve_record(self, record: Dict[str, Optional[str]]) -> Optional[SupplierMatch]:
+        """Resolve the supplier of an extracted ground-truth-schema record."""
+
+        return self.resolve(
+            name=record.get("supplier_name"),
+            coc_number=record.get("supplier_coc_number"),
+            vat_number=record.get("supplier_tax_number"),
+        )
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+
+        self._connection.close()
+
+
+def apply_registry(
+    record: Dict[str, Optional[str]], registry: SupplierRegistry
+) -> Optional[SupplierMatch]:
+    """Replace the record's supplier name with the registry's canonical name.
+
+    Missing CoC/VAT values are filled from the registry only for exact ID hits,
+    never from a fuzzy name match.
+    """
+
+    match = registry.resolve_record(record)
+    if match is None:
+        return None
+    record["supplier_name"] = match.supplier.name
+    if match.method in {"coc", "vat"}:
+        record["supplier_coc_number"] = record.get("supplier_coc_number") or match.supplier.coc_number
+        record["supplier_tax_number"] = record.get("supplier_tax_number") or match.supplier.vat_number
+    return match
+
+
+def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse CLI arguments for building and querying the registry."""
+
+    parser = argparse.ArgumentParser(description="Build or query the local supplier registry.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build = subparsers.add_parser("build", help="Load a CSV/Parquet supplier master.")
+    build.add_argument("source", type=Path, help="Supplier master (.csv or .parquet).")
+    build.add_argument("--registry", type=Path, default=DEFAULT_REGISTRY_PATH)
+
+    lookup = subparsers.add_parser("lookup", help="Resolve a supplier by ID or name.")
+    lookup.add_argument("--registry", type=Path, default=DEFAULT_REGISTRY_PATH)
+    lookup.add_argument("--name", default=None)
+    lookup.add_argument("--coc", default=None)
+    lookup.add_argument("--vat", default=None)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Application entry point."""
+
+    args = parse_arguments(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(message)s")
+    if args.command == "build":
+        registry = SupplierRegistry.build(args.source, args.registry)
+        LOGGER.info("Registry holds %d supplier(s).", len(registry))
+        registry.close()
+        return 0
+
+    registry = SupplierRegistry.open(args.registry)
+    match = registry.resolve(name=args.name, coc_number=args.coc, vat_number=args.vat)
+    registry.close()
+    if match is None:
+        print("No supplier found.")
+        return 1
+    print(
+        f"{match.supplier.name} | id={match.supplier.supplier_id} | "
+        f"coc={match.supplier.coc_number} | vat={match.supplier.vat_number} | "
+        f"method={match.method} | score={match.score}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,324 @@
+"""Configuration sweep over the main ``convert.py`` speed/accuracy knobs.
+
+Runs :func:`evaluate.evaluate` for every cell of a declared grid over the
+layout model (``LAYOUT_MODEL_MAP``), ``TableFormerMode``, OCR engine and PDF
+backend on a fixed labelled corpus, then prints a table of all cells and the
+Pareto frontier of throughput (pages/s, higher is better) against normalised
+field accuracy (higher is better) and peak worker memory (lower is better).
+
+* Each cell gets its own worker pool whose processes build the converter once
+  and keep it warm for every document of that cell.
+* Finished cells are cached in a JSON file keyed by the cell's flags, the
+  corpus and ground-truth hashes, the extraction rule-set version, a hash of
+  ``convert.py``, the installed Docling/torch/OCR package versions and the
+  worker count, so re-running an extended grid only evaluates new or
+  invalidated cells.
+
+Unrecognised flags are forwarded to every cell's ``convert.py`` options.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import itertools
+import json
+import logging
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from benchmarks import package_versions
+from dedupe import file_sha256
+from evaluate import (
+    DEFAULT_GROUND_TRUTH,
+    DEFAULT_INPUT_DIR,
+    evaluate,
+    labelled_inputs,
+    load_ground_truth,
+)
+from extract import ruleset_version
+
+BASE_DIR = Path(__file__).resolve().parent
+DEFAULT_CACHE_PATH = BASE_DIR / "output" / "sweep_cache.json"
+CONVERT_SOURCE = BASE_DIR / "convert.py"
+
+DEFAULT_GRID: Dict[str, List[str]] = {
+    "layout-model": ["docling_layout_v2", "docling_layout_heron", "docling_layout_egret_medium"],
+    "table-mode": ["fast", "accurate"],
+    "ocr-engine": ["easyocr", "rapidocr"],
+    "pdf-backend": ["docling_parse_v4", "pypdfium2"],
+}
+"""Knob values swept when no override is given; keys are ``convert.py`` flags."""
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class CellResult:
+    """Measured outcome of one grid cell."""
+
+    settings: Dict[str, str]
+    pages_per_second: float = 0.0
+    accuracy: float = 0.0
+    exact_accuracy: float = 0.0
+    peak_rss_mb: float = 0.0
+    p95_latency: float = 0.0
+    failures: int = 0
+    error: Optional[str] = None
+    cached: bool = False
+
+    @property
+    def usable(self) -> bool:
+        """Whether the cell ran and converted at least one page."""
+
+        return self.error is None and self.pages_per_second > 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable form (also the cache entry)."""
+
+        return {
+            "settings": self.settings,
+            "pages_per_second": self.pages_per_second,
+            "accuracy": self.accuracy,
+            "exact_accuracy": self.exact_accuracy,
+            "peak_rss_mb": self.peak_rss_mb,
+            "p95_latency": self.p95_latency,
+            "failures": self.failures,
+            "error": self.error,
+        }
+
+
+def grid_cells(grid: Dict[str, Sequence[str]]) -> List[Dict[str, str]]:
+    """Expand a ``{flag: values}`` grid into one settings dict per cell."""
+
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+
+
+def cell_argv(settings: Dict[str, str], common: Sequence[str]) -> List[str]:
+    """``convert.py`` arguments for one cell."""
+
+    argv = list(common)
+    for flag, value in settings.items():
+        argv.extend([f"--{flag}", value])
+    return argv
+
+
+def corpus_fingerprint(paths: Sequence[Path], ground_truth: Path) -> str:
+    """Hash of the corpus files, labels, extraction rules and conversion stack.
+
+    ``convert.py`` and the installed package versions are included so that a
+    Docling upgrade or a pipeline change re-evaluates every cell instead of
+    serving timings measured on the old code.
+    """
+
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(f"{path.name}:{file_sha256(path)}\n".encode("utf-8"))
+    digest.update(file_sha256(ground_truth).encode("utf-8"))
+    digest.update(ruleset_version().encode("utf-8"))
+    digest.update(file_sha256(CONVERT_SOURCE).encode("utf-8"))
+    digest.update(json.dumps(package_versions(), sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def cell_key(argv: Sequence[str], corpus: str, workers: int) -> str:
+    """Cache key of one cell."""
+
+    payload = json.dumps({"argv": list(argv), "corpus": corpus, "workers": workers})
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_cache(path: Path) -> Dict[str, Dict[str, Any]]:
+    """Load cached cell results."""
+
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def pareto_frontier(cells: Sequence[CellResult]) -> List[CellResult]:
+    """Cells not dominated on (throughput ↑, accuracy ↑, peak memory ↓)."""
+
+    usable = [cell for cell in cells if cell.usable]
+
+    def objectives(cell: CellResult) -> Tuple[float, float, float]:
+        return cell.pages_per_second, cell.accuracy, -cell.peak_rss_mb
+
+    frontier: List[CellResult] = []
+    for cell in usable:
+        mine = objectives(cell)
+        dominated = any(
+            all(o >= m for o, m in zip(objectives(other), mine))
+            and objectives(other) != mine
+            for other in usable
+            if other is not cell
+        )
+        if not dominated:
+            frontier.append(cell)
+    return sorted(frontier, key=lambda cell: -cell.pages_per_second)
+
+
+def run_sweep(
+    cells: Sequence[Dict[str, str]],
+    paths: Sequence[Path],
+    truth: Dict[str, Dict[str, Optional[str]]],
+    ground_truth: Path,
+    common_argv: Sequence[str],
+    workers: int,
+    cache_path: Path,
+    force: bool = False,
+) -> List[CellResult]:
+    """Evaluate every cell, reusing cached results for unchanged cells."""
+
+    cache = load_cache(cache_path)
+    corpus = corpus_fingerprint(paths, ground_truth)
+    results: List[CellResult] = []
+    for index, settings in enumerate(cells, start=1):
+        argv = cell_argv(settings, common_argv)
+        key = cell_key(argv, corpus, workers)
+        if not force and key in cache:
+            entry = dict(cache[key])
+            entry["settings"] = settings
+            results.append(CellResult(**entry, cached=True))
+            LOGGER.info("[%d/%d] cached %s", index, len(cells), settings)
+            continue
+
+        LOGGER.info("[%d/%d] evaluating %s", index, len(cells), settings)
+        try:
+            report = evaluate(paths, truth, workers, argv)
+        except Exception as exc:  # noqa: BLE001 -- e.g. OCR engine not installed
+            result = CellResult(settings, error=f"{type(exc).__name__}: {exc}")
+            LOGGER.error("Cell %s failed: %s", settings, result.error)
+        else:
+            result = CellResult(
+                settings,
+                pages_per_second=report.pages_per_second,
+                accuracy=report.overall_accuracy(normalised=True),
+                exact_accuracy=report.overall_accuracy(),
+                peak_rss_mb=report.peak_rss_mb,
+                p95_latency=report.latency_percentiles().get("p95", 0.0),
+                failures=report.failures,
+            )
+        results.append(result)
+        if result.error is not None:
+            continue  # retry failed cells next run, e.g. after installing an engine
+        cache[key] = result.to_dict()
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps(cache, indent=1), encoding="utf-8")
+    return results
+
+
+def format_table(results: Sequence[CellResult], frontier: Sequence[CellResult]) -> List[str]:
+    """Table of every cell, fastest first; Pareto cells are starred."""
+
+    names = list(DEFAULT_GRID)
+    header = "".join(f"{name:<30}" for name in names)
+    lines = [f"  {header}{'pages/s':>9}{'acc':>8}{'exact':>8}{'RSS MiB':>9}{'p95 s':>8}"]
+    on_frontier = {id(cell) for cell in frontier}
+    for cell in sorted(results, key=lambda item: -item.pages_per_second):
+        marker = "* " if id(cell) in on_frontier else "  "
+        knobs = "".join(f"{cell.settings.get(name, '-'):<30}" for name in names)
+        if cell.error is not None:
+            lines.append(f"{marker}{knobs}failed: {cell.error}")
+            continue
+        lines.append(
+            f"{marker}{knobs}{cell.pages_per_second:>9.2f}{cell.accuracy:>8.1%}"
+            f"{cell.exact_accuracy:>8.1%}{cell.peak_rss_mb:>9.0f}{cell.p95_latency:>8.2f}"
+            + (" (cached)" if cell.cached else "")
+        )
+    return lines
+
+
+def parse_arguments(
+    argv: Optional[Sequence[str]] = None,
+) -> Tuple[argparse.Namespace, List[str]]:
+    """Parse sweep flags; unknown flags are forwarded to every cell."""
+
+    parser = argparse.ArgumentParser(
+        description=(
+            "Sweep layout model, table mode, OCR engine and PDF backend over the "
+            "labelled corpus and report the throughput/accuracy/memory Pareto frontier."
+        )
+    )
+    for flag, values in DEFAULT_GRID.items():
+        parser.add_argument(
+            f"--{flag}",
+            dest=flag.replace("-", "_"),
+            nargs="+",
+            default=values,
+            help=f"Values to sweep for convert.py --{flag} (default: {' '.join(values)}).",
+        )
+    parser.add_argument(
+        "--ground-truth",
+        type=Path,
+        default=DEFAULT_GROUND_TRUTH,
+        help="Labelled records (default: Main/output/ground_truth_template.json).",
+    )
+    parser.add_argument(
+        "--input-dir",
+        type=Path,
+        default=DEFAULT_INPUT_DIR,
+        help="Directory with the labelled PDFs (default: Main/input).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=2,
+        help="Worker processes per cell (default: 2).",
+    )
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        default=DEFAULT_CACHE_PATH,
+        help="Cell result cache (default: Main/output/sweep_cache.json).",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-evaluate every cell, ignoring the cache.",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Write all cells and the Pareto frontier as JSON to this path.",
+    )
+    return parser.parse_known_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Application entry point."""
+
+    args, common_argv = parse_arguments(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(message)s")
+    truth = load_ground_truth(args.ground_truth)
+    paths = labelled_inputs(truth, args.input_dir, stored=False)
+    if not paths:
+        LOGGER.warning("No labelled inputs found in %s.", args.input_dir)
+        return 1
+
+    grid = {flag: getattr(args, flag.replace("-", "_")) for flag in DEFAULT_GRID}
+    cells = grid_cells(grid)
+    results = run_sweep(
+        cells, paths, truth, args.ground_truth, common_argv, args.workers, args.cache, args.force
+    )
+    frontier = pareto_frontier(results)
+
+    for line in format_table(results, frontier):
+        LOGGER.info("%s", line)
+    LOGGER.info("Pareto frontier: %d of %d cell(s) (marked *)", len(frontier), len(results))
+    if args.output:
+        payload = {
+            "cells": [cell.to_dict() for cell in results],
+            "pareto": [cell.to_dict() for cell in frontier],
+        }
+        args.output.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        LOGGER.info("Wrote sweep results to %s", args.output)
+    return 0 if any(cell.usable for cell in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,964 @@
+"""Synthetic invoice corpus generator for scale, load and accuracy testing.
+
+Real supplier invoices cannot be committed and ``Main/input`` only holds two
+samples, so this module renders any number of realistic invoice PDFs together
+with matching ground-truth records in the ``ground_truth_template.json``
+schema.
+
+* Two layout families mirror the samples: ``og`` (supplier block with KvK and
+  BTW numbers in the top-right corner, label/value header fields, bordered
+  line-item table, as in ``OG1.pdf``) and ``ef`` (address window, right-hand
+  header, period-based statement lines grouped per connection, registered
+  office/VAT/bank footer, as in ``EF1.pdf``).
+* Labels are Dutch or English; amounts use Dutch formatting in both.
+* KvK numbers have eight digits and Dutch VAT ids pass the eleven-test that
+  :func:`extract.validate_vat_number` applies; customers get their own VAT id
+  as a distractor.
+* Statements with many lines run over several pages.
+* Every document is written as a native text PDF by a small built-in PDF
+  writer (no reportlab needed), or, for the ``raster`` and ``scan``
+  variants, rasterised with Pillow (``scan`` adds skew, blur and noise) so
+  OCR paths get exercised.
+
+Documents are generated in parallel and are reproducible per ``--seed``::
+
+    python synthetic.py --count 2000 --output-dir output/synthetic
+    python evaluate.py --input-dir output/synthetic \\
+        --ground-truth output/synthetic/ground_truth.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import random
+import sys
+import textwrap
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+BASE_DIR = Path(__file__).resolve().parent
+DEFAULT_OUTPUT_DIR = BASE_DIR / "output" / "synthetic"
+GROUND_TRUTH_NAME = "ground_truth.json"
+
+PAGE_WIDTH = 595.0
+PAGE_HEIGHT = 842.0
+"""A4 in PDF points."""
+
+LAYOUTS = ("og", "ef")
+LANGUAGES = ("nl", "en")
+VARIANTS = ("text", "raster", "scan")
+DEFAULT_DPI = 150
+CHUNK_SIZE = 16
+
+LABELS: Dict[str, Dict[str, str]] = {
+    "nl": {
+        "invoice": "Factuur",
+        "invoice_number": "Factuurnummer:",
+        "invoice_date": "Factuurdatum:",
+        "due_date": "Vervaldatum:",
+        "customer_number": "Debiteurnummer:",
+        "payment_terms": "Betalingsconditie:",
+        "terms": "Op rekening: {} dagen",
+        "order_number": "Ordernummer:",
+        "bill_to": "Factuur naar:",
+        "coc": "KvK:",
+        "vat": "BTW nr.:",
+        "coc_long": "KvK-nummer",
+        "vat_long": "BTW-nummer",
+        "qty": "Aantal",
+        "code": "Artikelcode",
+        "description": "Omschrijving",
+        "unit_price": "Stukprijs",
+        "vat_rate": "BTW%",
+        "total": "Totaal",
+        "period": "Periode",
+        "amount": "Bedrag",
+        "subtotal": "Totaal excl. BTW",
+        "vat_amount": "BTW ({}%)",
+        "grand_total": "Totaal incl. BTW",
+        "page": "Pagina {} van {}",
+        "registered_office": "Statutair adres",
+        "bank": "Bank",
+        "mention": "Vermeld bij betaling altijd het factuurnummer.",
+        "continued": "Vervolg factuur {}",
+    },
+    "en": {
+        "invoice": "Invoice",
+        "invoice_number": "Invoice number:",
+        "invoice_date": "Invoice date:",
+        "due_date": "Payment due:",
+        "customer_number": "Debtor number:",
+        "payment_terms": "Payment terms:",
+        "terms": "On account: {} days",
+        "order_number": "Order number:",
+        "bill_to": "Invoice to:",
+        "coc": "CoC:",
+        "vat": "VAT no.:",
+        "coc_long": "Chamber of Commerce",
+        "vat_long": "VAT",
+        "qty": "Qty",
+        "code": "Item code",
+        "description": "Description",
+        "unit_price": "Unit price",
+        "vat_rate": "VAT%",
+        "total": "Total",
+        "period": "Period",
+        "amount": "Amount",
+        "subtotal": "Total excl. VAT",
+        "vat_amount": "VAT ({}%)",
+        "grand_total": "Total incl. VAT",
+        "page": "Page {} of {}",
+        "registered_office": "Registered Office",
+        "bank": "Bank",
+        "mention": "Please mention the invoice number on your payment slip.",
+        "continued": "Invoice {} (continued)",
+    },
+}
+
+_NAME_HEADS = (
+    "Noord", "Delta", "Vector", "Polder", "Zuid", "Rijn", "Hollands", "Euro", "Tulp",
+    "Kade", "Dijk", "Office", "Data", "Blauw", "Groen", "Lage Landen", "West", "Oost",
+)
+_NAME_TAILS = (
+    "tech", "fiber", "grip", "data", "logistiek", "print", "energie", "bouw", "net",
+    "soft", "link", "mark", "vision", "point", "line",
+)
+_NAME_KINDS = ("Hardware", "Nederland", "Services", "Solutions", "Groep", "ICT", "", "", "")
+_LEGAL_FORMS = ("B.V.", "BV", "B.V.", "N.V.")
+_STREETS = (
+    "Blauwhekken", "Safariweg", "Keizersgracht", "Stationsplein", "Industrieweg", "Gondel",
+    "Havenstraat", "Marconistraat", "Laan van Zuid", "Kanaalweg", "Energieweg", "Beursplein",
+)
+_CITIES = (
+    "Amsterdam", "Utrecht", "Rotterdam", "Maarssen", "Eindhoven", "Oud Gastel", "Zwolle",
+    "Groningen", "Breda", "Amstelveen", "Den Haag", "Nijmegen", "Arnhem", "Leiden",
+)
+_FIRST_NAMES = ("Marlon", "Sanne", "Daan", "Emma", "Lucas", "Fleur", "Jan", "Noor", "Thijs")
+_LAST_NAMES = ("de Beet", "Jansen", "de Vries", "Bakker", "Visser", "Smit", "Meijer", "Mulder")
+_BANKS = (("ING Bank", "INGB", "INGBNL2A"), ("ABN AMRO Bank", "ABNA", "ABNANL2A"),
+          ("Rabobank", "RABO", "RABONL2U"))
+_PRODUCTS: Dict[str, Tuple[Tuple[str, float, float], ...]] = {
+    "nl": (
+        ("HP ProBook 450 G10 Laptop i7 16GB 512SSD", 850.0, 1200.0),
+        ("Dell UltraSharp 27 inch monitor", 260.0, 420.0),
+        ("Logitech MX Keys toetsenbord", 80.0, 120.0),
+        ("3 jaar onsite hardwaresupport volgende werkdag", 60.0, 110.0),
+        ("USB-C dockingstation", 140.0, 230.0),
+        ("Installatie en configuratie per uur", 75.0, 95.0),
+        ("Microsoft 365 Business Standard licentie", 10.0, 14.0),
+        ("Verzendkosten", 7.5, 15.0),
+    ),
+    "en": (
+        ("HP ProBook 450 G10 Laptop i7 16GB 512SSD", 850.0, 1200.0),
+        ("Dell UltraSharp 27 inch monitor", 260.0, 420.0),
+        ("Logitech MX Keys keyboard", 80.0, 120.0),
+        ("3 year onsite hardware support next business day", 60.0, 110.0),
+        ("USB-C docking station", 140.0, 230.0),
+        ("Installation and configuration per hour", 75.0, 95.0),
+        ("Microsoft 365 Business Standard licence", 10.0, 14.0),
+        ("Shipping costs", 7.5, 15.0),
+    ),
+}
+_SERVICES: Dict[str, Tuple[str, ...]] = {
+    "nl": ("Lease fee actieve dienst", "IP Access Basic 1Gb/s", "IP Access Basic 200Mb/s",
+           "8 IPv4-adressen", "DDoS Basic", "Glasvezel verbinding", "Beheer en monitoring"),
+    "en": ("Lease fee", "IP Access Basic 1Gb/s", "IP Access Basic 200Mb/s", "8 IPv4 addresses",
+           "DDoS Basic", "Dark fiber connection", "Managed monitoring"),
+}
+
+LOGGER = logging.getLogger(__name__)
+
+
+# --------------------------------------------------------------------------
+# Invoice data
+# --------------------------------------------------------------------------
+
+
+@dataclass
+class Party:
+    """Supplier or customer details."""
+
+    name: str
+    street: str
+    postcode: str
+    city: str
+    vat: str
+    coc: str = ""
+    email: str = ""
+    contact: str = ""
+    iban: str = ""
+    bank: str = ""
+    bic: str = ""
+    phone: str = ""
+
+
+@dataclass
+class LineItem:
+    """One invoice line; ``period`` is set for statement-style lines."""
+
+    description: str
+    quantity: int
+    unit_price: float
+    vat_rate: int = 21
+    code: str = ""
+    period: str = ""
+    group: str = ""
+
+    @property
+    def total(self) -> float:
+        return round(self.quantity * self.unit_price, 2)
+
+
+@dataclass
+class InvoiceSpec:
+    """Everything needed to render one synthetic invoice."""
+
+    filename: str
+    layout: str
+    language: str
+    variant: str
+    supplier: Party
+    customer: Party
+    invoice_number: str
+    invoice_date: date
+    payment_days: int
+    customer_number: str
+    order_number: str
+    items: List[LineItem] = field(default_factory=list)
+
+    def ground_truth(self) -> Dict[str, Optional[str]]:
+        """Record in the ``ground_truth_template.json`` schema."""
+
+        return {
+            "filename": self.filename,
+            "supplier_name": self.supplier.name,
+            "supplier_coc_number": self.supplier.coc,
+            "supplier_tax_number": self.supplier.vat,
+            "invoice_number": self.invoice_number,
+        }
+
+
+def coc_number(rng: random.Random) -> str:
+    """Eight-digit KvK number."""
+
+    return f"{rng.randint(10_000_000, 99_999_999)}"
+
+
+def nl_vat_number(rng: random.Random) -> str:
+    """Dutch VAT id whose nine digits pass the eleven-test."""
+
+    while True:
+        digits = [rng.randint(0, 9) for _ in range(8)]
+        check = sum(d * w for d, w in zip(digits, range(9, 1, -1))) % 11
+        if check < 10 and digits[0]:
+            number = "".join(map(str, digits)) + str(check)
+            return f"NL{number}B{rng.randint(1, 3):02d}"
+
+
+def iban(rng: random.Random, bank_code: str) -> str:
+    """Dutch IBAN with a valid ISO 7064 check."""
+
+    account = f"{rng.randint(0, 9_999_999_999):010d}"
+    numeric = "".join(str(int(ch, 36)) for ch in f"{bank_code}{account}NL00")
+    check = 98 - int(numeric) % 97
+    return f"NL{check:02d}{bank_code}{account}"
+
+
+def company_name(rng: random.Random) -> str:
+    """Plausible Dutch company name with a legal form."""
+
+    head = rng.choice(_NAME_HEADS)
+    tail = rng.choice(_NAME_TAILS)
+    base = f"{head}{tail}" if " " not in head else f"{head} {tail.title()}"
+    kind = rng.choice(_NAME_KINDS)
+    parts = [base[0].upper() + base[1:]]
+    if kind:
+        parts.append(kind)
+    parts.append(rng.choice(_LEGAL_FORMS))
+    return " ".join(parts)
+
+
+def _postcode(rng: random.Random) -> str:
+    letters = "".join(rng.choice("ABCDEGHJKLMNPRSTVWXZ") for _ in range(2))
+    return f"{rng.randint(1000, 9999)} {letters}"
+
+
+def _party(rng: random.Random, name: str, supplier: bool) -> Party:
+    domain = "".join(ch for ch in name.split()[0].lower() if ch.isalnum()) + ".nl"
+    party = Party(
+        name=name,
+        street=f"{rng.choice(_STREETS)} {rng.randint(1, 240)}{rng.choice(['', '', 'a', 'b'])}",
+        postcode=_postcode(rng),
+        city=rng.choice(_CITIES),
+        vat=nl_vat_number(rng),
+        email=f"{'administratie' if supplier else 'crediteuren'}@{domain}",
+        contact=f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)}",
+    )
+    if supplier:
+        bank, code, bic = rng.choice(_BANKS)
+        party.coc = coc_number(rng)
+        party.iban = iban(rng, code)
+        party.bank = bank
+        party.bic = bic
+        party.phone = (
+            f"+31 (0){rng.randint(10, 99)} {rng.randint(100, 999)} {rng.randint(1000, 9999)}"
+        )
+    return party
+
+
+def invoice_number(rng: random.Random, issued: date) -> str:
+    """Invoice number in one of the common supplier styles."""
+
+    style = rng.randrange(4)
+    if style == 0:
+        return f"{rng.randint(100_000, 9_999_999)}"
+    if style == 1:
+        return f"{issued.year % 100}{rng.randint(100_000, 999_999)}"
+    if style == 2:
+        return f"INV-{issued.year}-{rng.randint(1, 99_999):05d}"
+    return f"F{issued.year}{rng.randint(1, 9_999):04d}"
+
+
+def _order_items(rng: random.Random, language: str, count: int) -> List[LineItem]:
+    items = []
+    for _ in range(count):
+        description, low, high = rng.choice(_PRODUCTS[language])
+        items.append(
+            LineItem(
+                description=description,
+                quantity=rng.randint(1, 12),
+                unit_price=round(rng.uniform(low, high), 2),
+                vat_rate=rng.choice((21, 21, 21, 9)),
+                code=f"{rng.randint(1, 9)}{rng.choice('ABCDEFGH')}{rng.randint(100, 999)}"
+                f"{rng.choice(['ET', 'AA', 'NL', ''])}",
+            )
+        )
+    return items
+
+
+def _statement_items(
+    rng: random.Random, language: str, count: int, issued: date
+) -> List[LineItem]:
+    start = issued.replace(day=1)
+    end = (start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    period = f"{start:%d-%m-%Y} - {end:%d-%m-%Y}"
+    items: List[LineItem] = []
+    group = ""
+    for index in range(count):
+        if index % rng.randint(3, 6) == 0 or not group:
+            group = (
+                f"{rng.randint(100_000, 999_999)}.001 - {rng.choice(_STREETS)} "
+                f"{rng.randint(1, 200)} {_postcode(rng).replace(' ', '')} "
+                f"{rng.choice(_CITIES).upper()}"
+            )
+        items.append(
+            LineItem(
+                description=rng.choice(_SERVICES[language]),
+                quantity=1,
+                unit_price=round(rng.uniform(5.0, 350.0), 2),
+                period=period,
+                group=group,
+            )
+        )
+    return items
+
+
+def make_invoice(
+    index: int,
+    seed: int,
+    multipage_share: float = 0.15,
+    raster_share: float = 0.1,
+    scan_share: float = 0.1,
+) -> InvoiceSpec:
+    """Draw one reproducible invoice from the generator's distributions."""
+
+    rng = random.Random(f"{seed}:{index}")
+    layout = rng.choice(LAYOUTS)
+    language = rng.choice(LANGUAGES)
+    draw = rng.random()
+    if draw < scan_share:
+        variant = "scan"
+    elif draw < scan_share + raster_share:
+        variant = "raster"
+    else:
+        variant = "text"
+    issued = date(2023, 1, 1) + timedelta(days=rng.randint(0, 700))
+    multipage = rng.random() < multipage_share
+    if layout == "og":
+        count = rng.randint(40, 90) if multipage else rng.randint(1, 8)
+        items = _order_items(rng, language, count)
+    else:
+        count = rng.randint(60, 140) if multipage else rng.randint(3, 14)
+        items = _statement_items(rng, language, count, issued)
+    return InvoiceSpec(
+        filename=f"SYN{index:06d}.pdf",
+        layout=layout,
+        language=language,
+        variant=variant,
+        supplier=_party(rng, company_name(rng), supplier=True),
+        customer=_party(rng, company_name(rng), supplier=False),
+        invoice_number=invoice_number(rng, issued),
+        invoice_date=issued,
+        payment_days=rng.choice((14, 21, 30)),
+        customer_number=f"{rng.randint(1000, 999_999)}",
+        order_number=f"{rng.randint(1_000_000, 9_999_999)}",
+        items=items,
+    )
+
+
+def money(value: float, symbol: bool = True) -> str:
+    """Dutch amount formatting: ``€ 1.234,56``."""
+
+    text = f"{value:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+    return f"€ {text}" if symbol else text
+
+
+# --------------------------------------------------------------------------
+# Page model and layouts
+# --------------------------------------------------------------------------
+
+_NARROW = set("iljtfr.,:;'|!() ")
+_WIDE = set("mwMW@%")
+
+
+def text_width(text: str, size: float, bold: bool = False) -> float:
+    """Approximate Helvetica advance width in points."""
+
+    units = 0.0
+    for char in text:
+        if char in _NARROW:
+            units += 0.28
+        elif char in _WIDE:
+            units += 0.85
+        elif char.isdigit() or char == "€":
+            units += 0.556
+        elif char.isupper():
+            units += 0.68
+        else:
+            units += 0.52
+    return units * size * (1.06 if bold else 1.0)
+
+
+@dataclass
+class Page:
+    """Drawing operations for one page, in points with a top-left origin.
+
+    Text ``y`` is the baseline.
+    """
+
+    ops: List[Tuple[Any, ...]] = field(default_factory=list)
+
+    def text(self, x: float, y: float, text: str, size: float = 8.5, bold: bool = False) -> None:
+        self.ops.append(("text", x, y, text, size, bold))
+
+    def text_right(
+        self, right: float, y: float, text: str, size: float = 8.5, bold: bool = False
+    ) -> None:
+        self.text(right - text_width(text, size, bold), y, text, size, bold)
+
+    def lines(
+        self, x: float, y: float, rows: Sequence[str], size: float = 8.5, leading: float = 11.0
+    ) -> float:
+        """Draw stacked lines and return the baseline below the block."""
+
+        for row in rows:
+            self.text(x, y, row, size)
+            y += leading
+        return y
+
+    def rule(self, x1: float, y1: float, x2: float, y2: float, width: float = 0.5) -> None:
+        self.ops.append(("line", x1, y1, x2, y2, width))
+
+    def box(self, x: float, y: float, w: float, h: float, gray: float = 0.9) -> None:
+        self.ops.append(("rect", x, y, w, h, gray))
+
+
+def _wrap(text: str, width: float, size: float) -> List[str]:
+    chars = max(8, int(width / (size * 0.5)))
+    return textwrap.wrap(text, chars) or [""]
+
+
+def _logo(page: Page, x: float, y: float, rng: random.Random) -> None:
+    page.box(x, y, 150, 26, gray=rng.choice((0.2, 0.35, 0.55)))
+
+
+def _totals(items: Sequence[LineItem]) -> Tuple[float, Dict[int, float], float]:
+    subtotal = round(sum(item.total for item in items), 2)
+    vat: Dict[int, float] = {}
+    for item in items:
+        vat[item.vat_rate] = vat.get(item.vat_rate, 0.0) + item.total * item.vat_rate / 100
+    vat = {rate: round(amount, 2) for rate, amount in vat.items()}
+    return subtotal, vat, round(subtotal + sum(vat.values()), 2)
+
+
+def _supplier_lines(spec: InvoiceSpec, labels: Dict[str, str]) -> List[str]:
+    s = spec.supplier
+    return [
+        s.name,
+        s.street,
+        f"{s.postcode.replace(' ', '')} {s.city} (NLD)",
+        s.phone,
+        s.email,
+        f"IBAN: {s.iban}",
+        f"BIC: {s.bic}",
+        f"Bank: {s.bank}",
+        f"{labels['coc']} {s.coc}",
+        f"{labels['vat']} {s.vat}",
+    ]
+
+
+def layout_og(spec: InvoiceSpec, rng: random.Random) -> List[Page]:
+    """OG1-style order invoice."""
+
+    labels = LABELS[spec.language]
+    c = spec.customer
+    pages: List[Page] = []
+    columns = (
+        (40, labels["qty"], 40),
+        (80, labels["code"], 75),
+        (155, labels["description"], 205),
+        (360, labels["unit_price"], 70),
+        (430, labels["vat_rate"], 45),
+        (475, labels["total"], 80),
+    )
+    row_height = 24.0
+
+    def new_page(first: bool) -> Tuple[Page, float]:
+        page = Page()
+        _logo(page, 40, 40, rng)
+        page.lines(430, 48, _supplier_lines(spec, labels), size=7.0, leading=9.0)
+        if first:
+            page.text(40, 150, labels["invoice"], size=16, bold=True)
+            page.text(40, 205, labels["bill_to"], size=9, bold=True)
+            page.lines(
+                40,
+                220,
+                [c.name, c.contact, c.street, f"{c.postcode.replace(' ', '')} {c.city}",
+                 "Nederland", c.email, c.vat],
+            )
+            due = spec.invoice_date + timedelta(days=spec.payment_days)
+            header = (
+                (labels["invoice_number"], spec.invoice_number),
+                (labels["invoice_date"], f"{spec.invoice_date.day}-{spec.invoice_date.month}-"
+                 f"{spec.invoice_date.year}"),
+                (labels["due_date"], f"{due.day}-{due.month}-{due.year}"),
+                (labels["customer_number"], spec.customer_number),
+                (labels["payment_terms"], labels["terms"].format(spec.payment_days)),
+                (labels["order_number"], spec.order_number),
+            )
+            y = 172.0
+            for label, value in header:
+                page.text(300, y, label)
+                page.text(385, y, value)
+                y += 12.5
+            top = 345.0
+        else:
+            page.text(40, 150, labels["continued"].format(spec.invoice_number), size=10, bold=True)
+            top = 175.0
+        page.box(35, top - 12, 525, 17)
+        for x, title, _ in columns:
+            page.text(x, top, title, bold=True)
+        page.rule(35, top + 6, 560, top + 6)
+        return page, top + 6 + row_height * 0.7
+
+    page, y = new_page(first=True)
+    pages.append(page)
+    for item in spec.items:
+        description = _wrap(item.description, columns[2][2], 8.5)
+        height = row_height * 0.55 + 10.5 * len(description)
+        if y + height > 700:
+            page, y = new_page(first=False)
+            pages.append(page)
+        page.text(columns[0][0], y, str(item.quantity))
+        page.text(columns[1][0], y, item.code)
+        page.lines(columns[2][0], y, description, leading=10.5)
+        page.text_right(420, y, money(item.unit_price))
+        page.text(columns[4][0], y, f"{item.vat_rate},00%")
+        page.text_right(555, y, money(item.total))
+        y += height
+        page.rule(35, y - 9, 560, y - 9, width=0.25)
+
+    subtotal, vat, total = _totals(spec.items)
+    if y + 70 > 760:
+        page, y = new_page(first=False)
+        pages.append(page)
+    y += 10
+    rows = [(labels["subtotal"], subtotal)]
+    rows += [(labels["vat_amount"].format(rate), amount) for rate, amount in sorted(vat.items())]
+    rows.append((labels["grand_total"], total))
+    for label, amount in rows:
+        page.text(360, y, label, bold=label == labels["grand_total"])
+        page.text_right(555, y, money(amount), bold=label == labels["grand_total"])
+        y += 13
+    return pages
+
+
+def layout_ef(spec: InvoiceSpec, rng: random.Random) -> List[Page]:
+    """EF1-style statement invoice with period lines grouped per connection."""
+
+    labels = LABELS[spec.language]
+    s, c = spec.supplier, spec.customer
+    pages: List[Page] = []
+
+    def footer(page: Page) -> None:
+        page.text(45, 742, labels["registered_office"], size=7.5, bold=True)
+        page.text(360, 742, labels["bank"], size=7.5, bold=True)
+        page.lines(45, 754, [s.name, s.street, f"{s.postcode} {s.city}", "The Netherlands"],
+                   size=7.0, leading=9.0)
+        page.lines(
+            170,
+            754,
+            [f"{labels['vat_long']} {s.vat}", f"{labels['coc_long']} {s.coc}",
+             f"E-mail {s.email.replace('administratie', 'debiteuren')}"],
+            size=7.0,
+            leading=9.0,
+        )
+        page.lines(360, 754, [s.bank, f"Swift code {s.bic}", f"IBAN {s.iban}"], size=7.0,
+                   leading=9.0)
+
+    def new_page(first: bool) -> Tuple[Page, float]:
+        page = Page()
+        _logo(page, 420, 25, rng)
+        if first:
+            page.lines(
+                55,
+                175,
+                [c.name, "T.a.v. " + c.contact, c.street, f"{c.postcode} {c.city.upper()}",
+                 "Netherlands"],
+                size=9.0,
+                leading=11.5,
+            )
+            page.text(415, 115, labels["invoice"], size=14, bold=True)
+            y = 155.0
+            for label, value in (
+                (labels["invoice_number"], spec.invoice_number),
+                (labels["invoice_date"], f"{spec.invoice_date:%d-%m-%Y}"),
+                (labels["customer_number"], spec.customer_number),
+            ):
+                page.text(415, y, label.rstrip(":"), size=7.5)
+                page.text(415, y + 10, value, size=8.5, bold=True)
+                y += 24
+            top = 300.0
+        else:
+            page.text(415, 115, labels["continued"].format(spec.invoice_number), size=9, bold=True)
+            top = 150.0
+        page.text(45, top, labels["description"], bold=True)
+        page.text(290, top, labels["period"], bold=True)
+        page.text_right(545, top, labels["amount"], bold=True)
+        page.rule(40, top + 5, 550, top + 5)
+        footer(page)
+        return page, top + 20
+
+    page, y = new_page(first=True)
+    pages.append(page)
+    group = None
+    for item in spec.items:
+        needed = 26.0 if item.group != group else 12.0
+        if y + needed > 680:
+            page, y = new_page(first=False)
+            pages.append(page)
+            group = None
+        if item.group != group:
+            group = item.group
+            page.text(45, y, group, bold=True)
+            y += 13
+        page.text(55, y, item.description)
+        page.text(290, y, item.period)
+        page.text_right(545, y, money(item.total, symbol=False))
+        y += 12
+
+    subtotal, vat, total = _totals(spec.items)
+    if y + 75 > 700:
+        page, y = new_page(first=False)
+        pages.append(page)
+    y += 14
+    page.text(45, y, labels["due_date"], size=8)
+    page.text(120, y, f"{spec.invoice_date + timedelta(days=spec.payment_days):%d-%m-%Y}")
+    page.text(45, y + 13, labels["mention"], size=7.5)
+    for label, amount in (
+        (labels["subtotal"], subtotal),
+        *((labels["vat_amount"].format(rate), value) for rate, value in sorted(vat.items())),
+        (labels["grand_total"], total),
+    ):
+        page.text(400, y, label, size=8)
+        page.text(485, y, "€", size=8)
+        page.text_right(545, y, money(amount, symbol=False), size=8)
+        y += 12
+    return pages
+
+
+def render_pages(spec: InvoiceSpec) -> List[Page]:
+    """Lay out an invoice and stamp page numbers."""
+
+    rng = random.Random(spec.filename)
+    pages = (layout_og if spec.layout == "og" else layout_ef)(spec, rng)
+    template = LABELS[spec.language]["page"]
+    for number, page in enumerate(pages, start=1):
+        page.text_right(555, 815, template.format(number, len(pages)), size=7)
+    return pages
+
+
+# --------------------------------------------------------------------------
+# Output backends
+# --------------------------------------------------------------------------
+
+
+def _pdf_string(text: str) -> bytes:
+    raw = text.encode("cp1252", errors="replace")
+    return b"(" + raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def _content_stream(page: Page) -> bytes:
+    chunks: List[bytes] = []
+    for op in page.ops:
+        kind = op[0]
+        if kind == "text":
+            _, x, y, text, size, bold = op
+            if not text:
+                continue
+            font = b"/F2" if bold else b"/F1"
+            chunks.append(
+                b"BT %s %.1f Tf %.2f %.2f Td %s Tj ET"
+                % (font, size, x, PAGE_HEIGHT - y, _pdf_string(text))
+            )
+        elif kind == "line":
+            _, x1, y1, x2, y2, width = op
+            chunks.append(
+                b"%.2f w %.2f %.2f m %.2f %.2f l S"
+                % (width, x1, PAGE_HEIGHT - y1, x2, PAGE_HEIGHT - y2)
+            )
+        elif kind == "rect":
+            _, x, y, w, h, gray = op
+            chunks.append(
+                b"%.2f g %.2f %.2f %.2f %.2f re f 0 g" % (gray, x, PAGE_HEIGHT - y - h, w, h)
+            )
+    return b"\n".join(chunks)
+
+
+def write_text_pdf(pages: Sequence[Page], path: Path, title: str = "") -> None:
+    """Write pages as a native-text PDF using the standard Helvetica fonts."""
+
+    objects: List[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # page tree, filled in below
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+        b"<< /Producer (IVT synthetic invoice generator) /Title %s >>" % _pdf_string(title),
+    ]
+    kids: List[bytes] = []
+    for page in pages:
+        content = zlib.compress(_content_stream(page))
+        objects.append(
+            b"<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream"
+            % (len(content), content)
+        )
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> >>"
+            % (PAGE_WIDTH, PAGE_HEIGHT, content_id)
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), len(kids))
+
+    output = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets: List[int] = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root 1 0 R /Info 5 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    path.write_bytes(bytes(output))
+
+
+@lru_cache(maxsize=64)
+def _font(pixels: int, bold: bool) -> Any:
+    from PIL import ImageFont
+
+    for name in (("DejaVuSans-Bold.ttf", "DejaVuSans.ttf") if bold else ("DejaVuSans.ttf",)):
+        try:
+            return ImageFont.truetype(name, pixels)
+        except OSError:
+            continue
+    return ImageFont.load_default(size=pixels)
+
+
+def rasterize(page: Page, dpi: int, scanned: bool, rng: random.Random) -> Any:
+    """Render a page to a grayscale Pillow image; ``scanned`` adds scan artefacts."""
+
+    from PIL import Image, ImageDraw, ImageFilter
+
+    scale = dpi / 72.0
+    image = Image.new("L", (int(PAGE_WIDTH * scale), int(PAGE_HEIGHT * scale)), 255)
+    draw = ImageDraw.Draw(image)
+    for op in page.ops:
+        kind = op[0]
+        if kind == "text":
+            _, x, y, text, size, bold = op
+            if text:
+                font = _font(round(size * scale), bold)
+                draw.text((x * scale, y * scale), text, fill=0, font=font, anchor="ls")
+        elif kind == "line":
+            _, x1, y1, x2, y2, width = op
+            draw.line((x1 * scale, y1 * scale, x2 * scale, y2 * scale), fill=0,
+                      width=max(1, round(width * scale)))
+        elif kind == "rect":
+            _, x, y, w, h, gray = op
+            draw.rectangle((x * scale, y * scale, (x + w) * scale, (y + h) * scale),
+                           fill=int(gray * 255))
+    if not scanned:
+        return image
+
+    import numpy as np
+
+    image = image.rotate(rng.uniform(-1.2, 1.2), resample=Image.BILINEAR, fillcolor=255)
+    image = image.filter(ImageFilter.GaussianBlur(rng.uniform(0.3, 0.8)))
+    pixels = np.asarray(image, dtype=np.float32)
+    noise = np.random.default_rng(rng.randrange(1 << 32)).normal(0, 9, pixels.shape)
+    return Image.fromarray(np.clip(pixels * 0.93 + 10 + noise, 0, 255).astype(np.uint8))
+
+
+def write_image_pdf(pages: Sequence[Page], path: Path, dpi: int, scanned: bool, seed: str) -> None:
+    """Write pages as an image-only PDF (no text layer)."""
+
+    rng = random.Random(seed)
+    images = [rasterize(page, dpi, scanned, rng) for page in pages]
+    images[0].save(
+        path, "PDF", save_all=True, append_images=images[1:], resolution=dpi, quality=80
+    )
+
+
+def generate_one(
+    index: int,
+    seed: int,
+    output_dir: Path,
+    dpi: int,
+    multipage_share: float,
+    raster_share: float,
+    scan_share: float,
+) -> Tuple[Dict[str, Optional[str]], Dict[str, Any]]:
+    """Worker: render invoice ``index`` and return its ground truth and metadata."""
+
+    spec = make_invoice(index, seed, multipage_share, raster_share, scan_share)
+    pages = render_pages(spec)
+    path = output_dir / spec.filename
+    if spec.variant == "text":
+        write_text_pdf(pages, path, title=f"{spec.supplier.name} {spec.invoice_number}")
+    else:
+        write_image_pdf(pages, path, dpi, spec.variant == "scan", spec.filename)
+    meta = {
+        "filename": spec.filename,
+        "layout": spec.layout,
+        "language": spec.language,
+        "variant": spec.variant,
+        "pages": len(pages),
+        "line_items": len(spec.items),
+    }
+    return spec.ground_truth(), meta
+
+
+def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse CLI arguments for corpus generation."""
+
+    parser = argparse.ArgumentParser(
+        description=(
+            "Render synthetic OG1/EF1-style invoice PDFs with matching ground truth "
+            "for throughput and accuracy benchmarks."
+        )
+    )
+    parser.add_argument("--count", type=int, default=100, help="Invoices to generate.")
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=DEFAULT_OUTPUT_DIR,
+        help="Destination directory (default: Main/output/synthetic).",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Corpus seed (default: 0).")
+    parser.add_argument("--start", type=int, default=0, help="First invoice index.")
+    parser.add_argument(
+        "--multipage-share",
+        type=float,
+        default=0.15,
+        help="Share of long multi-page invoices (default: 0.15).",
+    )
+    parser.add_argument(
+        "--raster-share",
+        type=float,
+        default=0.1,
+        help="Share of clean image-only PDFs (default: 0.1).",
+    )
+    parser.add_argument(
+        "--scan-share",
+        type=float,
+        default=0.1,
+        help="Share of scanned-looking image PDFs (default: 0.1).",
+    )
+    parser.add_argument(
+        "--dpi",
+        type=int,
+        default=DEFAULT_DPI,
+        help="Resolution of raster and scan variants (default: 150).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: CPU count).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Application entry point."""
+
+    args = parse_arguments(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(message)s")
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+
+    worker = partial(
+        generate_one,
+        seed=args.seed,
+        output_dir=args.output_dir,
+        dpi=args.dpi,
+        multipage_share=args.multipage_share,
+        raster_share=args.raster_share,
+        scan_share=args.scan_share,
+    )
+    records: List[Dict[str, Optional[str]]] = []
+    metadata: List[Dict[str, Any]] = []
+    indices = range(args.start, args.start + args.count)
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for record, meta in pool.map(worker, indices, chunksize=CHUNK_SIZE):
+            records.append(record)
+            metadata.append(meta)
+
+    (args.output_dir / GROUND_TRUTH_NAME).write_text(
+        json.dumps(records, indent=2, ensure_ascii=False), encoding="utf-8"
+    )
+    (args.output_dir / "corpus.json").write_text(json.dumps(metadata, indent=1), encoding="utf-8")
+    pages = sum(meta["pages"] for meta in metadata)
+    variants = {name: sum(meta["variant"] == name for meta in metadata) for name in VARIANTS}
+    LOGGER.info(
+        "Generated %d invoice(s), %d page(s) in %s | %s",
+        len(records),
+        pages,
+        args.output_dir,
+        ", ".join(f"{name}={count}" for name, count in variants.items()),
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+"""Tests for the regression check in ``benchmarks.py``."""
+
+from __future__ import annotations
+
+import pytest
+
+from benchmarks import THROUGHPUT_METRIC, compare_samples
+
+BASELINE = [1.00, 1.02, 0.98, 1.01, 0.99, 1.03]
+
+
+def regressed(metric, candidate):
+    (result,) = compare_samples({metric: BASELINE}, {metric: candidate})
+    return result.regressed
+
+
+def test_slower_latency_regresses():
+    assert regressed("latency", [value * 1.3 for value in BASELINE])
+
+
+@pytest.mark.parametrize(
+    "candidate",
+    [
+        [1.01, 0.99, 1.02, 1.00, 0.98, 1.03],
+        [value * 1.05 for value in BASELINE],
+        [value * 0.7 for value in BASELINE],
+    ],
+)
+def test_noise_and_small_changes_pass(candidate):
+    assert not regressed("latency", candidate)
+
+
+def test_lower_throughput_regresses():
+    assert regressed(THROUGHPUT_METRIC, [value * 0.7 for value in BASELINE])
+    assert not regressed(THROUGHPUT_METRIC, [value * 1.3 for value in BASELINE])
+
+
+def test_single_samples_are_not_tested():
+    assert compare_samples({"latency": [1.0]}, {"latency": [2.0]}) == []
@@ -0,0 +1,100 @@
+"""Tests for the confidence cascade in ``cascade.py``."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from cascade import DEFAULT_THRESHOLD, LLM_CONFIDENCE, ExtractionCascade, calibrate_thresholds
+from extract import GROUND_TRUTH_FIELDS, ExtractionResult
+
+
+class FakeLlm:
+    def __init__(self, answer):
+        self.answer = answer
+        self.calls = 0
+
+    def extract(self, doctags):
+        self.calls += 1
+        return dict(self.answer)
+
+
+def rule_result(filename, invoice_number, confidence):
+    fields = {name: None for name in GROUND_TRUTH_FIELDS}
+    fields["invoice_number"] = invoice_number
+    return ExtractionResult(filename, fields, {"invoice_number": confidence})
+
+
+def without_invoice_label(doctags):
+    return doctags.replace("Factuurnummer", "Nummer")
+
+
+def test_calibration_picks_lowest_precise_confidence():
+    truth = {name: {"invoice_number": "100"} for name in ("a", "b", "c", "d")}
+    results = [
+        rule_result("a", "100", 0.95),
+        rule_result("b", "100", 0.7),
+        rule_result("c", "999", 0.5),
+        rule_result("d", "100", 0.4),
+    ]
+
+    thresholds = calibrate_thresholds(results, truth)
+    assert thresholds["invoice_number"] == 0.7
+    assert thresholds["supplier_name"] == DEFAULT_THRESHOLD
+
+
+def test_confident_documents_stop_at_the_rules(doctags):
+    def reconverter(path):
+        raise AssertionError("rules were confident enough")
+
+    llm = FakeLlm({})
+    cascade = ExtractionCascade(reconverter=reconverter, llm=llm)
+    outcome = cascade.run("OG1.pdf", doctags["OG1"], source_pdf=Path("OG1.pdf"))
+
+    assert outcome.finished_tier == "rules"
+    assert llm.calls == 0
+    assert cascade.stats["rules"].hit_rate == 1.0
+
+
+def test_only_escalated_fields_are_replaced(doctags):
+    llm = FakeLlm({"invoice_number": "LLM-123", "supplier_coc_number": "00000000"})
+    cascade = ExtractionCascade(llm=llm)
+    outcome = cascade.run("OG1.pdf", without_invoice_label(doctags["OG1"]))
+
+    assert outcome.finished_tier == "llm"
+    assert outcome.result.fields["invoice_number"] == "LLM-123"
+    assert outcome.result.confidence["invoice_number"] == LLM_CONFIDENCE
+    assert outcome.result.fields["supplier_coc_number"] == "76906973"
+    assert outcome.field_tiers["supplier_coc_number"] == "rules"
+
+
+def test_invalid_llm_answers_are_rejected(doctags):
+    cascade = ExtractionCascade(llm=FakeLlm({"invoice_number": "22-01-2024"}))
+    outcome = cascade.run("OG1.pdf", without_invoice_label(doctags["OG1"]))
+
+    assert outcome.finished_tier == "unresolved"
+    assert outcome.result.fields["invoice_number"] is None
+
+
+@pytest.mark.parametrize("fails", [False, True])
+def test_reconversion_tier(fails, doctags):
+    def reconverter(path):
+        if fails:
+            raise RuntimeError("OCR crashed")
+        return doctags["OG1"]
+
+    llm = FakeLlm({"invoice_number": "6001631"})
+    cascade = ExtractionCascade(reconverter=reconverter, llm=llm)
+    outcome = cascade.run(
+        "OG1.pdf", without_invoice_label(doctags["OG1"]), source_pdf=Path("OG1.pdf")
+    )
+
+    assert cascade.stats["reconvert"].documents == 1
+    if fails:
+        assert outcome.finished_tier == "llm"
+        assert outcome.field_tiers["invoice_number"] == "llm"
+    else:
+        assert outcome.finished_tier == "reconvert"
+        assert outcome.field_tiers["invoice_number"] == "reconvert"
+        assert llm.calls == 0
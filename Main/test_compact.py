@@ -0,0 +1,53 @@
+"""Tests for the token-minimised DocTags in ``compact.py``."""
+
+from __future__ import annotations
+
+import pytest
+
+from compact import compact_doctags, compact_table, compact_with_report
+from conftest import SAMPLES
+from evaluate import FIELD_NORMALISERS
+from extract import GROUND_TRUTH_FIELDS, PAGE_BREAK, extract_fields
+
+
+@pytest.mark.parametrize("crop", [True, False])
+@pytest.mark.parametrize("stem", SAMPLES)
+def test_compacted_doctags_still_extract(stem, crop, doctags, ground_truth):
+    result = extract_fields(compact_doctags(doctags[stem], crop=crop), f"{stem}.pdf")
+
+    for name in GROUND_TRUTH_FIELDS:
+        normalise = FIELD_NORMALISERS[name]
+        assert normalise(result.fields[name]) == normalise(ground_truth[stem][name]), name
+
+
+@pytest.mark.parametrize("stem", SAMPLES)
+def test_compaction_reduces_tokens_and_keeps_pages(stem, doctags):
+    compacted, report = compact_with_report(doctags[stem], f"{stem}.pdf")
+
+    assert report.compact_tokens < report.original_tokens
+    assert report.ratio > 2
+    assert "<picture>" not in compacted
+    assert compacted.count(PAGE_BREAK) == doctags[stem].count(PAGE_BREAK)
+
+
+def test_table_keeps_value_columns():
+    body = (
+        "<ched>Item<ched>Qty<ched>Price<nl>"
+        "<ecel><ecel><ecel><nl>"
+        "<ecel><lcel><fcel>262,26<ecel><nl>"
+    )
+
+    assert compact_table(body) == "<ched>Item<ched>Qty<ched>Price<nl><ecel><ecel><fcel>262,26<nl>"
+
+
+def test_empty_pages_keep_their_page_breaks():
+    doctags = (
+        "<doctag><text><loc_10><loc_10><loc_90><loc_20>KvK: 34134377</text>"
+        f"{PAGE_BREAK}<picture><loc_1><loc_1><loc_9><loc_9></picture>"
+        f"{PAGE_BREAK}<text><loc_10><loc_10><loc_90><loc_20>BTW nr. NL808851524B01</text>"
+        "</doctag>"
+    )
+
+    compacted = compact_doctags(doctags)
+    assert compacted.count(PAGE_BREAK) == 2
+    assert extract_fields(compacted).matches["supplier_tax_number"].page_no == 3
@@ -0,0 +1,32 @@
+"""Tests for duplicate-input detection in ``dedupe.py``."""
+
+from __future__ import annotations
+
+from dedupe import group_duplicates, link_file
+
+
+def test_group_duplicates_by_content(tmp_path):
+    first = tmp_path / "a.pdf"
+    copy = tmp_path / "b.pdf"
+    other = tmp_path / "c.pdf"
+    first.write_bytes(b"%PDF-1.4 same")
+    copy.write_bytes(b"%PDF-1.4 same")
+    other.write_bytes(b"%PDF-1.4 other")
+
+    groups = group_duplicates([first, copy, other])
+    assert [group.canonical for group in groups] == [first, other]
+    assert groups[0].duplicates == [copy]
+    assert groups[1].members == []
+    assert len(group_duplicates([first, copy, other], mode="off")) == 3
+
+
+def test_link_file_replaces_stale_destination(tmp_path):
+    source = tmp_path / "a.doctags.txt"
+    destination = tmp_path / "b.doctags.txt"
+    source.write_text("current", encoding="utf-8")
+    destination.write_text("stale", encoding="utf-8")
+
+    link_file(source, destination)
+    assert destination.read_text(encoding="utf-8") == "current"
+    link_file(source, destination)
+    assert destination.samefile(source)
@@ -0,0 +1,45 @@
+"""Tests for the lazy DoclingDocument JSON loader in ``document_json.py``."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from conftest import DOCTAGS_DIR, SAMPLES
+from document_json import LazyDocument, docling_json_paths, is_docling_json, load_document
+from extract import extract_document, extract_fields, parse_document
+
+
+@pytest.mark.parametrize("stem", SAMPLES)
+def test_lazy_extraction_matches_doctags_extraction(stem, doctags):
+    lazy = extract_document(load_document(DOCTAGS_DIR / f"{stem}.json"), f"{stem}.pdf")
+    expected = extract_fields(doctags[stem], f"{stem}.pdf")
+    assert lazy.fields == expected.fields
+    assert lazy.confidence == expected.confidence
+
+
+@pytest.mark.parametrize("stem", SAMPLES)
+def test_lazy_document_parses_like_the_validated_model(stem):
+    path = DOCTAGS_DIR / f"{stem}.json"
+    assert parse_document(load_document(path)) == parse_document(
+        load_document(path, validate=True)
+    )
+
+
+def test_resolve_follows_refs():
+    document = LazyDocument(
+        {"texts": [{"self_ref": "#/texts/0", "text": "Factuur"}], "body": {"children": []}}
+    )
+    assert document.resolve("#/texts/0")["text"] == "Factuur"
+    assert document.texts[0].text == "Factuur"
+    with pytest.raises(AttributeError):
+        document.missing
+
+
+def test_only_docling_json_is_picked_up(tmp_path):
+    (tmp_path / "memory_summary.json").write_text(json.dumps({"peak": 1}), encoding="utf-8")
+    stored = tmp_path / "EF1.json"
+    stored.write_bytes((DOCTAGS_DIR / "EF1.json").read_bytes())
+    assert not is_docling_json(tmp_path / "memory_summary.json")
+    assert docling_json_paths(tmp_path) == [stored]
@@ -0,0 +1,58 @@
+"""Tests for accuracy scoring in ``evaluate.py``."""
+
+from __future__ import annotations
+
+import pytest
+
+from conftest import DOCTAGS_DIR, SAMPLES
+from evaluate import DocumentOutcome, evaluate, score_outcomes
+
+
+def outcome(filename, record, latency=1.0, pages=1, error=None):
+    return DocumentOutcome(filename, record, latency, pages, error)
+
+
+def test_normalised_match_folds_formatting_but_not_wrong_values(ground_truth):
+    truth = {"EF1.pdf": ground_truth["EF1"]}
+    record = {
+        **ground_truth["EF1"],
+        "supplier_name": "EUROFIBER  Nederland B.V.",
+        "invoice_number": "24500465",
+    }
+    report = score_outcomes([outcome("EF1.pdf", record)], truth, wall_time=2.0)
+
+    name, invoice = report.fields["supplier_name"], report.fields["invoice_number"]
+    assert (name.exact, name.normalised) == (0, 1)
+    assert (invoice.exact, invoice.normalised) == (0, 0)
+    assert report.mismatches == [
+        {
+            "filename": "EF1.pdf",
+            "field": "invoice_number",
+            "expected": "24500464",
+            "got": "24500465",
+        }
+    ]
+    assert report.overall_accuracy(normalised=True) == pytest.approx(0.75)
+
+
+def test_failures_count_as_misses_and_throughput_uses_wall_time(ground_truth):
+    truth = {f"{stem}.pdf": ground_truth[stem] for stem in SAMPLES}
+    outcomes = [
+        outcome("EF1.pdf", ground_truth["EF1"], latency=1.0, pages=2),
+        outcome("OG1.pdf", None, latency=3.0, pages=0, error="RuntimeError: boom"),
+    ]
+    report = score_outcomes(outcomes, truth, wall_time=4.0)
+
+    assert report.failures == 1
+    assert report.overall_accuracy() == pytest.approx(0.5)
+    assert report.pages_per_second == pytest.approx(0.5)
+    assert report.latency_percentiles()["max"] == 3.0
+
+
+def test_stored_outputs_score_perfectly(ground_truth):
+    truth = {f"{stem}.pdf": ground_truth[stem] for stem in SAMPLES}
+    paths = [DOCTAGS_DIR / f"{stem}.doctags.txt" for stem in SAMPLES]
+    report = evaluate(paths, truth, workers=1, stored=True)
+
+    assert report.failures == 0
+    assert report.overall_accuracy(normalised=True) == 1.0
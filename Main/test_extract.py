@@ -0,0 +1,59 @@
+"""Tests for the rule-based field extraction in ``extract.py``."""
+
+from __future__ import annotations
+
+import pytest
+
+from conftest import SAMPLES
+from evaluate import FIELD_NORMALISERS
+from extract import (
+    FIELD_SPECS,
+    GROUND_TRUTH_FIELDS,
+    extract_batch,
+    extract_fields,
+    find_all_keys,
+    find_keys,
+    parse_doctags,
+)
+
+
+@pytest.mark.parametrize("stem", SAMPLES)
+def test_samples_match_ground_truth(stem, doctags, ground_truth):
+    result = extract_fields(doctags[stem], f"{stem}.pdf")
+
+    for name in GROUND_TRUTH_FIELDS:
+        normalise = FIELD_NORMALISERS[name]
+        assert normalise(result.fields[name]) == normalise(ground_truth[stem][name]), name
+        assert result.confidence[name] > 0.0
+
+
+@pytest.mark.parametrize("stem", SAMPLES)
+def test_combined_key_scan_matches_per_field_scans(stem, doctags):
+    elements = parse_doctags(doctags[stem])
+
+    assert find_all_keys(elements) == [find_keys(elements, spec) for spec in FIELD_SPECS]
+
+
+def test_customer_labels_are_not_keys():
+    elements = parse_doctags(
+        "<doctag><text><loc_10><loc_10><loc_200><loc_20>Customer VAT: NL001</text>"
+        "<text><loc_10><loc_30><loc_200><loc_40>VAT: NL002</text></doctag>"
+    )
+
+    row = [spec.name for spec in FIELD_SPECS].index("supplier_tax_number")
+    assert [key.element for key in find_all_keys(elements)[row]] == [1]
+
+
+def test_batch_matches_single_document_extraction(doctags):
+    batch = extract_batch((f"{stem}.pdf", doctags[stem]) for stem in SAMPLES)
+
+    assert [result.fields for result in batch] == [
+        extract_fields(doctags[stem]).fields for stem in SAMPLES
+    ]
+
+
+def test_max_pages_limits_parsing(doctags):
+    elements = parse_doctags(doctags["EF1"], max_pages=1)
+
+    assert elements
+    assert {element.page_no for element in elements} == {1}
@@ -0,0 +1,92 @@
+"""Tests for the layout fingerprint fast path in ``fingerprint.py``."""
+
+from __future__ import annotations
+
+import pytest
+
+from conftest import SAMPLES
+from extract import extract_fields
+from fingerprint import (
+    FingerprintIndex,
+    extract_with_zones,
+    first_page_doctags,
+    layout_signature,
+)
+
+
+def test_learn_then_hit(tmp_path, doctags):
+    index = FingerprintIndex(tmp_path / "fingerprints.json")
+    first = index.extract(doctags["EF1"], "EF1.pdf")
+    assert index.stats["learned"] == 1
+    index.save()
+
+    reloaded = FingerprintIndex.load(tmp_path / "fingerprints.json")
+    second = reloaded.extract(doctags["EF1"], "EF1.pdf")
+    assert second.method == "fingerprint"
+    assert second.fields == first.fields
+    assert reloaded.stats["fast"] == 1
+
+
+def test_hits_do_not_rewrite_the_index(tmp_path, doctags):
+    path = tmp_path / "fingerprints.json"
+    index = FingerprintIndex(path)
+    index.extract(doctags["OG1"], "OG1.pdf")
+    index.save()
+    mtime = path.stat().st_mtime_ns
+
+    index.extract(doctags["OG1"], "OG1.pdf")
+    index.save()
+    assert path.stat().st_mtime_ns == mtime
+
+
+def test_invalid_zone_value_is_rejected(doctags):
+    index = FingerprintIndex()
+    index.extract(doctags["EF1"], "EF1.pdf")
+
+    result = index.extract(doctags["EF1"].replace("24500464", "ABC"), "EF1.pdf")
+    assert result.method != "fingerprint"
+    assert index.stats["rejected"] == 1
+    assert index.templates == {}
+
+
+@pytest.mark.parametrize("stem", SAMPLES)
+def test_uncached_supplier_name_falls_back_to_extractor(stem, doctags):
+    index = FingerprintIndex()
+    index.extract(doctags[stem], f"{stem}.pdf")
+    (template,) = index.templates.values()
+    template.supplier_name = None
+
+    result = index.extract(doctags[stem], f"{stem}.pdf")
+    assert result.method == "fingerprint"
+    assert result.fields == extract_fields(doctags[stem]).fields
+    assert result.confidence["supplier_name"] > 0.0
+
+
+def test_zone_hit_without_name_leaves_it_empty(doctags):
+    index = FingerprintIndex()
+    index.extract(doctags["OG1"], "OG1.pdf")
+    (template,) = index.templates.values()
+    template.supplier_name = None
+
+    result = extract_with_zones(first_page_doctags(doctags["OG1"]), template, "OG1.pdf")
+    assert result is not None
+    assert result.fields["supplier_name"] is None
+
+
+def test_later_pages_do_not_change_the_fingerprint(doctags):
+    index = FingerprintIndex()
+    index.extract(doctags["EF1"], "EF1.pdf")
+    extra_page = "<page_break><title><loc_10><loc_10><loc_90><loc_20>Annex</title>"
+
+    result = index.extract(doctags["EF1"].replace("</doctag>", extra_page + "</doctag>"))
+    assert result.method == "fingerprint"
+
+
+def test_pages_without_headers_or_pictures_are_not_cached():
+    doctags = "<doctag><text><loc_10><loc_10><loc_90><loc_20>KvK 34134377</text></doctag>"
+    index = FingerprintIndex()
+    index.extract(doctags, "plain.pdf")
+
+    assert not layout_signature(doctags)
+    assert index.templates == {}
+    assert index.stats["full"] == 1
@@ -0,0 +1,81 @@
+"""Tests for OTSL line-item extraction in ``line_items.py``."""
+
+from __future__ import annotations
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from conftest import SAMPLES
+from line_items import (
+    LINE_ITEM_SCHEMA,
+    LineItemWriter,
+    line_items,
+    parse_dutch_decimals,
+    parse_percentages,
+    tables_from_doctags,
+    tables_from_json,
+    to_table_frame,
+)
+
+
+def items_for(stem, doctags):
+    return line_items(to_table_frame(tables_from_doctags(f"{stem}.pdf", doctags[stem])))
+
+
+def test_value_parsers():
+    decimals = parse_dutch_decimals(pd.Series(["€ 2.877,12", "262,26", "-15", "n.v.t."]))
+    assert decimals.tolist()[:3] == [2877.12, 262.26, -15.0]
+    assert pd.isna(decimals.iloc[3])
+    assert parse_percentages(pd.Series(["21,00%", "9 %"])).tolist() == [21.0, 9.0]
+
+
+def test_ef1_items_add_up_to_the_total(doctags):
+    items = items_for("EF1", doctags)
+    billed = items[~items["is_total"]]
+    totals = items[items["is_total"]].set_index("description")["amount"]
+
+    assert billed["amount"].sum() == pytest.approx(totals["Total excl. VAT"])
+    assert billed["section"].str.startswith(("363470.001", "349379.001")).all()
+    assert (billed["period_start"] == pd.Timestamp("2024-01-01")).all()
+    assert (billed["period_end"] == pd.Timestamp("2024-01-31")).all()
+    assert "Lease fee" in billed["description"].tolist()
+
+
+def test_og1_quantities_and_prices(doctags):
+    items = items_for("OG1", doctags)
+    billed = items[~items["is_total"]]
+    priced = billed.dropna(subset=["quantity", "unit_price"])
+
+    assert len(priced) == 2
+    assert (priced["quantity"] * priced["unit_price"]).tolist() == pytest.approx(
+        priced["amount"].tolist(), rel=1e-4
+    )
+    assert priced["vat_rate"].tolist() == [21.0, 21.0]
+    total = items.loc[items["description"] == "Totaal (incl. BTW)", "amount"].item()
+    assert billed["amount"].sum() * 1.21 == pytest.approx(total, abs=0.01)
+
+
+def test_batch_matches_per_document_decoding(doctags):
+    tables = [t for stem in SAMPLES for t in tables_from_doctags(f"{stem}.pdf", doctags[stem])]
+    batch = line_items(to_table_frame(tables))
+    single = pd.concat([items_for(stem, doctags) for stem in SAMPLES], ignore_index=True)
+
+    # OG1 has no sections; concatenating per-document frames turns them into None.
+    for frame in (batch, single):
+        frame["section"] = frame["section"].fillna("")
+    pd.testing.assert_frame_equal(batch, single, check_dtype=False)
+
+
+def test_json_tables_and_parquet_writer(tmp_path, doctags):
+    (_, _, otsl), *_ = tables_from_doctags("OG1.pdf", doctags["OG1"])
+    payload = {"tables": [{"data": {"otsl_seq": otsl}}, {"data": {}}]}
+    items = line_items(to_table_frame(tables_from_json("OG1.pdf", payload)))
+
+    path = tmp_path / "line_items.parquet"
+    with LineItemWriter(path) as writer:
+        writer.write(items)
+        writer.write(items.iloc[0:0])
+    table = pq.read_table(path)
+    assert table.schema.equals(LINE_ITEM_SCHEMA)
+    assert table.num_rows == writer.rows == len(items)
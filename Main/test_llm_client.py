@@ -0,0 +1,117 @@
+"""Tests for the LLM extraction clients in ``llm_client.py``."""
+
+from __future__ import annotations
+
+import pytest
+
+import llm_client
+from llm_client import (
+    DOCUMENT_HEADER,
+    BatchLlmClient,
+    ResponseCache,
+    StandInLlmClient,
+    format_response,
+    parse_batch_response,
+    parse_response,
+    render_batch,
+    split_batch,
+)
+
+ANSWER = {
+    "supplier_name": "Officegrip Hardware B.V.",
+    "supplier_coc_number": "76906973",
+    "supplier_tax_number": "NL860835315B01",
+    "invoice_number": "6001631",
+}
+
+
+class ScriptedClient(BatchLlmClient):
+    """Answers every document with its payload as invoice number."""
+
+    def __init__(self, broken=(), malformed_first=0, skip=(), **kwargs):
+        super().__init__(prompt="Extract the fields.", **kwargs)
+        self.broken = set(broken)
+        self.malformed_left = malformed_first
+        self.skip = set(skip)
+        self.sent = []
+
+    def _post(self, system, user):
+        self.sent.append(user)
+        if self.malformed_left:
+            self.malformed_left -= 1
+            raise KeyError("choices")
+        sections = split_batch(user)
+        if self.broken & set(sections.values()):
+            raise ValueError("unparseable body")
+        if len(sections) == 1:
+            return format_response({**ANSWER, "invoice_number": sections[1]})
+        return "\n\n".join(
+            f"{DOCUMENT_HEADER.format(number)}\n"
+            + format_response({**ANSWER, "invoice_number": payload})
+            for number, payload in sections.items()
+            if payload not in self.skip
+        )
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(llm_client, "RETRY_BACKOFF", 0)
+
+
+def test_parse_response_handles_markdown_and_placeholders():
+    fields = parse_response(
+        "**Supplier name**: [Officegrip Hardware B.V.]\n"
+        "Supplier tax id: N/A\n"
+        "Invoice number: 6001631\n"
+        "Remark: ignored"
+    )
+
+    assert fields["supplier_name"] == "Officegrip Hardware B.V."
+    assert fields["supplier_tax_number"] is None
+    assert fields["supplier_coc_number"] is None
+    assert fields["invoice_number"] == "6001631"
+    assert parse_response(format_response(ANSWER)) == ANSWER
+
+
+def test_batch_round_trip():
+    text = render_batch([format_response(ANSWER), format_response({})])
+
+    assert sorted(split_batch(text)) == [1, 2]
+    first, second, missing = parse_batch_response(text, 3)
+    assert first == ANSWER
+    assert set(second.values()) == {None}
+    assert missing is None
+
+
+def test_malformed_responses_are_retried():
+    client = ScriptedClient(malformed_first=2, retries=3)
+
+    assert client.extract("A1")["invoice_number"] == "A1"
+    assert (client.stats.requests, client.stats.retries, client.stats.failures) == (3, 2, 0)
+
+
+def test_failed_batch_does_not_affect_others(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite")
+    client = ScriptedClient(broken={"B2"}, batch_size=2, concurrency=2, retries=1, cache=cache)
+
+    results = client.extract_many(["A1", "A2", "B1", "B2"])
+    assert [fields["invoice_number"] for fields in results] == ["A1", "A2", None, None]
+    assert client.stats.failures == 1
+
+    retry = ScriptedClient(batch_size=2, cache=cache)
+    assert [f["invoice_number"] for f in retry.extract_many(["A1", "B2"])] == ["A1", "B2"]
+    assert retry.stats.cache_hits == 1
+    assert retry.sent == [render_batch(["B2"])]
+    cache.close()
+
+
+def test_documents_missing_from_a_batch_are_asked_again():
+    client = ScriptedClient(skip={"A2"}, batch_size=3)
+
+    results = client.extract_many(["A1", "A2", "A3"])
+    assert [fields["invoice_number"] for fields in results] == ["A1", "A2", "A3"]
+    assert client.sent[1:] == [render_batch(["A2"])]
+
+
+def test_stand_in_client_answers_from_rules(doctags):
+    assert StandInLlmClient().extract(doctags["OG1"]) == ANSWER
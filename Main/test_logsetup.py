@@ -0,0 +1,63 @@
+"""Tests for the queued logging set-up in ``logsetup.py``."""
+
+from __future__ import annotations
+
+import io
+import logging
+
+import pytest
+
+from logsetup import close_logger, parse_levels, snapshot_logger, start_logging, stop_logging
+
+
+@pytest.fixture
+def restore_logging():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    named = {name: logging.getLogger(name).level for name in ("docling", "convert")}
+    yield
+    stop_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+    for name, previous in named.items():
+        logging.getLogger(name).setLevel(previous)
+
+
+def test_parse_levels():
+    assert parse_levels(["docling=warning", "root=DEBUG", "=ERROR"]) == {
+        "docling": logging.WARNING,
+        "": logging.ERROR,
+    }
+    for spec in ("docling", "docling=LOUD"):
+        with pytest.raises(ValueError):
+            parse_levels([spec])
+
+
+def test_records_reach_the_file_and_levels_filter(tmp_path, restore_logging):
+    log_path = tmp_path / "convert.log"
+    log_path.write_text("previous run\n", encoding="utf-8")
+    console = io.StringIO()
+    start_logging(
+        log_path, parse_levels(["docling=WARNING"]), console_handler=logging.StreamHandler(console)
+    )
+
+    logging.getLogger("convert").info("converted EF1.pdf")
+    logging.getLogger("docling").info("per-document noise")
+    logging.getLogger("docling").warning("model fallback")
+    stop_logging()
+
+    text = log_path.read_text(encoding="utf-8")
+    assert "converted EF1.pdf" in text and "model fallback" in text
+    assert "per-document noise" not in text
+    assert (tmp_path / "convert.log.1").read_text(encoding="utf-8") == "previous run\n"
+    assert "converted EF1.pdf" in console.getvalue()
+
+
+def test_snapshot_logger_writes_only_its_own_file(tmp_path):
+    path = tmp_path / "configuration.log"
+    logger = snapshot_logger(path)
+    logger.info("table_mode=accurate")
+    close_logger(logger)
+    assert logger.handlers == []
+    assert path.read_text(encoding="utf-8").rstrip().endswith("table_mode=accurate")
+    assert not logger.propagate
@@ -0,0 +1,33 @@
+"""Tests for skip-unchanged output writes in ``manifest.py``."""
+
+from __future__ import annotations
+
+import json
+
+from manifest import MANIFEST_NAME, OutputManifest, WriteStats, write_if_changed
+
+
+def test_unchanged_payload_is_skipped(tmp_path):
+    destination = tmp_path / "EF1.doctags.txt"
+    stats = WriteStats()
+    assert write_if_changed(destination, "<doctag>a</doctag>", stats=stats)
+    mtime = destination.stat().st_mtime_ns
+    assert not write_if_changed(destination, "<doctag>a</doctag>", stats=stats)
+    assert destination.stat().st_mtime_ns == mtime
+    assert write_if_changed(destination, "<doctag>b</doctag>", stats=stats)
+    assert destination.read_text(encoding="utf-8") == "<doctag>b</doctag>"
+    assert (stats.written, stats.skipped) == (2, 1)
+
+
+def test_manifest_records_and_detects_external_edits(tmp_path):
+    destination = tmp_path / "EF1.json"
+    manifest = OutputManifest(tmp_path)
+    write_if_changed(destination, "{}", manifest)
+    manifest.save()
+    assert destination.name in json.loads((tmp_path / MANIFEST_NAME).read_text())
+
+    reloaded = OutputManifest(tmp_path)
+    assert not write_if_changed(destination, "{}", reloaded)
+    destination.write_text("{} ", encoding="utf-8")
+    assert write_if_changed(destination, "{}", reloaded)
+    assert destination.read_text(encoding="utf-8") == "{}"
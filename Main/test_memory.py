@@ -0,0 +1,66 @@
+"""Tests for per-document memory accounting in ``memory.py``."""
+
+from __future__ import annotations
+
+import json
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from memory import MIB, REPORT_NAME, DocumentMemory, MemoryTracker, StageMemory, write_summary
+
+
+@pytest.fixture
+def full_tracker(tmp_path):
+    tracing = tracemalloc.is_tracing()
+    yield MemoryTracker("full", tmp_path)
+    if not tracing:
+        tracemalloc.stop()
+
+
+def test_off_mode_records_nothing(tmp_path):
+    tracker = MemoryTracker("off", tmp_path)
+    with tracker.document(Path("EF1.pdf")) as record, tracker.stage("convert"):
+        assert record is None
+    assert tracker.documents == []
+    assert not (tmp_path / REPORT_NAME).exists()
+
+
+def test_full_mode_records_stages_and_appends_the_report(tmp_path, full_tracker):
+    args = SimpleNamespace(do_ocr=True, ocr_engine="rapidocr", ocr_force_full_page=False)
+    page = SimpleNamespace(size=SimpleNamespace(width=595.0, height=842.0))
+    with full_tracker.document(Path("EF1.pdf"), args):
+        with full_tracker.stage("convert"):
+            buffer = bytearray(8 * MIB)
+        full_tracker.describe(SimpleNamespace(pages={1: page, 2: page}))
+        with full_tracker.stage("extract"):
+            pass
+    del buffer
+
+    (record,) = full_tracker.documents
+    assert [stage.stage for stage in record.stages] == ["convert", "extract"]
+    assert record.stages[0].python_peak_mb >= 8
+    assert (record.pages, record.max_page_area) == (2, 595.0 * 842.0)
+    assert record.ocr_engine == "rapidocr"
+    (line,) = (tmp_path / REPORT_NAME).read_text(encoding="utf-8").splitlines()
+    assert json.loads(line)["rss_peak_mb"] == record.rss_peak_mb
+
+
+def test_summary_fits_the_cost_per_page(tmp_path):
+    tracker = MemoryTracker()
+    for pages in (1, 2, 4, 8):
+        record = DocumentMemory(f"{pages}.pdf", pages=pages, ocr=pages > 2)
+        record.stages.append(StageMemory("convert", 1.0, 100.0, 100.0 + 10.0 * pages))
+        tracker.documents.append(record)
+
+    summary = tracker.summarise()
+    assert summary["documents"] == 4
+    assert summary["linear_fit"]["mib_per_page"] == pytest.approx(10.0)
+    assert summary["linear_fit"]["base_mib"] == pytest.approx(100.0)
+    assert summary["correlation"]["pages"] == pytest.approx(1.0)
+    assert summary["mean_rss_peak_by_ocr"] == {"no_ocr": 115.0, "ocr": 160.0}
+    assert summary["largest"][0]["path"] == "8.pdf"
+    assert write_summary(tracker, tmp_path).exists()
+    assert write_summary(MemoryTracker(), tmp_path) is None
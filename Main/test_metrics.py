@@ -0,0 +1,53 @@
+"""Tests for the Prometheus metrics in ``metrics.py``."""
+
+from __future__ import annotations
+
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+from metrics import CONTENT_TYPE, PREFIX, STAGE_BUCKETS, ConversionMetrics, MetricsExporter
+
+
+def test_render_text_format():
+    metrics = ConversionMetrics(workers=2)
+    metrics.batch_started(3)
+    metrics.document_finished(pages=2, stage_times={"convert": 0.3, "export": 0.01, "total": 0.31})
+    metrics.document_finished(status="failure", error_class='Bad"Pdf')
+    lines = metrics.render().splitlines()
+
+    assert f"# TYPE {PREFIX}documents_total counter" in lines
+    assert f'{PREFIX}documents_total{{status="failure"}} 1' in lines
+    assert f'{PREFIX}failures_total{{error_class="Bad\\"Pdf"}} 1' in lines
+    assert f"{PREFIX}pages_total 2" in lines
+    assert f"{PREFIX}queue_depth 0" in lines
+    assert not any('stage="total"' in line for line in lines)
+
+    bucket = f'{PREFIX}stage_seconds_bucket{{stage="convert"'
+    buckets = [line for line in lines if line.startswith(bucket)]
+    assert len(buckets) == len(STAGE_BUCKETS) + 1
+    counts = [int(line.rsplit(" ", 1)[1]) for line in buckets]
+    assert counts == sorted(counts)
+    assert buckets[-1] == f'{bucket},le="+Inf"}} 1'
+    assert f'{PREFIX}stage_seconds_count{{stage="convert"}} 1' in lines
+    for line in lines:
+        if not line.startswith("#"):
+            float(line.rsplit(" ", 1)[1])
+
+
+def test_exporter_serves_and_writes_the_textfile(tmp_path):
+    metrics = ConversionMetrics()
+    textfile = tmp_path / "ivt.prom"
+    with MetricsExporter(metrics, port=0, textfile=textfile, interval=60) as exporter:
+        metrics.batch_started(1)
+        metrics.document_finished(pages=3)
+        host, port = exporter.address
+        with urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+            assert response.headers["Content-Type"] == CONTENT_TYPE
+            assert f"{PREFIX}pages_total 3" in response.read().decode("utf-8")
+        with pytest.raises(HTTPError):
+            urlopen(f"http://{host}:{port}/other", timeout=5)
+
+    assert f"{PREFIX}pages_total 3" in textfile.read_text(encoding="utf-8").splitlines()
+    assert list(tmp_path.iterdir()) == [textfile]
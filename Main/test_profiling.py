@@ -0,0 +1,53 @@
+"""Tests for per-document profiling in ``profiling.py``."""
+
+from __future__ import annotations
+
+import time
+
+from profiling import DocumentProfiler
+
+
+def busy_wait(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(100))
+
+
+def test_off_mode_writes_nothing(tmp_path):
+    directory = tmp_path / "profiles"
+    profiler = DocumentProfiler("off", directory)
+    with profiler.document("EF1"):
+        busy_wait(0.01)
+    assert profiler.written == []
+    assert not directory.exists()
+
+
+def test_deterministic_mode_writes_prof_and_summary(tmp_path):
+    profiler = DocumentProfiler("deterministic", tmp_path)
+    with profiler.document("EF1"):
+        busy_wait(0.01)
+    assert [path.name for path in profiler.written] == ["EF1.prof", "EF1.pstats.txt"]
+    assert "busy_wait" in (tmp_path / "EF1.pstats.txt").read_text(encoding="utf-8")
+
+
+def test_sampling_mode_writes_collapsed_stacks(tmp_path):
+    profiler = DocumentProfiler("sampling", tmp_path, interval=0.001)
+    with profiler.document("OG1"):
+        busy_wait(0.2)
+    (path,) = profiler.written
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert lines
+    assert all(int(line.rsplit(" ", 1)[1]) >= 1 for line in lines)
+    assert any(
+        line.startswith("MainThread;") and "busy_wait (test_profiling.py" in line
+        for line in lines
+    )
+
+
+def test_slow_mode_keeps_only_slow_documents(tmp_path):
+    profiler = DocumentProfiler("slow", tmp_path, interval=0.001, slow_seconds=0.1)
+    with profiler.document("fast"):
+        pass
+    with profiler.document("slow"):
+        busy_wait(0.15)
+    assert [path.name for path in profiler.written] == ["slow.collapsed.txt"]
@@ -0,0 +1,58 @@
+"""Tests for the batch progress bar in ``progress.py``."""
+
+from __future__ import annotations
+
+import io
+
+import pytest
+
+import progress
+from progress import BatchProgress, progress_enabled
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = Clock()
+    monkeypatch.setattr(progress.time, "monotonic", fake)
+    return fake
+
+
+class Terminal(io.StringIO):
+    def isatty(self):
+        return True
+
+
+def test_progress_mode_resolution():
+    assert progress_enabled("auto", Terminal())
+    assert not progress_enabled("auto", io.StringIO())
+    assert progress_enabled("on", io.StringIO())
+    assert not progress_enabled("off", Terminal())
+
+
+def test_disabled_bar_ignores_updates():
+    with BatchProgress(3, enabled=False) as bar:
+        bar.update(pages=5, failed=True)
+    assert (bar.pages, bar.failures, bar.conversions) == (0, 0, 0)
+
+
+def test_postfix_reports_pages_rate_slowest_stage_and_failures(clock):
+    with BatchProgress(4, window=10.0) as bar:
+        clock.now += 2
+        bar.update(pages=4, stage_times={"convert": 1.0, "extract": 0.1, "total": 9.0})
+        clock.now += 2
+        bar.update(documents=2, pages=4, stage_times={"convert": 2.0}, failed=True)
+        assert bar.postfix(clock.now) == (
+            "pages=8 | 2.0 pages/s | slowest=convert 1.50s | failures=2"
+        )
+
+        clock.now += 20
+        bar.update(pages=1)
+        assert bar.rolling_pages_per_second(clock.now) == pytest.approx(1 / 20)
@@ -0,0 +1,72 @@
+"""Tests for merging progressive conversion passes in ``progressive.py``."""
+
+from __future__ import annotations
+
+import copy
+import json
+from types import SimpleNamespace
+
+from docling_core.types.doc import DoclingDocument
+
+from conftest import DOCTAGS_DIR
+from extract import extract_document
+from progressive import merge_results, missing_fields
+
+
+def window(payload, page_no, status="success"):
+    """Stub ``ConversionResult`` holding ``payload`` moved to ``page_no``."""
+
+    payload = copy.deepcopy(payload)
+    payload["pages"] = {str(page_no): {**payload["pages"]["1"], "page_no": page_no}}
+    for collection in ("texts", "tables", "pictures"):
+        for item in payload[collection]:
+            for prov in item.get("prov", []):
+                prov["page_no"] = page_no
+    return SimpleNamespace(
+        document=DoclingDocument.model_validate(payload),
+        pages=[page_no],
+        errors=[],
+        status=status,
+    )
+
+
+def stored_payload():
+    return json.loads((DOCTAGS_DIR / "EF1.json").read_text(encoding="utf-8"))
+
+
+def test_merge_keeps_head_metadata_and_page_numbers():
+    head, tail = window(stored_payload(), 3), window(stored_payload(), 4)
+    texts = len(head.document.texts) + len(tail.document.texts)
+    origin = head.document.origin
+
+    merged = merge_results(head, tail)
+    document = merged.document
+    assert document.name == "EF1"
+    assert document.origin == origin
+    assert document.export_to_dict()["furniture"] == stored_payload()["furniture"]
+    assert sorted(document.pages) == [3, 4]
+    assert len(document.texts) == texts
+    assert {prov.page_no for item in document.texts for prov in item.prov} == {3, 4}
+    assert merged.pages == [3, 4]
+    assert merged.status == "success"
+    assert extract_document(document, "EF1.pdf").fields["invoice_number"] == "24500464"
+
+
+def test_merge_carries_a_failed_tail_status():
+    head, tail = window(stored_payload(), 1), window(stored_payload(), 2, "partial_success")
+    tail.errors = ["page 2 timed out"]
+    merged = merge_results(head, tail)
+    assert merged.status == "partial_success"
+    assert merged.errors == ["page 2 timed out"]
+
+    head.status = "failure"
+    assert merge_results(head, window(stored_payload(), 3)).status == "failure"
+
+
+def test_missing_fields_lists_empty_required_fields():
+    extraction = SimpleNamespace(
+        fields={"supplier_coc_number": "34134377", "invoice_number": None}
+    )
+    assert missing_fields(extraction, ["supplier_coc_number", "invoice_number"]) == [
+        "invoice_number"
+    ]
@@ -0,0 +1,46 @@
+"""Tests for re-exporting stored DoclingDocument JSON in ``reexport.py``.
+
+``reexport`` shares the exporter table with ``convert.py``, so these tests
+need Docling installed and are skipped otherwise.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("docling")
+
+from conftest import DOCTAGS_DIR  # noqa: E402
+from reexport import collect_json_paths, reexport_path  # noqa: E402
+
+
+@pytest.fixture
+def stored(tmp_path):
+    path = tmp_path / "EF1.json"
+    path.write_bytes((DOCTAGS_DIR / "EF1.json").read_bytes())
+    return path
+
+
+def test_reexport_writes_next_to_the_json_then_skips_unchanged(stored):
+    _, stats, error = reexport_path(str(stored), ["md", "text"], None)
+    assert error is None
+    assert (stats.written, stats.skipped) == (2, 0)
+    assert "Eurofiber" in stored.with_suffix(".md").read_text(encoding="utf-8")
+
+    _, stats, error = reexport_path(str(stored), ["md", "text"], None)
+    assert error is None
+    assert (stats.written, stats.skipped) == (0, 2)
+
+
+def test_reexport_reports_errors_per_document(tmp_path, stored):
+    broken = tmp_path / "broken.json"
+    broken.write_text("{", encoding="utf-8")
+    _, _, error = reexport_path(str(broken), ["md"], tmp_path / "out")
+    assert error is not None
+    _, _, error = reexport_path(str(stored), ["pptx"], tmp_path / "out")
+    assert error.startswith("ArgumentTypeError")
+
+
+def test_collect_json_paths_skips_run_artifacts(tmp_path, stored):
+    (tmp_path / "memory_summary.json").write_text("{}", encoding="utf-8")
+    assert collect_json_paths([tmp_path]) == [stored]
@@ -0,0 +1,53 @@
+"""Tests for incremental re-extraction planning in ``reextract.py``."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from reextract import diff_records, plan
+
+
+@pytest.fixture
+def stored(tmp_path, doctags):
+    path = tmp_path / "EF1.doctags.txt"
+    path.write_text(doctags["EF1"], encoding="utf-8")
+    return path
+
+
+def processed_state(path, version):
+    _, fingerprints = plan([path], {}, version, force=False)
+    entry = fingerprints[str(path)]
+    return {str(path): {**entry, "ruleset": version, "record": {"filename": "EF1.pdf"}}}
+
+
+def test_unchanged_input_is_skipped(stored):
+    state = processed_state(stored, "v1")
+    assert plan([stored], state, "v1", force=False)[0] == []
+    assert plan([stored], state, "v1", force=True)[0] == [stored]
+
+
+def test_content_or_ruleset_change_invalidates(stored, doctags):
+    state = processed_state(stored, "v1")
+    assert plan([stored], state, "v2", force=False)[0] == [stored]
+    stored.write_text(doctags["EF1"] + "\n", encoding="utf-8")
+    assert plan([stored], state, "v1", force=False)[0] == [stored]
+
+
+def test_touch_without_content_change_is_skipped(stored):
+    state = processed_state(stored, "v1")
+    stat = stored.stat()
+    os.utime(stored, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    pending, fingerprints = plan([stored], state, "v1", force=False)
+    assert pending == []
+    assert fingerprints[str(stored)]["sha256"] == state[str(stored)]["sha256"]
+
+
+def test_diff_records_lists_changed_fields_only():
+    old = {"filename": "EF1.pdf", "invoice_number": "24500464", "supplier_coc_number": "34134377"}
+    new = {"filename": "EF1.pdf", "invoice_number": "24500465", "supplier_coc_number": "34134377"}
+    changes = diff_records(old, new)
+    assert changes == [
+        {"filename": "EF1.pdf", "field": "invoice_number", "old": "24500464", "new": "24500465"}
+    ]
@@ -0,0 +1,55 @@
+"""Tests for the JSONL run report in ``runreport.py``."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from runreport import DocumentEntry, RunReport
+
+
+def read_lines(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_rotation_keeps_configured_backups(tmp_path):
+    path = tmp_path / "run_report.jsonl"
+    report = RunReport(path, {"table_mode": "accurate"}, max_bytes=1200, backups=2)
+    for number in range(20):
+        report.write(DocumentEntry(f"input/{number:02d}.pdf", status="success", pages=1))
+    report.close()
+
+    assert path.with_name("run_report.jsonl.1").exists()
+    assert path.with_name("run_report.jsonl.2").exists()
+    assert not path.with_name("run_report.jsonl.3").exists()
+    for candidate in (path, path.with_name("run_report.jsonl.1")):
+        assert candidate.stat().st_size <= 1200
+    lines = read_lines(path)
+    assert lines[-1]["type"] == "run"
+    assert lines[-1]["documents"] == 20
+    assert lines[-2]["input_path"] == "input/19.pdf"
+
+
+def test_document_context_records_failures_and_duplicates(tmp_path):
+    source, duplicate = tmp_path / "EF1.pdf", tmp_path / "EF1 copy.pdf"
+    source.write_bytes(b"%PDF-1.4 same")
+    duplicate.write_bytes(b"%PDF-1.4 same")
+    path = tmp_path / "run_report.jsonl"
+
+    with RunReport(path, {}) as report:
+        with report.document(source, duplicates=[duplicate]) as entry:
+            entry.outputs.append(str(tmp_path / "EF1.doctags.txt"))
+            entry.pages = 2
+        with pytest.raises(ValueError):
+            with report.document(tmp_path / "missing.pdf"):
+                raise ValueError("broken xref")
+
+    canonical, copy, failed, run = read_lines(path)
+    assert canonical["status"] == "success" and canonical["timings"]["total"] >= 0
+    assert copy["duplicate_of"] == str(source)
+    assert copy["outputs"] == [str(tmp_path / "EF1 copy.doctags.txt")]
+    assert copy["content_sha256"] == canonical["content_sha256"]
+    assert (failed["status"], failed["error_class"]) == ("failure", "ValueError")
+    assert run["statuses"] == {"success": 2, "failure": 1}
+    assert run["pages"] == 4
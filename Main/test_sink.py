@@ -0,0 +1,79 @@
+"""Tests for the streaming output sinks in ``sink.py``."""
+
+from __future__ import annotations
+
+import json
+import time
+
+import pytest
+
+from sink import DocTagsPageWriter, JsonlSink
+
+
+def read_lines(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_jsonl_sink_flushes_by_count(tmp_path):
+    path = tmp_path / "records.jsonl"
+    with JsonlSink(path, flush_every=2, flush_interval=0) as sink:
+        sink.write({"filename": "EF1.pdf"})
+        assert path.read_text(encoding="utf-8") == ""
+        sink.write({"filename": "OG1.pdf"})
+        assert len(read_lines(path)) == 2
+        sink.write({"filename": "EF2.pdf"})
+    assert [record["filename"] for record in read_lines(path)] == ["EF1.pdf", "OG1.pdf", "EF2.pdf"]
+    assert sink.count == 3
+
+
+def test_jsonl_sink_flushes_on_interval_without_new_records(tmp_path):
+    path = tmp_path / "records.jsonl"
+    sink = JsonlSink(path, flush_every=100, flush_interval=0.05)
+    try:
+        sink.write({"filename": "EF1.pdf"})
+        deadline = time.monotonic() + 5
+        while not path.read_text(encoding="utf-8") and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert read_lines(path) == [{"filename": "EF1.pdf"}]
+    finally:
+        sink.close()
+
+
+def test_jsonl_sink_appends_across_runs(tmp_path):
+    path = tmp_path / "records.jsonl"
+    for name in ("EF1.pdf", "OG1.pdf"):
+        with JsonlSink(path) as sink:
+            sink.write({"filename": name})
+
+    assert len(read_lines(path)) == 2
+    with JsonlSink(path, append=False) as sink:
+        sink.write({"filename": "EF2.pdf"})
+    assert read_lines(path) == [{"filename": "EF2.pdf"}]
+
+
+def test_page_writer_replaces_output_when_complete(tmp_path):
+    path = tmp_path / "EF1.doctags.txt"
+    path.write_text("previous", encoding="utf-8")
+    with DocTagsPageWriter(path) as writer:
+        writer.write_page("<doctag><text>page 1</text></doctag>")
+        assert path.read_text(encoding="utf-8") == "previous"
+        assert writer.partial_path.read_text(encoding="utf-8") == "<doctag><text>page 1</text>"
+        writer.write_page("<doctag><text>page 2</text></doctag>")
+
+    assert path.read_text(encoding="utf-8") == (
+        "<doctag><text>page 1</text><page_break>\n<text>page 2</text></doctag>"
+    )
+    assert not writer.partial_path.exists()
+    assert writer.pages == 2
+
+
+def test_page_writer_failure_keeps_previous_output(tmp_path):
+    path = tmp_path / "EF1.doctags.txt"
+    path.write_text("previous", encoding="utf-8")
+    with pytest.raises(RuntimeError):
+        with DocTagsPageWriter(path) as writer:
+            writer.write_page("<doctag><text>page 1</text></doctag>")
+            raise RuntimeError("window 2 failed")
+
+    assert path.read_text(encoding="utf-8") == "previous"
+    assert not writer.partial_path.exists()
@@ -0,0 +1,101 @@
+"""Tests for the supplier registry in ``suppliers.py``."""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from suppliers import (
+    SupplierRegistry,
+    apply_registry,
+    normalise_coc,
+    normalise_name,
+    normalise_vat,
+)
+
+MASTER = """crediteurnummer;naam;kvk;btw_nummer
+S1;Eurofiber Nederland BV;34134377;NL808851524B01
+S2;Officegrip Hardware B.V.;76906973;NL 8608.35315 B01
+S3;Office Depot Nederland B.V.;;
+S4;Hardware Groothandel Noord;12345678;
+"""
+
+
+@pytest.fixture
+def registry_path(tmp_path):
+    source = tmp_path / "suppliers.csv"
+    source.write_text(MASTER, encoding="utf-8")
+    path = tmp_path / "suppliers.sqlite"
+    SupplierRegistry.build(source, path).close()
+    return path
+
+
+@pytest.fixture
+def registry(registry_path):
+    registry = SupplierRegistry.open(registry_path)
+    yield registry
+    registry.close()
+
+
+def test_normalisers_repair_ocr_noise():
+    assert normalise_name("0fficeGrip Hardware B.V.") == normalise_name("Officegrip Hardware BV")
+    assert normalise_coc("769O 6973") == "76906973"
+    assert normalise_coc("34l3.4377") == "34134377"
+    assert normalise_coc("KvK") is None
+    assert normalise_vat("nl 8608.35315 b01") == "NL860835315B01"
+
+
+def test_exact_ids_win_over_names(registry):
+    assert len(registry) == 4
+    by_coc = registry.resolve(name="Something else", coc_number="76906973")
+    assert (by_coc.supplier.supplier_id, by_coc.method) == ("S2", "coc")
+    by_vat = registry.resolve(vat_number="NL860835315B01")
+    assert (by_vat.supplier.supplier_id, by_vat.method) == ("S2", "vat")
+
+
+def test_fuzzy_name_search(registry):
+    match = registry.resolve(name="0fficeGrip Hardware BV")
+    assert match.supplier.supplier_id == "S2"
+    assert match.method == "name"
+    assert registry.resolve(name="Acme Logistics GmbH") is None
+
+    matches = registry.search_name("Office Nederland", limit=4)
+    assert matches[0].supplier.name == "Office Depot Nederland B.V."
+    assert [m.score for m in matches] == sorted((m.score for m in matches), reverse=True)
+
+
+def test_old_registry_is_indexed_on_open(registry_path):
+    with sqlite3.connect(registry_path) as connection:
+        connection.executescript("DROP TABLE trigram_counts; DROP TABLE trigram_postings;")
+
+    registry = SupplierRegistry.open(registry_path)
+    try:
+        assert registry.resolve(name="Eurofiber Nederland").supplier.supplier_id == "S1"
+    finally:
+        registry.close()
+
+
+def test_missing_registry_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        SupplierRegistry.open(tmp_path / "missing.sqlite")
+
+
+def test_apply_registry_fills_ids_only_on_exact_hits(registry):
+    exact = {
+        "supplier_name": "Eurofiber",
+        "supplier_coc_number": "34134377",
+        "supplier_tax_number": None,
+    }
+    assert apply_registry(exact, registry).method == "coc"
+    assert exact["supplier_name"] == "Eurofiber Nederland BV"
+    assert exact["supplier_tax_number"] == "NL808851524B01"
+
+    fuzzy = {
+        "supplier_name": "Hardware Groothandel Nord",
+        "supplier_coc_number": None,
+        "supplier_tax_number": None,
+    }
+    assert apply_registry(fuzzy, registry).method == "name"
+    assert fuzzy["supplier_name"] == "Hardware Groothandel Noord"
+    assert fuzzy["supplier_coc_number"] is None
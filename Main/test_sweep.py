@@ -0,0 +1,78 @@
+"""Tests for the configuration sweep in ``sweep.py``."""
+
+from __future__ import annotations
+
+import pytest
+
+import sweep
+from conftest import DOCTAGS_DIR
+from evaluate import DEFAULT_GROUND_TRUTH, EvaluationReport
+from sweep import CellResult, cell_argv, grid_cells, pareto_frontier, run_sweep
+
+
+def cell(name, pages_per_second, accuracy, peak_rss_mb, error=None):
+    return CellResult(
+        {"name": name}, pages_per_second, accuracy, peak_rss_mb=peak_rss_mb, error=error
+    )
+
+
+def names(cells):
+    return [result.settings["name"] for result in cells]
+
+
+def test_pareto_frontier_drops_dominated_and_failed_cells():
+    cells = [
+        cell("fast", 4.0, 0.90, 900),
+        cell("accurate", 1.0, 1.00, 1200),
+        cell("lean", 2.0, 0.90, 500),
+        cell("dominated", 1.5, 0.85, 1300),
+        cell("tie", 4.0, 0.90, 900),
+        cell("broken", 9.0, 1.00, 100, error="ImportError: rapidocr"),
+    ]
+    assert names(pareto_frontier(cells)) == ["fast", "tie", "lean", "accurate"]
+
+
+def test_grid_cells_expand_to_flags():
+    cells = grid_cells({"table-mode": ["fast", "accurate"], "pdf-backend": ["pypdfium2"]})
+    assert cells == [
+        {"table-mode": "fast", "pdf-backend": "pypdfium2"},
+        {"table-mode": "accurate", "pdf-backend": "pypdfium2"},
+    ]
+    assert cell_argv(cells[0], ["--page-range", "1-2"]) == [
+        "--page-range",
+        "1-2",
+        "--table-mode",
+        "fast",
+        "--pdf-backend",
+        "pypdfium2",
+    ]
+
+
+@pytest.fixture
+def fake_evaluate(monkeypatch):
+    calls = []
+
+    def evaluate(paths, truth, workers, argv):
+        calls.append(list(argv))
+        return EvaluationReport(documents=len(paths), pages=len(paths), wall_time=1.0)
+
+    monkeypatch.setattr(sweep, "evaluate", evaluate)
+    return calls
+
+
+def test_cached_cells_rerun_when_packages_change(tmp_path, monkeypatch, fake_evaluate):
+    paths = [DOCTAGS_DIR / "EF1.doctags.txt"]
+    cells = grid_cells({"table-mode": ["fast", "accurate"]})
+    cache = tmp_path / "sweep_cache.json"
+
+    def run():
+        return run_sweep(cells, paths, {}, DEFAULT_GROUND_TRUTH, [], 1, cache)
+
+    monkeypatch.setattr(sweep, "package_versions", lambda: {"docling": "2.50.0"})
+    assert [result.cached for result in run()] == [False, False]
+    assert [result.cached for result in run()] == [True, True]
+    assert len(fake_evaluate) == 2
+
+    monkeypatch.setattr(sweep, "package_versions", lambda: {"docling": "2.51.0"})
+    assert [result.cached for result in run()] == [False, False]
+    assert len(fake_evaluate) == 4
@@ -0,0 +1,79 @@
+"""Tests for the synthetic invoice generator in ``synthetic.py``."""
+
+from __future__ import annotations
+
+import random
+import re
+import zlib
+
+from extract import validate_coc_number, validate_vat_number
+from synthetic import (
+    generate_one,
+    iban,
+    make_invoice,
+    nl_vat_number,
+    render_pages,
+    write_text_pdf,
+)
+
+
+def test_identifiers_pass_the_extraction_validators():
+    rng = random.Random(7)
+    for _ in range(200):
+        assert validate_vat_number(nl_vat_number(rng)) == 1.0
+        number = iban(rng, "INGB")
+        rearranged = number[4:] + number[:4]
+        assert int("".join(str(int(ch, 36)) for ch in rearranged)) % 97 == 1
+    spec = make_invoice(3, seed=1)
+    assert validate_coc_number(spec.supplier.coc) == 1.0
+    assert spec.customer.vat != spec.supplier.vat
+
+
+def test_invoices_are_reproducible_per_seed():
+    assert make_invoice(5, seed=0).ground_truth() == make_invoice(5, seed=0).ground_truth()
+    assert make_invoice(5, seed=0).ground_truth() != make_invoice(5, seed=1).ground_truth()
+    assert make_invoice(5, seed=0).ground_truth()["filename"] == "SYN000005.pdf"
+
+
+def test_variant_shares_select_the_rendering():
+    assert make_invoice(0, seed=0, raster_share=0.0, scan_share=1.0).variant == "scan"
+    assert make_invoice(0, seed=0, raster_share=1.0, scan_share=0.0).variant == "raster"
+    assert make_invoice(0, seed=0, raster_share=0.0, scan_share=0.0).variant == "text"
+
+
+def test_text_pdf_holds_the_labelled_values(tmp_path):
+    spec = make_invoice(11, seed=0, multipage_share=1.0)
+    pages = render_pages(spec)
+    path = tmp_path / spec.filename
+    write_text_pdf(pages, path, title=spec.invoice_number)
+
+    data = path.read_bytes()
+    assert data.startswith(b"%PDF-1.4") and data.rstrip().endswith(b"%%EOF")
+    assert len(pages) > 1
+    assert b"/Count %d >>" % len(pages) in data
+    streams = re.findall(rb"stream\n(.*?)\nendstream", data, re.DOTALL)
+    text = b"".join(zlib.decompress(stream) for stream in streams).decode("cp1252")
+    for value in (spec.supplier.coc, spec.supplier.vat, spec.invoice_number):
+        assert value in text
+
+
+def test_generate_one_writes_the_pdf_and_metadata(tmp_path):
+    record, meta = generate_one(
+        2,
+        seed=0,
+        output_dir=tmp_path,
+        dpi=72,
+        multipage_share=0.0,
+        raster_share=0.0,
+        scan_share=0.0,
+    )
+    assert (tmp_path / record["filename"]).exists()
+    assert meta["variant"] == "text"
+    assert meta["pages"] == 1
+    assert set(record) == {
+        "filename",
+        "supplier_name",
+        "supplier_coc_number",
+        "supplier_tax_number",
+        "invoice_number",
+    }